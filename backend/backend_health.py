@@ -0,0 +1,179 @@
+"""
+Health-scored fallback between the primary pose backend and MediaPipe.
+Instead of running MediaPipe on every frame the primary backend comes back
+empty on (two inferences per empty-scene frame), each frame goes to one
+backend: the active one, or the other as a periodic probe. The active
+backend changes only after sustained failure, when probes show the other
+one doing clearly better.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+
+ROLE_PRIMARY = "primary"
+ROLE_FALLBACK = "fallback"
+
+
+class BackendHealth:
+    """Smoothed success rate and latency of one backend."""
+
+    def __init__(self, name: str, alpha: float = 0.05):
+        self.name = name
+        self.alpha = alpha
+        self.success_rate = 1.0  # Optimistic until measured
+        self.latency_ms: Optional[float] = None
+        self.samples = 0
+        self.successes = 0
+        self.errors = 0
+
+    def record(self, success: bool, latency_ms: float, error: bool = False):
+        self.samples += 1
+        self.successes += int(success)
+        self.errors += int(error)
+        # Plain mean over the first samples so the rate settles quickly
+        alpha = max(self.alpha, 1.0 / self.samples)
+        self.success_rate += alpha * (float(success) - self.success_rate)
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += alpha * (latency_ms - self.latency_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "success_rate": round(self.success_rate, 3),
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "samples": self.samples,
+            "successes": self.successes,
+            "errors": self.errors,
+        }
+
+
+class FallbackController:
+    """
+    Picks which backend runs each frame.
+
+    The active backend runs every frame except every probe_interval-th,
+    which goes to the other backend. After at least min_samples frames on
+    the active backend, it is switched when its success rate is below
+    switch_threshold and the other's (probed) rate beats it by margin.
+    The primary gets its role back once its probed rate is within margin
+    of the fallback's.
+    A frame is only inferred twice when double_infer is set. Thread-safe
+    (shared by all inference workers).
+    """
+
+    def __init__(
+        self,
+        primary_name: str,
+        fallback_name: Optional[str],
+        switch_threshold: float = 0.3,
+        margin: float = 0.2,
+        min_samples: int = 30,
+        probe_interval: int = 15,
+        min_probes: int = 3,
+        double_infer: bool = False
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            primary_name: Preferred backend (e.g. "yolo_onnx")
+            fallback_name: Fallback backend, or None (primary only)
+            switch_threshold: Success rate below which the active backend is failing
+            margin: Success-rate lead the other backend needs to take over
+            min_samples: Frames on the active backend before it can be switched away from
+            probe_interval: Every N-th frame probes the inactive backend
+            min_probes: Probes needed before the inactive backend's rate is trusted
+            double_infer: Also run the other backend on frames where the chosen one finds nobody
+        """
+        self.health = {ROLE_PRIMARY: BackendHealth(primary_name)}
+        if fallback_name is not None:
+            self.health[ROLE_FALLBACK] = BackendHealth(fallback_name)
+        self.switch_threshold = switch_threshold
+        self.margin = margin
+        self.min_samples = min_samples
+        self.probe_interval = max(2, probe_interval)
+        self.min_probes = min_probes
+        self.double_infer = double_infer
+
+        self._lock = threading.Lock()
+        self.active = ROLE_PRIMARY
+        self.switches = 0
+        self.probes = 0
+        self.double_inferences = 0
+        self._frames = 0
+        self._since_switch = 0
+        self._probe_samples = {role: 0 for role in self.health}
+
+    @classmethod
+    def from_env(cls, primary_name: str, fallback_name: Optional[str]) -> "FallbackController":
+        """Build from POSE_FALLBACK_PROBE_FRAMES / POSE_FALLBACK_SWITCH_RATE / POSE_FALLBACK_DOUBLE_INFER."""
+        return cls(
+            primary_name,
+            fallback_name,
+            switch_threshold=float(os.getenv("POSE_FALLBACK_SWITCH_RATE", "0.3")),
+            probe_interval=int(os.getenv("POSE_FALLBACK_PROBE_FRAMES", "15")),
+            double_infer=os.getenv("POSE_FALLBACK_DOUBLE_INFER", "false").lower() == "true",
+        )
+
+    def _other(self, role: str) -> str:
+        return ROLE_FALLBACK if role == ROLE_PRIMARY else ROLE_PRIMARY
+
+    def choose(self) -> str:
+        """Role (ROLE_PRIMARY / ROLE_FALLBACK) that runs the next frame."""
+        with self._lock:
+            if ROLE_FALLBACK not in self.health:
+                return ROLE_PRIMARY
+            self._frames += 1
+            if self._frames % self.probe_interval == 0:
+                self.probes += 1
+                return self._other(self.active)
+            return self.active
+
+    def record(self, role: str, success: bool, latency_ms: float, error: bool = False):
+        """Feed the outcome of one inference and re-evaluate the active backend."""
+        with self._lock:
+            self.health[role].record(success, latency_ms, error)
+            if role == self.active:
+                self._since_switch += 1
+            else:
+                self._probe_samples[role] += 1
+            self._evaluate()
+
+    def record_double_inference(self):
+        with self._lock:
+            self.double_inferences += 1
+
+    def _evaluate(self):
+        if ROLE_FALLBACK not in self.health:
+            return
+        other = self._other(self.active)
+        if self._since_switch < self.min_samples or self._probe_samples[other] < self.min_probes:
+            return
+        active_rate = self.health[self.active].success_rate
+        other_rate = self.health[other].success_rate
+        if other == ROLE_PRIMARY:
+            switch = other_rate >= active_rate - self.margin  # Primary is preferred when close
+        else:
+            switch = active_rate < self.switch_threshold and other_rate >= active_rate + self.margin
+        if switch:
+            print(f"[FALLBACK] Switching to {self.health[other].name} "
+                  f"(success {other_rate:.2f} vs {active_rate:.2f})")
+            self.active = other
+            self.switches += 1
+            self._since_switch = 0
+            self._probe_samples[self.active] = 0
+            self._probe_samples[self._other(self.active)] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self.health[self.active].name,
+                "switches": self.switches,
+                "probes": self.probes,
+                "double_infer": self.double_infer,
+                "double_inferences": self.double_inferences,
+                "backends": {role: health.get_stats() for role, health in self.health.items()},
+            }
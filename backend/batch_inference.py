@@ -0,0 +1,183 @@
+"""
+Cross-session micro-batching of LSTM form classification.
+With several trainees on one box every session would run the classifier on
+its own window at batch size 1. The service collects the windows submitted
+by all sessions for a short deadline (a few ms) or until max_batch, runs them
+as one batched call on its own thread and resolves each caller's future.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from form_classifier import WINDOW_SHAPE
+
+DEFAULT_MAX_BATCH = 8
+DEFAULT_DEADLINE_MS = 5.0
+
+# Upper bucket edges (ms) of the per-batch latency histogram
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (ms); the last bucket is open-ended."""
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total_ms = 0.0
+        self.samples = 0
+
+    def record(self, latency_ms: float):
+        index = next((i for i, edge in enumerate(self.buckets_ms) if latency_ms <= edge), len(self.buckets_ms))
+        self.counts[index] += 1
+        self.total_ms += latency_ms
+        self.samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={edge}" for edge in self.buckets_ms] + [f">{self.buckets_ms[-1]}"]
+        return {
+            "buckets_ms": dict(zip(labels, self.counts)),
+            "mean_ms": round(self.total_ms / self.samples, 3) if self.samples else None,
+            "samples": self.samples,
+        }
+
+
+def predict_batch(classifier, windows: np.ndarray) -> np.ndarray:
+    """(n, window, features) -> (n, classes), batched when the runtime supports it."""
+    if hasattr(classifier, "predict_batch"):
+        return classifier.predict_batch(windows)
+    return np.stack([classifier.predict(window) for window in windows])
+
+
+class BatchInferenceService:
+    """
+    Micro-batching front end for a form classifier.
+
+    submit() copies the window into a preallocated staging batch and returns
+    a Future; a collector thread runs the batch once it is full or the
+    deadline after its first window expired. Two staging buffers alternate,
+    so sessions keep submitting while a batch runs. Engines may still call the
+    same classifier directly (rep mode, warm-up): the wrappers serialize
+    predict() and predict_batch() on their own lock.
+    """
+
+    def __init__(self, classifier, max_batch: int = DEFAULT_MAX_BATCH,
+                 deadline_ms: float = DEFAULT_DEADLINE_MS, window_shape=WINDOW_SHAPE):
+        """
+        Args:
+            classifier: Form classifier (predict(window), optionally predict_batch(windows))
+            max_batch: Windows per batched call
+            deadline_ms: Max wait for more windows after the first one of a batch
+        """
+        self.classifier = classifier
+        self.max_batch = max(1, max_batch)
+        self.deadline_ms = max(0.0, deadline_ms)
+        self._staging = np.zeros((2, self.max_batch) + tuple(window_shape), dtype=np.float32)
+        self._active = 0  # Staging buffer being filled
+        self._pending: List[Future] = []
+        self._first_submit = 0.0
+        self._cond = threading.Condition()
+        self._running = True
+
+        self.batch_latency = LatencyHistogram()  # Batched call only
+        self.wait_latency = LatencyHistogram()  # First submit -> results ready
+        self.batch_sizes = [0] * (self.max_batch + 1)
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="lstm-batcher")
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls, classifier) -> "BatchInferenceService":
+        """Settings from FORM_CLASSIFIER_BATCH_SIZE / FORM_CLASSIFIER_BATCH_DEADLINE_MS."""
+        return cls(
+            classifier,
+            max_batch=int(os.getenv("FORM_CLASSIFIER_BATCH_SIZE", str(DEFAULT_MAX_BATCH))),
+            deadline_ms=float(os.getenv("FORM_CLASSIFIER_BATCH_DEADLINE_MS", str(DEFAULT_DEADLINE_MS))),
+        )
+
+    def submit(self, window: np.ndarray) -> Future:
+        """Queue one scaled (window, features) array (copied); the future resolves to its probabilities."""
+        future: Future = Future()
+        with self._cond:
+            while self._running and len(self._pending) >= self.max_batch:
+                self._cond.wait()  # Batch full and not yet taken by the collector
+            if not self._running:
+                future.set_exception(RuntimeError("Batch inference service is closed"))
+                return future
+            self._staging[self._active, len(self._pending)] = window
+            if not self._pending:
+                self._first_submit = time.perf_counter()
+            self._pending.append(future)
+            self._cond.notify_all()
+        return future
+
+    def _collect(self):
+        """Wait for a batch; returns (windows view, futures, first submit time) or None when closed."""
+        with self._cond:
+            while self._running and not self._pending:
+                self._cond.wait()
+            if not self._running:
+                return None
+            deadline = self._first_submit + self.deadline_ms / 1000.0
+            while self._running and len(self._pending) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            futures, self._pending = self._pending, []
+            windows = self._staging[self._active, :len(futures)]
+            first_submit = self._first_submit
+            self._active ^= 1  # Submitters fill the other buffer meanwhile
+            self._cond.notify_all()
+            return windows, futures, first_submit
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            windows, futures, first_submit = batch
+            start = time.perf_counter()
+            try:
+                probabilities = predict_batch(self.classifier, windows)
+            except Exception as e:
+                self.errors += 1
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            end = time.perf_counter()
+            for future, probs in zip(futures, probabilities):
+                future.set_result(np.array(probs, copy=True))
+            self.batch_latency.record((end - start) * 1000)
+            self.wait_latency.record((end - first_submit) * 1000)
+            self.batch_sizes[len(futures)] += 1
+
+    def close(self):
+        """Stop the collector; pending windows fail with RuntimeError."""
+        with self._cond:
+            self._running = False
+            pending, self._pending = self._pending, []
+            self._cond.notify_all()
+        for future in pending:
+            future.set_exception(RuntimeError("Batch inference service is closed"))
+        self._thread.join(timeout=1.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = sum(self.batch_sizes)
+        windows = sum(size * count for size, count in enumerate(self.batch_sizes))
+        return {
+            "max_batch": self.max_batch,
+            "deadline_ms": self.deadline_ms,
+            "batches": batches,
+            "windows": windows,
+            "mean_batch_size": round(windows / batches, 2) if batches else None,
+            "batch_sizes": {size: count for size, count in enumerate(self.batch_sizes) if count},
+            "batch_latency": self.batch_latency.to_dict(),
+            "wait_latency": self.wait_latency.to_dict(),
+            "errors": self.errors,
+        }
@@ -0,0 +1,94 @@
+"""
+Cold-start benchmark: import times of the heavy modules and time to first
+keypoint. Every measurement runs in a fresh interpreter (nothing cached in
+sys.modules), so numbers match a real process start.
+
+  imports:      time to import each module on its own
+  app import:   `import main` (what uvicorn pays before serving requests)
+  first pose:   import pose_detector -> PoseDetector() -> first detect_pose()
+
+Run from backend dir:  python benchmarks/bench_cold_start.py [--runs N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["numpy", "cv2", "mediapipe", "onnxruntime", "tensorflow", "joblib", "fastapi", "main"]
+
+IMPORT_SNIPPET = """
+import json, time
+start = time.perf_counter()
+try:
+    import {module}
+    result = time.perf_counter() - start
+except Exception as e:
+    result = None
+print(json.dumps(result))
+"""
+
+FIRST_POSE_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from pose_detector import PoseDetector
+from pose_backends import synthetic_frames
+t1 = time.perf_counter()
+detector = PoseDetector(num_workers=1)
+t2 = time.perf_counter()
+frame = synthetic_frames(1)[0]
+detector.detect_pose(frame)
+t3 = time.perf_counter()
+detector.cleanup()
+print(json.dumps({"import": t1 - t0, "init": t2 - t1, "first_detect": t3 - t2, "total": t3 - t0}))
+"""
+
+
+def run_snippet(code: str):
+    """Run code in a fresh interpreter from the backend dir; returns its last stdout line as JSON."""
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+    lines = out.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1]) if lines else None
+    except ValueError:
+        return None
+
+
+def median_or_none(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def fmt(seconds) -> str:
+    return f"{seconds * 1000:9.0f}" if seconds is not None else "  missing"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-pose", action="store_true", help="Skip the time-to-first-keypoint run")
+    args = parser.parse_args()
+
+    print(f"{'module':>14} {'import (ms)':>12}")
+    for module in HEAVY_MODULES:
+        times = [run_snippet(IMPORT_SNIPPET.format(module=module)) for _ in range(args.runs)]
+        print(f"{module:>14} {fmt(median_or_none(times)):>12}")
+
+    if args.skip_pose:
+        return
+    runs = [run_snippet(FIRST_POSE_SNIPPET) for _ in range(args.runs)]
+    runs = [r for r in runs if r]
+    print()
+    if not runs:
+        print("time to first keypoint: pose detector failed to start")
+        return
+    print(f"{'first keypoint':>14} {'(ms)':>12}")
+    for phase in ("import", "init", "first_detect", "total"):
+        print(f"{phase:>14} {fmt(median_or_none([r[phase] for r in runs])):>12}")
+
+
+if __name__ == "__main__":
+    main()
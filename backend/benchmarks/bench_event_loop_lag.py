@@ -0,0 +1,111 @@
+"""
+Event-loop lag with the per-frame engine step inline vs on per-session lanes.
+N simulated sessions step at the camera rate; a probe coroutine sleeps 5 ms
+in a loop and records how late it wakes up (what every other socket,
+/video_feed and REST call waits on top of its own work).
+
+  step:  native inference releasing the GIL (sleep, like ORT / TFLite), or
+         pure-Python work holding it (spin), or the real ExerciseEngine.update
+         (random poses; LSTM only if its models are present)
+
+Run from backend dir:  python benchmarks/bench_event_loop_lag.py [--sessions 4] [--step-ms 15] [--step sleep]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from session_context import SessionLane  # noqa: E402
+
+PROBE_INTERVAL = 0.005
+
+
+def make_step(kind: str, step_ms: float):
+    if kind == "sleep":
+        return lambda: time.sleep(step_ms / 1000)
+    if kind == "spin":
+        def spin():
+            end = time.perf_counter() + step_ms / 1000
+            while time.perf_counter() < end:
+                pass
+        return spin
+
+    from exercise_engine import ExerciseEngine, ExerciseType
+    from pose_frame import PoseFrame
+    engine = ExerciseEngine()
+    rng = np.random.default_rng(0)
+
+    def engine_step():
+        pose = PoseFrame(rng.random((17, 5), dtype=np.float32))
+        engine.update({}, pose, ExerciseType.SQUAT)
+    return engine_step
+
+
+async def probe(lags, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def session(step, lane, fps: float, stop: asyncio.Event):
+    interval = 1.0 / fps
+    while not stop.is_set():
+        start = time.perf_counter()
+        if lane is None:
+            step()
+        else:
+            await lane.run(step)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+async def measure(args, offload: bool):
+    steps = [make_step(args.step, args.step_ms) for _ in range(args.sessions)]
+    lanes = [SessionLane() if offload else None for _ in steps]
+    stop = asyncio.Event()
+    lags = []
+    tasks = [asyncio.create_task(session(step, lane, args.fps, stop)) for step, lane in zip(steps, lanes)]
+    tasks.append(asyncio.create_task(probe(lags, stop)))
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    for lane in lanes:
+        if lane is not None:
+            lane.close()
+    return lags
+
+
+def summarize(lags):
+    lags = sorted(lags)
+    return {
+        "p50": statistics.median(lags),
+        "p95": lags[int(0.95 * (len(lags) - 1))],
+        "max": lags[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--step", choices=["sleep", "spin", "engine"], default="sleep")
+    parser.add_argument("--step-ms", type=float, default=15.0, help="Step cost for sleep / spin")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions at {args.fps:.0f} fps, step={args.step}"
+          + (f" ({args.step_ms:.0f} ms)" if args.step != "engine" else ""))
+    print(f"{'engine step':>14} {'lag p50 (ms)':>13} {'p95':>8} {'max':>8}")
+    for label, offload in (("inline", False), ("session lanes", True)):
+        stats = summarize(asyncio.run(measure(args, offload)))
+        print(f"{label:>14} {stats['p50']:13.1f} {stats['p95']:8.1f} {stats['max']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: MediaPipe preprocessing, time per frame.
+
+before: cv2.flip + copyMakeBorder (square) + cvtColor  -> 3 full-frame allocations
+after:  LetterboxBuffer.prepare (BGR->RGB written into a persistent square buffer)
+
+Run from backend dir:  python benchmarks/bench_preprocess.py [--iterations N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from frame_preprocess import LetterboxBuffer  # noqa: E402
+
+
+def preprocess_before(frame: np.ndarray) -> np.ndarray:
+    """Previous pose_detector path (flip in detect_pose, pad + convert in _detect_mediapipe)."""
+    flipped = cv2.flip(frame, 1)
+    h, w = flipped.shape[:2]
+    size = max(h, w)
+    pad_h = (size - h) // 2
+    pad_w = (size - w) // 2
+    padded = cv2.copyMakeBorder(
+        flipped, pad_h, size - h - pad_h, pad_w, size - w - pad_w,
+        cv2.BORDER_CONSTANT, value=[0, 0, 0]
+    )
+    return cv2.cvtColor(padded, cv2.COLOR_BGR2RGB)
+
+
+def time_per_frame(fn, frame: np.ndarray, iterations: int) -> float:
+    """Median time per call in milliseconds."""
+    for _ in range(10):  # Warmup
+        fn(frame)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(frame)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>12} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    for w, h in [(640, 480), (1280, 720), (1920, 1080)]:
+        frame = rng.integers(0, 255, size=(h, w, 3), dtype=np.uint8)
+        letterbox = LetterboxBuffer()
+
+        # Same pixels up to the mirroring, which now happens on the keypoints
+        assert np.array_equal(preprocess_before(frame)[:, ::-1], letterbox.prepare(frame))
+
+        before = time_per_frame(preprocess_before, frame, args.iterations)
+        after = time_per_frame(letterbox.prepare, frame, args.iterations)
+        resolution = f"{w}x{h}"
+        print(f"{resolution:>12} {before:12.3f} {after:12.3f} {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
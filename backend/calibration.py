@@ -12,21 +12,24 @@ import numpy as np
 import cv2
 
 from pose_detector import get_pose_detector
+from lazy_loader import register
 
-# Load ONNX model safely
+# ONNX body type model, loaded on first calibration (or by the startup warmup)
 MODELS_DIR = Path(__file__).parent / "models"
 onnx_path = MODELS_DIR / "fitness_model.onnx"
-onnx_session = None
 
-if onnx_path.exists():
-    try:
-        import onnxruntime as ort
-        onnx_session = ort.InferenceSession(str(onnx_path))
-        print(f"[CALIBRATION] Loaded ONNX model from {onnx_path}")
-    except Exception as e:
-        print(f"[CALIBRATION] Failed to load ONNX model: {e}")
-else:
-    print(f"[CALIBRATION] ONNX model not found at {onnx_path}")
+
+def _load_onnx_session():
+    if not onnx_path.exists():
+        print(f"[CALIBRATION] ONNX model not found at {onnx_path}")
+        return None
+    from onnx_sessions import create_session
+    session = create_session(onnx_path)
+    print(f"[CALIBRATION] Loaded ONNX model from {onnx_path}")
+    return session
+
+
+onnx_component = register("body_type_model", _load_onnx_session)
 
 
 @dataclass
@@ -96,12 +99,11 @@ class Calibrator:
                 if not success or frame is None:
                     continue
                 
-                last_frame = frame  # Store for body type classification
-                
                 # Detect pose (non-blocking if using dedicated worker)
                 pose_data = pose_detector.latest_result
                 
                 if pose_data and self._check_visibility(pose_data["keypoints"]):
+                    last_frame = frame  # Store for body type classification (get_frame() copies)
                     self.samples.append(pose_data)
                     collected += 1
                     self.progress = collected / total_samples
@@ -178,7 +180,7 @@ class Calibrator:
         
         # Classify body type from last frame
         body_type = "unknown"
-        if last_frame is not None and onnx_session is not None:
+        if last_frame is not None and onnx_component.get() is not None:
             body_type = self._classify_body_type(last_frame)
         
         self.status = "complete"
@@ -201,7 +203,7 @@ class Calibrator:
         """Perform calibration asynchronously (simplified version)."""
         from pose_detector import get_pose_detector
         
-        pose_detector = get_pose_detector()
+        pose_detector = await asyncio.to_thread(get_pose_detector)  # May still be loading
         config_duration = duration or self.config.duration_seconds
         sample_interval = 1.0 / self.config.sample_rate_hz
         total_samples = int(config_duration * self.config.sample_rate_hz)
@@ -217,9 +219,9 @@ class Calibrator:
                 
             success, frame = pose_detector.get_frame()
             if success:
-                last_frame = frame
-                pose_data = pose_detector.detect_pose(frame)
+                pose_data = pose_detector.detect_snapshot(frame)
                 if pose_data and self._check_visibility(pose_data["keypoints"]):
+                    last_frame = frame  # Already a copy: kept for body type
                     self.samples.append(pose_data)
             
             await asyncio.sleep(sample_interval)
@@ -245,7 +247,7 @@ class Calibrator:
         
         # Classify body type
         body_type = "unknown"
-        if last_frame is not None and onnx_session is not None:
+        if last_frame is not None and onnx_component.get() is not None:
             body_type = self._classify_body_type(last_frame)
         
         return {
@@ -304,7 +306,7 @@ class Calibrator:
         all_ratios = []
         
         for sample in self.samples:
-            ratios = pose_detector.calculate_body_ratios(sample["keypoints"])
+            ratios = pose_detector.calculate_body_ratios(sample.get("pose") or sample["keypoints"])
             if ratios:
                 all_ratios.append(ratios)
         
@@ -366,6 +368,7 @@ class Calibrator:
     
     def _classify_body_type(self, frame: np.ndarray) -> str:
         """Classify body type using the vision-only ONNX model."""
+        onnx_session = onnx_component.get()
         if frame is None or onnx_session is None:
             return "unknown"
         
@@ -443,12 +446,9 @@ async def run_calibration_async(duration: int = 5) -> Dict[str, Any]:
 
 
 # Global calibrator instance
-_calibrator: Optional[Calibrator] = None
+_calibrator_component = register("calibrator", Calibrator)
 
 
 def get_calibrator() -> Calibrator:
-    """Get or create the global calibrator instance."""
-    global _calibrator
-    if _calibrator is None:
-        _calibrator = Calibrator()
-    return _calibrator
\ No newline at end of file
+    """Get or create the global calibrator instance (thread-safe)."""
+    return _calibrator_component.get()
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+Reproducible conversion of the Keras form-classification LSTM for the edge runtimes.
+From the .h5 and a representative dataset of recorded (scaled) feature windows,
+emits TFLite fp32 / fp16 / dynamic-int8 / full-int8 variants (unrolled LSTMs,
+builtins only, no Flex ops) plus ONNX, then reports for each one its size, its
+parity against the Keras reference on held-out windows and its single-window
+latency on this host through the backend's own runtime wrappers
+(form_classifier.py). Replaces export_tflite_optimized.py.
+
+Dataset: .npy of (N, 20, 15) windows, or .npz with "windows" (and optional
+"labels", for accuracy). Pass --raw if the windows are unscaled features.
+
+Usage (from backend dir):
+    python convert_lstm.py --dataset recordings/windows.npz [--variants fp32,fp16,dynamic_int8,full_int8,onnx]
+                           [--output-dir models/converted] [--ship auto]
+--ship copies the chosen variant (auto: smallest one keeping --min-agreement)
+to the path load_form_classifier() reads. Shipping a TFLite variant deletes an
+existing models/model_lstm_tache2.onnx, which would otherwise load first
+(re-export it with --variants onnx). Needs tensorflow (and tf2onnx for ONNX)
+on the conversion machine only.
+"""
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from form_classifier import (
+    KERAS_MODEL_PATH, ONNX_MODEL_PATH, TFLITE_MODEL_PATHS, WINDOW_SHAPE,
+    KerasFormClassifier, OnnxFormClassifier, TFLiteFormClassifier,
+)
+
+TFLITE_VARIANTS = ("fp32", "fp16", "dynamic_int8", "full_int8")
+VARIANTS = TFLITE_VARIANTS + ("onnx",)
+DEFAULT_OUTPUT_DIR = KERAS_MODEL_PATH.parent / "converted"
+
+
+def load_windows(path: Path, scaler=None):
+    """
+    Recorded windows (and labels, if any) as float32.
+
+    Args:
+        path: .npy (N, window, features) or .npz with "windows" [+ "labels"]
+        scaler: FeatureScaler applied to every row (for unscaled recordings)
+
+    Returns:
+        (windows, labels or None)
+    """
+    data = np.load(path)
+    if isinstance(data, np.ndarray):
+        windows, labels = data, None
+    else:
+        windows = data["windows"]
+        labels = data["labels"] if "labels" in data.files else None
+    windows = np.asarray(windows, dtype=np.float32)
+    if windows.ndim != 3 or windows.shape[1:] != WINDOW_SHAPE:
+        raise ValueError(f"Expected (N, {WINDOW_SHAPE[0]}, {WINDOW_SHAPE[1]}) windows, got {windows.shape}")
+    if len(windows) == 0:
+        raise ValueError(f"{path} contains no windows")
+    if scaler is not None:
+        windows = scaler.transform(windows.reshape(-1, windows.shape[-1])).reshape(windows.shape)
+    return windows, labels
+
+
+def split_calibration(windows: np.ndarray, count: int, seed: int = 0):
+    """Random calibration subset and the held-out rest (all windows if too few remain)."""
+    order = np.random.default_rng(seed).permutation(len(windows))
+    calibration, held_out = order[:count], order[count:]
+    if len(held_out) < count:
+        print(f"[CONVERT] Only {len(windows)} windows: evaluating on the calibration set too")
+        held_out = order
+    return calibration, held_out
+
+
+def parity_stats(reference: np.ndarray, actual: np.ndarray, labels: Optional[np.ndarray] = None) -> Dict:
+    """Agreement of a variant's probabilities with the Keras reference ((N, classes) each)."""
+    diff = np.abs(reference - actual)
+    stats = {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "top1_agreement": float(np.mean(reference.argmax(axis=1) == actual.argmax(axis=1))),
+    }
+    if labels is not None:
+        stats["accuracy"] = float(np.mean(actual.argmax(axis=1) == labels))
+    return stats
+
+
+def latency_stats(seconds: List[float]) -> Dict:
+    ms = np.sort(np.asarray(seconds)) * 1000
+    return {"latency_p50_ms": float(np.median(ms)), "latency_p95_ms": float(ms[int(0.95 * (len(ms) - 1))])}
+
+
+def pick_smallest(report: Dict[str, Dict], min_agreement: float) -> Optional[str]:
+    """Smallest variant whose top-1 agreement with Keras is at least min_agreement."""
+    candidates = [
+        (stats["size_kb"], name) for name, stats in report.items()
+        if name != "keras" and stats.get("top1_agreement", 0.0) >= min_agreement
+    ]
+    return min(candidates)[1] if candidates else None
+
+
+def unrolled_copy(model):
+    """Same model with unroll=True on every LSTM (builtins-only TFLite), weights copied."""
+    import tensorflow as tf
+
+    def clone(layer):
+        config = layer.get_config()
+        if isinstance(layer, tf.keras.layers.LSTM):
+            config["unroll"] = True
+        return layer.__class__.from_config(config)
+
+    copy = tf.keras.models.clone_model(model, clone_function=clone)
+    copy.set_weights(model.get_weights())
+    return copy
+
+
+def convert_tflite(model, variant: str, calibration: np.ndarray) -> bytes:
+    """One TFLite variant of the (unrolled) model; float32 input and output in all cases."""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    if variant == "fp16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "dynamic_int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant == "full_int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([w[None]] for w in calibration)
+        # Integer kernels only; float I/O keeps TFLiteFormClassifier unchanged
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    elif variant != "fp32":
+        raise ValueError(f"Unknown TFLite variant: {variant}")
+    return converter.convert()
+
+
+def evaluate(classifier, windows: np.ndarray, latency_runs: int) -> tuple:
+    """Per-window probabilities and latency of a form_classifier runtime."""
+    probs = np.stack([classifier.predict(w) for w in windows])  # Also the warm-up
+    times = []
+    for i in range(latency_runs):
+        start = time.perf_counter()
+        classifier.predict(windows[i % len(windows)])
+        times.append(time.perf_counter() - start)
+    return probs, latency_stats(times)
+
+
+def print_report(report: Dict[str, Dict]):
+    print(f"{'variant':>13} {'size (KB)':>10} {'max |diff|':>11} {'top-1 agree':>12} {'accuracy':>9} "
+          f"{'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for name, s in report.items():
+        accuracy = f"{s['accuracy']:9.3f}" if "accuracy" in s else f"{'-':>9}"
+        print(f"{name:>13} {s['size_kb']:10.1f} {s.get('max_abs_diff', 0.0):11.2e} "
+              f"{s.get('top1_agreement', 1.0):12.3f} {accuracy} {s['latency_p50_ms']:9.3f} {s['latency_p95_ms']:9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=KERAS_MODEL_PATH)
+    parser.add_argument("--dataset", type=Path, required=True, help="Recorded windows (.npy / .npz)")
+    parser.add_argument("--raw", action="store_true", help="Dataset is unscaled: apply the feature scaler first")
+    parser.add_argument("--variants", default=",".join(VARIANTS))
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--calibration", type=int, default=200, help="Windows used to calibrate full_int8")
+    parser.add_argument("--latency-runs", type=int, default=500)
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="Top-1 agreement required by --ship auto")
+    parser.add_argument("--ship", default=None,
+                        help="Variant to install for the backend, or 'auto' (a TFLite variant deletes the shipped ONNX)")
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = set(variants) - set(VARIANTS)
+    if unknown:
+        parser.error(f"Unknown variants: {', '.join(sorted(unknown))} (choose from {', '.join(VARIANTS)})")
+
+    # Conversion-time dependency only
+    import tensorflow as tf
+
+    scaler = None
+    if args.raw:
+        from feature_window import load_feature_scaler
+        scaler = load_feature_scaler()
+    try:
+        windows, labels = load_windows(args.dataset, scaler)
+    except ValueError as e:
+        parser.error(str(e))
+    calibration_idx, eval_idx = split_calibration(windows, args.calibration)
+    calibration, held_out = windows[calibration_idx], windows[eval_idx]
+    held_out_labels = labels[eval_idx] if labels is not None else None
+    print(f"[CONVERT] {len(windows)} windows: {len(calibration)} calibration, {len(held_out)} evaluation")
+
+    print(f"[CONVERT] Loading {args.model}...")
+    model = tf.keras.models.load_model(str(args.model))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stem = args.model.stem
+
+    reference, latency = evaluate(KerasFormClassifier(model), held_out, args.latency_runs)
+    report = {"keras": {"path": str(args.model), "size_kb": args.model.stat().st_size / 1024, **latency}}
+    if held_out_labels is not None:
+        report["keras"]["accuracy"] = parity_stats(reference, reference, held_out_labels)["accuracy"]
+
+    unrolled = unrolled_copy(model) if set(variants) & set(TFLITE_VARIANTS) else None
+    for variant in variants:
+        try:
+            if variant == "onnx":
+                from export_lstm_onnx import export_onnx
+                path = export_onnx(model, args.output_dir / f"{stem}.onnx", args.opset)
+                classifier = OnnxFormClassifier.from_path(path)
+            else:
+                path = args.output_dir / f"{stem}_{variant}.tflite"
+                path.write_bytes(convert_tflite(unrolled, variant, calibration))
+                classifier = TFLiteFormClassifier.from_path(path)
+        except Exception as e:
+            print(f"[CONVERT] {variant} failed: {e}")
+            continue
+        probs, latency = evaluate(classifier, held_out, args.latency_runs)
+        report[variant] = {
+            "path": str(path), "size_kb": path.stat().st_size / 1024,
+            **parity_stats(reference, probs, held_out_labels), **latency,
+        }
+        print(f"[CONVERT] Saved {path}")
+
+    print_report(report)
+    report_path = args.output_dir / f"{stem}_conversion_report.json"
+    with open(report_path, "w") as f:
+        json.dump({"dataset": str(args.dataset), "evaluated_windows": len(held_out), "variants": report}, f, indent=2)
+    print(f"[CONVERT] Report: {report_path}")
+
+    best = pick_smallest(report, args.min_agreement)
+    print(f"[CONVERT] Smallest variant with top-1 agreement >= {args.min_agreement}: {best or 'none'}")
+    ship = best if args.ship == "auto" else args.ship
+    if ship:
+        if ship not in report or ship == "keras":
+            parser.error(f"Cannot ship {ship!r}: not converted")
+        # ONNX loads before TFLite in auto mode, so it gets its own slot
+        destination = ONNX_MODEL_PATH if ship == "onnx" else TFLITE_MODEL_PATHS[0]
+        shutil.copyfile(report[ship]["path"], destination)
+        print(f"[CONVERT] Installed {ship} as {destination}")
+        if ship != "onnx" and ONNX_MODEL_PATH.exists():
+            ONNX_MODEL_PATH.unlink()
+            print(f"[CONVERT] Removed {ONNX_MODEL_PATH}: it loads before TFLite and would shadow {ship}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,35 +2,85 @@
 Exercise detection and rep counting engine.
 Uses joint angles to classify exercises and count repetitions.
 """
+import os
 import pickle
 import numpy as np
-import onnxruntime as ort
 from typing import Optional, Dict, List, Tuple, Any
 from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass, field
 import time
-import tensorflow as tf  # For TFLite
-import joblib  # For scaler
+from pose_frame import as_pose_frame
+from joint_angles import pose_features, engine_angles, FEATURE_ANGLES
+from lazy_loader import register
+from form_classifier import ONNX_MODEL_PATH, TFLITE_MODEL_PATHS, WINDOW_SHAPE, load_form_classifier
+from feature_window import FeatureWindow, RepTrajectory, load_feature_scaler
+from batch_inference import BatchInferenceService
 
 # Path to models
 MODELS_DIR = Path(__file__).parent / "models"
 
-# Load Keras LSTM model directly (avoids TFLite Flex delegate issues)
+# Keras LSTM model, loaded directly (avoids TFLite Flex delegate issues).
+# TensorFlow takes seconds to import on the Pi: the model and scaler are lazy
+# components, loaded by the startup warmup or on first use.
 lstm_path = MODELS_DIR / "model_lstm_tache2.h5"
-lstm_model = None
 
-if lstm_path.exists():
-    try:
-        import tensorflow as tf
-        lstm_model = tf.keras.models.load_model(str(lstm_path))
-        print(f"[EXERCISE] Loaded LSTM model from {lstm_path}")
-    except Exception as e:
-        print(f"[EXERCISE] Failed to load LSTM model: {e}")
-else:
-    print(f"[EXERCISE] LSTM model not found at {lstm_path}")
 
-scaler = joblib.load(MODELS_DIR / "scaler_tache2.pkl")
+def _load_lstm():
+    if not lstm_path.exists():
+        print(f"[EXERCISE] LSTM model not found at {lstm_path}")
+        return None
+    import tensorflow as tf
+    model = tf.keras.models.load_model(str(lstm_path))
+    print(f"[EXERCISE] Loaded LSTM model from {lstm_path}")
+    return model
+
+
+lstm_component = register("lstm_model", _load_lstm)
+# mean_/scale_ arrays of the fitted scaler (FeatureScaler): no sklearn per frame
+scaler_component = register("scaler", load_feature_scaler)
+# Per-frame runtime for the LSTM: ONNX Runtime / TFLite / streaming NumPy, Keras model as fallback
+form_classifier_component = register(
+    "form_classifier", lambda: load_form_classifier(keras_model_loader=lstm_component.get)
+)
+
+# When the LSTM runs:
+#   "window": on the sliding 20-frame window, every frame
+#   "rep":    once per completed rep (its trajectory resampled to 20 steps),
+#             plus the sliding window every SLIDING_INTERVAL frames for mid-rep warnings
+CLASSIFIER_MODE = os.getenv("FORM_CLASSIFIER_MODE", "window").lower()
+SLIDING_INTERVAL = int(os.getenv("FORM_CLASSIFIER_SLIDING_INTERVAL", "60"))
+
+# Cross-session micro-batching (opt-in, window mode): windows of all sessions
+# run as one batched call; results come back through futures, one frame later
+BATCHING_ENABLED = (os.getenv("FORM_CLASSIFIER_BATCHING", "false").lower() == "true"
+                    and CLASSIFIER_MODE == "window")
+
+
+def _load_batch_service() -> Optional[BatchInferenceService]:
+    classifier = form_classifier_component.get()
+    if classifier is None or hasattr(classifier, "step"):
+        return None  # Nothing to batch (streaming steps per session)
+    return BatchInferenceService.from_env(classifier)
+
+
+batch_service_component = register("form_classifier_batching", _load_batch_service)
+
+
+def lstm_available() -> bool:
+    """True if the form classifier is loaded, or still loading with a model file to load."""
+    if form_classifier_component.ready:
+        return form_classifier_component.peek() is not None
+    return any(path.exists() for path in (ONNX_MODEL_PATH, *TFLITE_MODEL_PATHS, lstm_path))
+
+
+def __getattr__(name: str):
+    # Legacy module attributes (from exercise_engine import lstm_model, scaler): load on access
+    if name == "lstm_model":
+        return lstm_component.get()
+    if name == "scaler":
+        return scaler_component.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 labels_map = {
     0: "Pushup Correct",
@@ -43,9 +93,26 @@ labels_map = {
     7: "Squat Asymmetric"
 }
 
-WINDOW_SIZE = 20
-features_buffer: List[np.ndarray] = []
-current_exercise_for_buffer: str = ""
+WINDOW_SIZE, NUM_FEATURES = WINDOW_SHAPE
+
+
+def _load_onnx_model(path: Path, label: str):
+    """ONNX Runtime session shared by every engine (run() is thread-safe), or None."""
+    if not path.exists():
+        print(f"[EXERCISE] {label.capitalize()} not found at {path}")
+        return None
+    from onnx_sessions import create_session  # Deferred: loaded by the startup warmup
+    session = create_session(path)
+    print(f"[EXERCISE] Loaded {label} from {path}")
+    return session
+
+
+correction_model_component = register(
+    "correction_model", lambda: _load_onnx_model(MODELS_DIR / "correctionExercices (1).onnx", "correction model")
+)
+fitness_model_component = register(
+    "fitness_model", lambda: _load_onnx_model(MODELS_DIR / "fitness_model.onnx", "fitness model")
+)
 
 class ExerciseType(str, Enum):
     """Supported exercise types."""
@@ -159,7 +226,7 @@ class ExerciseEngine:
         Initialize the exercise engine.
         
         Loads all ML models:
-        - LSTM (via TFLite) + scaler for pushup/squat form classification
+        - LSTM (ONNX Runtime or TFLite, Keras fallback) + scaler for pushup/squat form classification
         - correctionExercices ONNX for angle-based correction on other exercises
         - fitness_model ONNX for body type estimation
         """
@@ -173,6 +240,19 @@ class ExerciseEngine:
         self._rep_progress_flag = False
         self._phase_start_time = time.time()
         self.confidence = 0.0
+
+        # Per-session LSTM input: scaled features of the last WINDOW_SIZE frames,
+        # plus the carried state of the streaming form classifier
+        self.feature_window = FeatureWindow(WINDOW_SIZE, NUM_FEATURES)
+        self._window_exercise = ""
+        self._lstm_stream_state = None
+        self._lstm_future = None  # In-flight window (batching service)
+        self._lstm_last: Tuple[Optional[str], float] = (None, 0.0)
+        # Rep-level mode: rows of the current rep, and frames since the last sliding check
+        self.rep_trajectory = RepTrajectory(NUM_FEATURES)
+        self._rep_input = np.zeros((WINDOW_SIZE, NUM_FEATURES), dtype=np.float32)
+        self._frames_since_check = 0
+        self.lstm_calls = 0
         
         # Model slots (populated by _load_models)
         self.classifier = None          # kept for health-check compat; always None now
@@ -186,67 +266,27 @@ class ExerciseEngine:
         """Update personalized thresholds from calibration."""
         self.thresholds = thresholds
 
-    def _calculate_features(self, keypoints: Dict) -> np.ndarray:
-        """Extract 15 features from keypoints."""
-        from pose_detector import POSE_LANDMARKS  # Import here to avoid circular
+    def _calculate_features(self, keypoints) -> np.ndarray:
+        """Extract 15 features from keypoints (PoseFrame or legacy dict)."""
+        # (x, y, z) rows; keypoints missing from the pose stay at (0, 0, 0)
+        return pose_features(as_pose_frame(keypoints).data[:, :3])
 
-        def get_point(idx):
-            name = POSE_LANDMARKS[idx]
-            point = keypoints.get(name)
-            
-            if point is None:
-                return (0.0, 0.0, 0.0)
-            
-            if isinstance(point, dict):
-                return (point.get('x', 0.0), point.get('y', 0.0), point.get('z', 0.0))
-            return (point[0], point[1], point[2])
-
-        def calculate_angle(a, b, c):
-            a, b, c = np.array(a), np.array(b), np.array(c)
-            ba = a - b
-            bc = c - b
-            cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-            angle = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
-            return angle
-
-        def calculate_distance(a, b):
-            return np.linalg.norm(np.array(a) - np.array(b))
-
-        # Angles
-        left_elbow = calculate_angle(get_point(11), get_point(13), get_point(15))
-        right_elbow = calculate_angle(get_point(12), get_point(14), get_point(16))
-        left_shoulder = calculate_angle(get_point(13), get_point(11), get_point(23))
-        right_shoulder = calculate_angle(get_point(14), get_point(12), get_point(24))
-        left_hip = calculate_angle(get_point(11), get_point(23), get_point(25))
-        right_hip = calculate_angle(get_point(12), get_point(24), get_point(26))
-        left_knee = calculate_angle(get_point(23), get_point(25), get_point(27))
-        right_knee = calculate_angle(get_point(24), get_point(26), get_point(28))
-        left_ankle = calculate_angle(get_point(25), get_point(27), get_point(31))
-        right_ankle = calculate_angle(get_point(26), get_point(28), get_point(32))
-        # Midpoint of shoulders for back angle (needs to be 3D)
-        p11 = get_point(11)
-        p12 = get_point(12)
-        mid_shoulder = ((p11[0] + p12[0])/2, (p11[1] + p12[1])/2, (p11[2] + p12[2])/2)
-        back = calculate_angle(p11, mid_shoulder, get_point(23))
-
-        # Derived
-        knee_dist = calculate_distance(get_point(25), get_point(26))
-        left_heel = abs(get_point(27)[2] - get_point(31)[2])
-        right_heel = abs(get_point(28)[2] - get_point(32)[2])
-        asymmetry = abs(left_knee - right_knee) + abs(left_hip - right_hip)
-
-        features = np.array([
-            left_elbow, right_elbow, left_shoulder, right_shoulder,
-            left_hip, right_hip, left_knee, right_knee,
-            left_ankle, right_ankle, back, knee_dist,
-            left_heel, right_heel, asymmetry
-        ])
-        return features
-
-    def _run_lstm_quality_check(self, keypoints: Dict) -> Tuple[Optional[str], float]:
-        global features_buffer, current_exercise_for_buffer
-
-        if lstm_model is None:
+    def _run_lstm_quality_check(self, keypoints, phase: Optional[ExercisePhase] = None,
+                                rep_completed: bool = False) -> Tuple[Optional[str], float]:
+        """
+        LSTM form label for pushup / squat.
+
+        Args:
+            keypoints: PoseFrame or legacy dict of the current frame
+            phase: Phase detected for this frame (rep-level mode)
+            rep_completed: A rep was counted on this frame (rep-level mode)
+        """
+        # Never block the frame loop on model loading: skip until the warmup has loaded it
+        classifier = form_classifier_component.peek()
+        scaler = scaler_component.peek()
+        if classifier is None or scaler is None:
+            form_classifier_component.load_in_background()
+            scaler_component.load_in_background()
             return None, 0.0
 
         # Only for squat and pushup
@@ -255,89 +295,122 @@ class ExerciseEngine:
 
         # Clear buffer if exercise changed
         ex_name = self.state.current_type.value
-        if ex_name != current_exercise_for_buffer:
-            features_buffer.clear()
-            current_exercise_for_buffer = ex_name
+        if ex_name != self._window_exercise:
+            self.feature_window.clear()
+            self._lstm_stream_state = None
+            self._lstm_future = None
+            self._lstm_last = (None, 0.0)
+            self.rep_trajectory.clear()
+            self._frames_since_check = 0
+            self._window_exercise = ex_name
 
         # Compute your 15 features (this part must match your training!)
+        # Scaled once, on insert into the window
         features = self._calculate_features(keypoints)
+        self.feature_window.push(features, scaler)
+
+        if hasattr(classifier, "step"):
+            # Streaming: one LSTM timestep per frame on the carried state
+            try:
+                if self._lstm_stream_state is None:
+                    self._lstm_stream_state = classifier.new_state()
+                prediction = classifier.step(self._lstm_stream_state, self.feature_window.latest())
+            except Exception as e:
+                print(f"[LSTM] Inference error: {e}")
+                return None, 0.0
+            return self._filter_lstm_prediction(prediction)
 
-        features_buffer.append(features)
-        if len(features_buffer) > WINDOW_SIZE:
-            features_buffer = features_buffer[-WINDOW_SIZE:]
+        if CLASSIFIER_MODE == "rep":
+            return self._rep_level_check(classifier, phase, rep_completed)
 
-        if len(features_buffer) < WINDOW_SIZE:
+        if not self.feature_window.full:
             return None, 0.0
 
-        try:
-            # Prepare input: (1, 20, 15)
-            data_raw = np.array(features_buffer)
-            data_scaled = scaler.transform(data_raw)
-            input_data = np.expand_dims(data_scaled, axis=0)
+        if BATCHING_ENABLED:
+            service = batch_service_component.peek()
+            if service is not None:
+                return self._batched_lstm_check(service)
+            batch_service_component.load_in_background()
 
-            prediction = lstm_model.predict(input_data, verbose=0)[0]
-            class_idx = np.argmax(prediction)
-            confidence = float(np.max(prediction))
+        # (20, 15) view of the ring, copied into the classifier's input tensor
+        return self._classify_window(classifier, self.feature_window.view())
 
-            if confidence >= 0.80:
-                label = labels_map[class_idx]
-                
-                # Filter label by current exercise type to avoid mismatch (e.g., Pushup label during Squat)
-                if self.state.current_type == ExerciseType.SQUAT and "Squat" in label:
-                    return label, confidence
-                if self.state.current_type == ExerciseType.PUSHUP and "Pushup" in label:
-                    return label, confidence
+    def _classify_window(self, classifier, window: np.ndarray) -> Tuple[Optional[str], float]:
+        try:
+            self.lstm_calls += 1
+            prediction = classifier.predict(window)
+            return self._filter_lstm_prediction(prediction)
         except Exception as e:
             print(f"[LSTM] Inference error: {e}")
-        
         return None, 0.0
 
-    def _ml_classify(self, features: np.ndarray) -> Tuple[Optional[str], float]:
-        """Run LSTM classification."""
-        global features_buffer
-        features_buffer.append(features)
-        if len(features_buffer) > WINDOW_SIZE:
-            features_buffer = features_buffer[-WINDOW_SIZE:]
-
-        if len(features_buffer) == WINDOW_SIZE:
-            data_scaled = scaler.transform(np.array(features_buffer))
-            input_details = interpreter.get_input_details()
-            output_details = interpreter.get_output_details()
-            interpreter.set_tensor(input_details[0]['index'], np.expand_dims(data_scaled.astype(np.float32), axis=0))
-            interpreter.invoke()
-            prediction = interpreter.get_tensor(output_details[0]['index'])[0]
-            class_idx = np.argmax(prediction)
-            confidence = np.max(prediction)
-            if confidence > 0.85:
-                return labels_map[class_idx], confidence
+    def _rep_level_check(self, classifier, phase: Optional[ExercisePhase],
+                         rep_completed: bool) -> Tuple[Optional[str], float]:
+        """
+        One classification per rep: the rows from the last UP frame to the
+        rep's end, time-normalized to WINDOW_SIZE steps. A sliding-window
+        check every SLIDING_INTERVAL frames keeps mid-rep warnings.
+        """
+        self.rep_trajectory.append(self.feature_window.latest())
+        self._frames_since_check += 1
+
+        if rep_completed:
+            result = (None, 0.0)
+            if len(self.rep_trajectory) >= 2:
+                window = self.rep_trajectory.resample(WINDOW_SIZE, out=self._rep_input)
+                result = self._classify_window(classifier, window)
+            self.rep_trajectory.keep_last()  # The rep's last UP frame starts the next one
+            self._frames_since_check = 0
+            return result
+
+        if phase == ExercisePhase.UP and not self._rep_progress_flag:
+            self.rep_trajectory.keep_last()  # Not in a rep yet: it starts from here
+
+        if self.feature_window.full and self._frames_since_check >= SLIDING_INTERVAL:
+            self._frames_since_check = 0
+            return self._classify_window(classifier, self.feature_window.view())
+        return None, 0.0
+
+    def _batched_lstm_check(self, service: BatchInferenceService) -> Tuple[Optional[str], float]:
+        """
+        Submit the window to the cross-session batcher without waiting. The
+        latest resolved result is reported until the next one arrives (at
+        most one window in flight per session).
+        """
+        future = self._lstm_future
+        if future is not None and future.done():
+            self._lstm_future = None
+            try:
+                self._lstm_last = self._filter_lstm_prediction(future.result())
+            except Exception as e:
+                print(f"[LSTM] Inference error: {e}")
+                self._lstm_last = (None, 0.0)
+        if self._lstm_future is None:
+            self._lstm_future = service.submit(self.feature_window.view())  # Copied on submit
+        return self._lstm_last
+
+    def _filter_lstm_prediction(self, prediction: Optional[np.ndarray]) -> Tuple[Optional[str], float]:
+        """Confident label matching the current exercise, else (None, 0.0)."""
+        if prediction is None:
+            return None, 0.0
+        class_idx = int(np.argmax(prediction))
+        confidence = float(np.max(prediction))
+
+        if confidence >= 0.80:
+            label = labels_map[class_idx]
+
+            # Filter label by current exercise type to avoid mismatch (e.g., Pushup label during Squat)
+            if self.state.current_type == ExerciseType.SQUAT and "Squat" in label:
+                return label, confidence
+            if self.state.current_type == ExerciseType.PUSHUP and "Pushup" in label:
+                return label, confidence
         return None, 0.0
 
     def process_keypoints(self, keypoints: Dict) -> Dict:
-        """Process keypoints to detect exercise, phase, reps, and feedback."""
+        """Process keypoints to detect exercise, phase, reps, and feedback (update() on the current exercise)."""
         angles = self._calculate_angles(keypoints)
-
-        # === LSTM quality check for pushup / squat ===
-        if self.state.current_type in [ExerciseType.SQUAT, ExerciseType.PUSHUP]:
-            ml_label, ml_conf = self._run_lstm_quality_check(keypoints)
-            if ml_label:
-                self.state.ml_label = ml_label
-                self.state.ml_confidence = ml_conf
-                
-                # If LSTM says bad form → add to feedback
-                if "Incorrect" in ml_label or any(issue in ml_label.lower() for issue in ["shallow", "lean", "caving", "off", "asymmetric"]):
-                    issue_code = ml_label.lower().replace(" ", "_")
-                    if issue_code not in self.state.feedback_codes:
-                        self.state.feedback_codes.append(issue_code)
-        else:
-            # === Correction ONNX for all other exercises ===
-            corr_label, corr_conf = self._run_correction_onnx(keypoints)
-            if corr_label:
-                self.state.ml_label = corr_label
-                self.state.ml_confidence = corr_conf
-                issue_code = corr_label.lower().replace(" ", "_")
-                if issue_code not in self.state.feedback_codes:
-                    self.state.feedback_codes.append(issue_code)
-        
+        # Same path as the frame loop: the LSTM gets the phase and rep status
+        self.update(angles, keypoints, self.state.current_type)
         self.prev_keypoints = keypoints
         return {
             "exercise": self.state.current_type.value,
@@ -349,41 +422,18 @@ class ExerciseEngine:
         }
 
     def _load_models(self):
-        """Load ML models: correction ONNX + fitness ONNX.
+        """Attach the ML models: correction ONNX + fitness ONNX.
         
-        LSTM / scaler are loaded at module level (global interpreter & scaler).
+        The sessions are lazy module-level components shared by every engine
+        (one engine per connection), like the LSTM / scaler
+        (form_classifier_component / scaler_component).
         classif_model_.pkl is no longer used — exercise type comes from the
         frontend UI selection and the LSTM handles pushup/squat form quality.
         """
         # --- 1. correctionExercices ONNX (angle-based correction for non-LSTM exercises) ---
-        correction_path = MODELS_DIR / "correctionExercices (1).onnx"
-        if correction_path.exists():
-            try:
-                self.correction_model = ort.InferenceSession(
-                    str(correction_path),
-                    providers=['CPUExecutionProvider']
-                )
-                print(f"[EXERCISE] Loaded correction model from {correction_path}")
-            except Exception as e:
-                print(f"[EXERCISE] Failed to load correction model: {e}")
-                self.correction_model = None
-        else:
-            print(f"[EXERCISE] Correction model not found at {correction_path}")
-        
+        self.correction_model = correction_model_component.get()
         # --- 2. fitness_model ONNX (body type estimation) ---
-        fitness_path = MODELS_DIR / "fitness_model.onnx"
-        if fitness_path.exists():
-            try:
-                self.fitness_model = ort.InferenceSession(
-                    str(fitness_path),
-                    providers=['CPUExecutionProvider']
-                )
-                print(f"[EXERCISE] Loaded fitness model from {fitness_path}")
-            except Exception as e:
-                print(f"[EXERCISE] Failed to load fitness model: {e}")
-                self.fitness_model = None
-        else:
-            print(f"[EXERCISE] Fitness model not found at {fitness_path}")
+        self.fitness_model = fitness_model_component.get()
     
     def _run_correction_onnx(self, keypoints: Dict) -> Tuple[Optional[str], float]:
         """Run correctionExercices ONNX model for form correction.
@@ -512,13 +562,13 @@ class ExerciseEngine:
         return ExerciseType.UNKNOWN, 0.0
     
 
-    def update(self, angles: Dict[str, float], keypoints: Dict, exercise_type: Optional[ExerciseType] = None, visibility: float = 1.0) -> Dict[str, Any]:
+    def update(self, angles: Dict[str, float], keypoints, exercise_type: Optional[ExerciseType] = None, visibility: float = 1.0) -> Dict[str, Any]:
         """
         Update exercise state with new frame data.
         
         Args:
             angles: Dictionary of joint angles
-            keypoints: Dictionary of raw keypoints (needed for ML models)
+            keypoints: PoseFrame or dictionary of raw keypoints (needed for ML models)
             exercise_type: Override exercise type (or auto-detect)
             visibility: Average visibility of keypoints (0.0 to 1.0)
             
@@ -601,7 +651,7 @@ class ExerciseEngine:
         # === ML Model Quality Check ===
         # Run primarily for pushup/squat (LSTM) or fallback to correction ONNX
         if self.state.current_type in [ExerciseType.SQUAT, ExerciseType.PUSHUP]:
-            ml_label, ml_conf = self._run_lstm_quality_check(keypoints)
+            ml_label, ml_conf = self._run_lstm_quality_check(keypoints, new_phase, rep_status)
             if ml_label:
                 self.state.ml_label = ml_label
                 self.state.ml_confidence = ml_conf
@@ -984,6 +1034,11 @@ class ExerciseEngine:
         self._prev_phase = ExercisePhase.IDLE
         self._rep_progress_flag = False
         self._phase_start_time = time.time()
+        self._lstm_stream_state = None
+        self._lstm_future = None
+        self._lstm_last = (None, 0.0)
+        self.rep_trajectory.clear()
+        self._frames_since_check = 0
         print("[EXERCISE] State reset")
     
     def new_set(self):
@@ -993,56 +1048,19 @@ class ExerciseEngine:
         self.state.rep_times = []
         print(f"[EXERCISE] Starting set {self.state.set_count}")
     
-    def _calculate_angles(self, keypoints: Dict) -> Dict[str, float]:
-        """Calculate joint angles from keypoints."""
-        from pose_detector import POSE_LANDMARKS
-        
-        def get_point(idx):
-            point = keypoints.get(POSE_LANDMARKS[idx], (0, 0, 0, 0))
-            return (point[0], point[1], point[2])
-        
-        def calculate_angle(a, b, c):
-            a, b, c = np.array(a), np.array(b), np.array(c)
-            ba = a - b
-            bc = c - b
-            cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-            angle = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
-            return angle
-        
-        angles = {}
-        angles["left_elbow"] = calculate_angle(get_point(11), get_point(13), get_point(15))
-        angles["right_elbow"] = calculate_angle(get_point(12), get_point(14), get_point(16))
-        angles["left_shoulder"] = calculate_angle(get_point(13), get_point(11), get_point(23))
-        angles["right_shoulder"] = calculate_angle(get_point(14), get_point(12), get_point(24))
-        angles["left_hip"] = calculate_angle(get_point(11), get_point(23), get_point(25))
-        angles["right_hip"] = calculate_angle(get_point(12), get_point(24), get_point(26))
-        angles["left_knee"] = calculate_angle(get_point(23), get_point(25), get_point(27))
-        angles["right_knee"] = calculate_angle(get_point(24), get_point(26), get_point(28))
-        angles["left_ankle"] = calculate_angle(get_point(25), get_point(27), get_point(31))
-        angles["right_ankle"] = calculate_angle(get_point(26), get_point(28), get_point(32))
-        
-        # Calculate torso angle (simplified)
-        left_shoulder = get_point(11)
-        right_shoulder = get_point(12)
-        left_hip = get_point(23)
-        mid_shoulder = ((left_shoulder[0] + right_shoulder[0])/2, 
-                       (left_shoulder[1] + right_shoulder[1])/2, 
-                       (left_shoulder[2] + right_shoulder[2])/2)
-        angles["torso_angle"] = calculate_angle(mid_shoulder, left_hip, (left_hip[0], left_hip[1] - 1, left_hip[2]))
-        
-        return angles
+    def _calculate_angles(self, keypoints) -> Dict[str, float]:
+        """Calculate 3D joint angles from keypoints (PoseFrame or legacy dict)."""
+        values = engine_angles(as_pose_frame(keypoints).data[:, :3]).tolist()
+        return {name: v for name, v in zip(FEATURE_ANGLES, values) if name != "back"}
 
 
 # Global exercise engine instance
-_exercise_engine: Optional[ExerciseEngine] = None
+_exercise_engine_component = register("exercise_engine", ExerciseEngine)
 
 
 def get_exercise_engine() -> ExerciseEngine:
-    """Get or create the global exercise engine."""
-    global _exercise_engine
-    if _exercise_engine is None:
-        _exercise_engine = ExerciseEngine()
-    return _exercise_engine
+    """Get or create the global exercise engine (thread-safe: also built by the startup warmup)."""
+    return _exercise_engine_component.get()
 
 
 def map_exercise_name(name: str) -> ExerciseType:
@@ -0,0 +1,58 @@
+"""
+One-time export of the Keras form-classification LSTM to ONNX for
+form_classifier.OnnxFormClassifier. Needs tensorflow and tf2onnx on the
+export machine only; the backend runs the exported model with onnxruntime.
+
+Usage (from backend dir):  python export_lstm_onnx.py [--model models/model_lstm_tache2.h5] [--opset 13]
+                           [--dynamic-batch]   (batched cross-session inference, batch_inference.py)
+"""
+import argparse
+from pathlib import Path
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+
+def export_onnx(model, output: Path, opset: int = 13, dynamic_batch: bool = False) -> Path:
+    """Convert a loaded Keras LSTM classifier to ONNX (needs tensorflow and tf2onnx)."""
+    import tensorflow as tf
+    import tf2onnx
+
+    window, features = model.input_shape[1:]
+    # Fixed batch of one window by default: static shapes let ORT fuse the LSTM fully
+    batch = None if dynamic_batch else 1
+    spec = (tf.TensorSpec((batch, window, features), tf.float32, name="window"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=str(output))
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Keras LSTM form classifier to ONNX")
+    parser.add_argument("--model", type=Path, default=MODELS_DIR / "model_lstm_tache2.h5")
+    parser.add_argument("--output", type=Path, default=None, help="Default: models/<model stem>.onnx")
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--dynamic-batch", action="store_true",
+                        help="Dynamic batch axis (for FORM_CLASSIFIER_BATCHING) instead of a fixed batch of one")
+    args = parser.parse_args()
+
+    # Export-time dependencies only
+    import numpy as np
+    import tensorflow as tf
+    import onnxruntime as ort
+
+    output = args.output or MODELS_DIR / (args.model.stem + ".onnx")
+    print(f"Loading {args.model}...")
+    model = tf.keras.models.load_model(str(args.model))
+    window, features = model.input_shape[1:]
+    export_onnx(model, output, args.opset, args.dynamic_batch)
+    print(f"Saved {output}")
+
+    # Parity check against Keras
+    sample = np.random.default_rng(0).normal(size=(1, window, features)).astype(np.float32)
+    expected = model(sample, training=False).numpy()
+    session = ort.InferenceSession(str(output), providers=["CPUExecutionProvider"])
+    actual = session.run(None, {session.get_inputs()[0].name: sample})[0]
+    print(f"Max abs difference vs Keras: {np.abs(expected - actual).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
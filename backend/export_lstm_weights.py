@@ -0,0 +1,102 @@
+"""
+One-time export of the Keras form-classification LSTM weights to an .npz for
+the streaming NumPy classifier (lstm_streaming.py). Needs tensorflow on the
+export machine only.
+
+Usage (from backend dir):  python export_lstm_weights.py [--model models/model_lstm_tache2.h5]
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Layers StreamingLSTMClassifier reproduces; Dropout / InputLayer are no-ops at inference
+SKIPPED_LAYERS = ("InputLayer", "Dropout")
+# Dense head as hardcoded in lstm_streaming (StreamingLSTMClassifier._head)
+DENSE_ACTIVATIONS = ("relu", "softmax")
+PARITY_TOLERANCE = 1e-4
+
+
+def check_architecture(layers: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """
+    Differences between a Keras model and what the streaming classifier computes.
+
+    Args:
+        layers: (class name, get_config()) of every model layer, in order
+
+    Returns:
+        Problems (empty if the model can be exported)
+    """
+    from lstm_streaming import DENSE_LAYERS, LSTM_LAYERS
+
+    problems = []
+    kept = [(cls, config) for cls, config in layers if cls not in SKIPPED_LAYERS]
+    expected = ["LSTM"] * len(LSTM_LAYERS) + ["Dense"] * len(DENSE_LAYERS)
+    if [cls for cls, _ in kept] != expected:
+        problems.append(f"Expected layers {' -> '.join(expected)} (plus Dropout), "
+                        f"got {' -> '.join(cls for cls, _ in kept)}")
+        return problems
+    lstms, denses = kept[:len(LSTM_LAYERS)], kept[len(LSTM_LAYERS):]
+    for i, (_, config) in enumerate(lstms):
+        name = config.get("name", f"lstm {i}")
+        if config.get("activation") != "tanh" or config.get("recurrent_activation") != "sigmoid":
+            problems.append(f"{name}: only tanh/sigmoid LSTMs are supported")
+        if config.get("go_backwards") or config.get("stateful") or not config.get("use_bias", True):
+            problems.append(f"{name}: go_backwards / stateful / no-bias LSTMs are not supported")
+        if config.get("return_sequences", False) != (i < len(lstms) - 1):
+            problems.append(f"{name}: only the last LSTM may return a single state")
+    for (_, config), activation in zip(denses, DENSE_ACTIVATIONS):
+        name = config.get("name", "dense")
+        if config.get("activation") != activation:
+            problems.append(f"{name}: activation {config.get('activation')!r}, streaming head expects {activation!r}")
+        if not config.get("use_bias", True):
+            problems.append(f"{name}: Dense layers without bias are not supported")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the LSTM form classifier weights for streaming inference")
+    parser.add_argument("--model", type=Path, default=MODELS_DIR / "model_lstm_tache2.h5")
+    parser.add_argument("--output", type=Path, default=None, help="Default: models/<model stem>_weights.npz")
+    args = parser.parse_args()
+
+    # Export-time dependencies only
+    import numpy as np
+    import tensorflow as tf
+    from lstm_streaming import DENSE_LAYERS, LSTM_LAYERS, StreamingLSTMClassifier
+
+    output = args.output or MODELS_DIR / (args.model.stem + "_weights.npz")
+    print(f"Loading {args.model}...")
+    model = tf.keras.models.load_model(str(args.model))
+
+    problems = check_architecture([(type(layer).__name__, layer.get_config()) for layer in model.layers])
+    if problems:
+        raise SystemExit("Model not supported by the streaming classifier:\n  " + "\n  ".join(problems))
+    lstms = [layer for layer in model.layers if isinstance(layer, tf.keras.layers.LSTM)]
+    denses = [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+
+    weights = {}
+    for name, layer in zip(LSTM_LAYERS, lstms):
+        kernel, recurrent, bias = layer.get_weights()
+        weights.update({f"{name}_kernel": kernel, f"{name}_recurrent": recurrent, f"{name}_bias": bias})
+    for name, layer in zip(DENSE_LAYERS, denses):
+        kernel, bias = layer.get_weights()
+        weights.update({f"{name}_kernel": kernel, f"{name}_bias": bias})
+
+    # Parity check of the full-window NumPy path against Keras, before anything is written
+    window, features = model.input_shape[1:]
+    sample = np.random.default_rng(0).normal(size=(1, window, features)).astype(np.float32)
+    expected = model(sample, training=False).numpy()[0]
+    actual = StreamingLSTMClassifier(weights, window=window).predict(sample[0])
+    diff = float(np.abs(expected - actual).max())
+    print(f"Max abs difference vs Keras: {diff:.2e}")
+    if diff > PARITY_TOLERANCE:
+        raise SystemExit(f"Streaming classifier does not match Keras (> {PARITY_TOLERANCE:.0e}): not saved")
+
+    np.savez(output, **weights)
+    print(f"Saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+One-time export of the YOLO pose model to ONNX for yolo_onnx.YoloPoseOnnx.
+Needs ultralytics (and torch) on the export machine only; the backend runs
+the exported model with onnxruntime.
+
+Usage (from backend dir):  python export_yolo_onnx.py [--model models/unified_model.pt] [--imgsz 640]
+"""
+import argparse
+import shutil
+from pathlib import Path
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a YOLO pose .pt model to ONNX")
+    parser.add_argument("--model", type=Path, default=MODELS_DIR / "unified_model.pt",
+                        help="YOLO pose weights (default: models/unified_model.pt, else yolov8n-pose.pt)")
+    parser.add_argument("--imgsz", type=int, default=640, help="Static square input size")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO  # Export-time dependency only
+
+    weights = args.model if args.model.exists() else MODELS_DIR / "yolov8n-pose.pt"
+    print(f"Exporting {weights} (imgsz={args.imgsz})...")
+    model = YOLO(str(weights))
+    # Static shape, no NMS in the graph: decoding/NMS is done in NumPy by YoloPoseOnnx
+    exported = Path(model.export(format="onnx", imgsz=args.imgsz, dynamic=False, simplify=True, opset=12))
+
+    dest = MODELS_DIR / (Path(weights).stem + ".onnx")
+    if exported.resolve() != dest.resolve():
+        shutil.move(str(exported), dest)
+    print(f"Saved {dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Scaled LSTM feature window without per-frame allocation.
+Each frame's 15 features are standardized once, on insert, with the fitted
+scaler's mean_/scale_ arrays, into a preallocated (2 * window, features)
+float32 ring. Every row is written twice (at i and i + window), so the last
+`window` rows are always one contiguous view: no slicing copies, no
+np.array() of a list, no sklearn call per frame. RepTrajectory keeps the rows
+of one repetition for rep-level classification.
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).parent / "models"
+SCALER_PKL_PATH = MODELS_DIR / "scaler_tache2.pkl"
+# mean / scale arrays, converted from the pickle on first load (numpy only)
+SCALER_NPZ_PATH = MODELS_DIR / "scaler_tache2.npz"
+
+
+class FeatureScaler:
+    """Standardization (x - mean) / scale with the arrays of a fitted sklearn scaler."""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self._inv_scale = (1.0 / self.scale).astype(np.float32)
+
+    @classmethod
+    def from_sklearn(cls, scaler) -> "FeatureScaler":
+        """From a fitted StandardScaler (mean_, scale_) or MinMaxScaler (min_, scale_)."""
+        if hasattr(scaler, "mean_"):
+            n = scaler.n_features_in_
+            mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n)
+            scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n)
+            return cls(mean, scale)
+        if hasattr(scaler, "min_"):
+            # x * scale_ + min_  ==  (x - (-min_ / scale_)) / (1 / scale_)
+            return cls(-scaler.min_ / scaler.scale_, 1.0 / scaler.scale_)
+        raise TypeError(f"Unsupported scaler: {type(scaler).__name__}")
+
+    @classmethod
+    def from_npz(cls, path: Path) -> "FeatureScaler":
+        with np.load(path) as arrays:
+            return cls(arrays["mean"], arrays["scale"])
+
+    def save(self, path: Path):
+        np.savez(path, mean=self.mean, scale=self.scale)
+
+    def transform_row(self, row: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scale one (features,) row, into out if given."""
+        if out is None:
+            out = np.empty_like(self.mean)
+        np.subtract(row, self.mean, out=out)
+        np.multiply(out, self._inv_scale, out=out)
+        return out
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        """sklearn-compatible (n, features) transform."""
+        return (np.asarray(x, dtype=np.float32) - self.mean) * self._inv_scale
+
+
+def load_feature_scaler(npz_path: Path = SCALER_NPZ_PATH, pkl_path: Path = SCALER_PKL_PATH) -> FeatureScaler:
+    """
+    The LSTM feature scaler. Reads the .npz when it is at least as recent as
+    the pickle; otherwise (missing, or a retrained scaler_tache2.pkl) unpickles
+    the sklearn scaler (joblib) and rewrites the .npz for the next start.
+    """
+    if npz_path.exists() and not (pkl_path.exists() and pkl_path.stat().st_mtime > npz_path.stat().st_mtime):
+        return FeatureScaler.from_npz(npz_path)
+    import joblib
+    scaler = FeatureScaler.from_sklearn(joblib.load(pkl_path))
+    try:
+        scaler.save(npz_path)
+        print(f"[EXERCISE] Converted {pkl_path.name} to {npz_path.name}")
+    except OSError as e:
+        print(f"[EXERCISE] Could not save {npz_path.name}: {e}")
+    return scaler
+
+
+class FeatureWindow:
+    """
+    Last `window` scaled feature rows, oldest first.
+    Not thread-safe: one writer (the frame loop) at a time.
+    """
+
+    def __init__(self, window: int, features: int):
+        self.window = window
+        self._buffer = np.zeros((2 * window, features), dtype=np.float32)
+        self._pos = 0  # Next write slot, in [0, window)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.window
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
+
+    def push(self, features: np.ndarray, scaler: Optional[FeatureScaler] = None):
+        """Append one frame's features, scaled in place when a scaler is given."""
+        row = self._buffer[self._pos]
+        if scaler is not None:
+            scaler.transform_row(features, out=row)
+        else:
+            row[:] = features
+        self._buffer[self._pos + self.window] = row
+        self._pos = (self._pos + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+    def latest(self) -> np.ndarray:
+        """View of the most recent row."""
+        return self._buffer[self._pos + self.window - 1]
+
+    def view(self) -> np.ndarray:
+        """(len, features) contiguous view of the rows, oldest first (valid until the next push)."""
+        return self._buffer[self._pos + self.window - self._count:self._pos + self.window]
+
+
+class RepTrajectory:
+    """
+    Scaled feature rows of the current repetition, resampled to a fixed
+    number of timesteps once the rep completes. Preallocated: a rep longer
+    than max_frames is decimated by two (every other row kept, then every
+    other frame appended), so the whole rep stays uniformly sampled.
+    """
+
+    def __init__(self, features: int, max_frames: int = 256):
+        self.max_frames = max(4, max_frames)
+        self._buffer = np.zeros((self.max_frames, features), dtype=np.float32)
+        self._count = 0
+        self._stride = 1  # Frames per stored row
+        self._skipped = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._count = 0
+        self._stride = 1
+        self._skipped = 0
+
+    def keep_last(self):
+        """Restart the trajectory from the most recent row (rep start)."""
+        if self._count:
+            self._buffer[0] = self._buffer[self._count - 1]
+            self._count = 1
+        self._stride = 1
+        self._skipped = 0
+
+    def append(self, row: np.ndarray):
+        if self._skipped + 1 < self._stride:
+            self._skipped += 1
+            return
+        self._skipped = 0
+        if self._count == self.max_frames:
+            half = self.max_frames // 2
+            self._buffer[:half] = self._buffer[:2 * half:2]
+            self._count = half
+            self._stride *= 2
+        self._buffer[self._count] = row
+        self._count += 1
+
+    def resample(self, steps: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """(steps, features) linear time-normalization of the rows (into out if given)."""
+        if out is None:
+            out = np.empty((steps, self._buffer.shape[1]), dtype=np.float32)
+        if self._count == 0:
+            out[:] = 0.0
+            return out
+        positions = np.linspace(0.0, self._count - 1, steps)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, self._count - 1)
+        frac = (positions - lower)[:, np.newaxis].astype(np.float32)
+        rows = self._buffer[:self._count]
+        np.multiply(rows[lower], 1.0 - frac, out=out)
+        out += rows[upper] * frac
+        return out
@@ -0,0 +1,214 @@
+"""
+LSTM form classifier runtimes.
+The (1, 20, 15) window is tiny: Keras model.predict() spends far more time
+building its data pipeline than computing. The ONNX Runtime and TFLite
+classifiers write each window into a preallocated input (IOBinding / the
+interpreter's input tensor); Keras is only the fallback when neither an
+exported model nor a runtime is available. The "streaming" runtime
+(lstm_streaming.py) steps a carried LSTM state once per frame instead.
+The windowed wrappers own their input buffers and runtime, so every call
+takes the wrapper's lock: sessions, the batch service and tools can share
+one instance.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from tflite_loader import load_tflite_interpreter
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Builtins-only export first (convert_lstm.py --ship: unrolled LSTMs, no Flex ops)
+TFLITE_MODEL_PATHS = [
+    MODELS_DIR / "model_lstm_tache2_optimized.tflite",
+    MODELS_DIR / "model_lstm_tache2.tflite",
+]
+KERAS_MODEL_PATH = MODELS_DIR / "model_lstm_tache2.h5"
+# Exported with export_lstm_onnx.py
+ONNX_MODEL_PATH = MODELS_DIR / "model_lstm_tache2.onnx"
+
+WINDOW_SHAPE = (20, 15)  # (frames, features) per classification
+
+
+class OnnxFormClassifier:
+    """
+    LSTM on ONNX Runtime (same stack as the correction / fitness models).
+    Input and output are bound once to reused buffers (IOBinding): predict()
+    writes the window in place and runs, with no per-call allocation.
+    Calls are serialized on the instance lock.
+    """
+
+    runtime = "onnx"
+
+    def __init__(self, session):
+        self.session = session
+        self._lock = threading.Lock()
+        model_input = session.get_inputs()[0]
+        model_output = session.get_outputs()[0]
+        # Dynamic axes are pinned to one (20, 15) window
+        dims = [d if isinstance(d, int) else None for d in model_input.shape]
+        self.dynamic_batch = dims[0] is None  # Exported with --dynamic-batch
+        self._input_name = model_input.name
+        self._output_name = model_output.name
+        self.input_shape = (dims[0] or 1,) + tuple(d or default for d, default in zip(dims[1:], WINDOW_SHAPE))
+        output_shape = tuple(d if isinstance(d, int) else 1 for d in model_output.shape)
+        self._input = np.zeros(self.input_shape, dtype=np.float32)
+        self._output = np.zeros(output_shape, dtype=np.float32)
+
+        self._binding = session.io_binding()
+        self._binding.bind_input(model_input.name, "cpu", 0, np.float32,
+                                 list(self.input_shape), self._input.ctypes.data)
+        self._binding.bind_output(model_output.name, "cpu", 0, np.float32,
+                                  list(output_shape), self._output.ctypes.data)
+
+    @classmethod
+    def from_path(cls, model_path: Path) -> "OnnxFormClassifier":
+        from onnx_sessions import create_session
+        return cls(create_session(model_path))
+
+    def predict(self, window: np.ndarray) -> np.ndarray:
+        """Class probabilities (a copy) for one scaled (window, features) array."""
+        with self._lock:
+            return self._predict(window)
+
+    def _predict(self, window: np.ndarray) -> np.ndarray:
+        self._input[0] = window
+        self.session.run_with_iobinding(self._binding)
+        return self._output[0].copy()
+
+    def predict_batch(self, windows: np.ndarray) -> np.ndarray:
+        """(n, window, features) -> (n, classes); one run if the batch axis is dynamic."""
+        batch = np.ascontiguousarray(windows, dtype=np.float32)
+        with self._lock:
+            if not self.dynamic_batch:
+                return np.stack([self._predict(window) for window in batch])
+            return self.session.run([self._output_name], {self._input_name: batch})[0]
+
+
+class TFLiteFormClassifier:
+    """
+    LSTM on a TFLite interpreter with preallocated tensors.
+    Calls are serialized on the instance lock.
+    """
+
+    runtime = "tflite"
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self._lock = threading.Lock()
+        interpreter.allocate_tensors()
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        self._input_index = input_details["index"]
+        self._output_index = output_details["index"]
+        self.input_shape = tuple(input_details["shape"])  # (1, window, features)
+        # Callables returning numpy views of the tensor buffers (re-fetched each
+        # call: views must not be held across invoke())
+        self._input_view = interpreter.tensor(self._input_index)
+        self._output_view = interpreter.tensor(self._output_index)
+
+    @classmethod
+    def from_path(cls, model_path: Path, num_threads: int = 1) -> "TFLiteFormClassifier":
+        return cls(load_tflite_interpreter(model_path, num_threads))
+
+    def predict(self, window: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for one scaled window.
+
+        Args:
+            window: (window, features) scaled features
+
+        Returns:
+            (classes,) probabilities (a copy)
+        """
+        with self._lock:
+            self._input_view()[0] = window  # In place, cast to the tensor dtype
+            self.interpreter.invoke()
+            return self._output_view()[0].copy()
+
+
+class KerasFormClassifier:
+    """
+    Keras model called directly (no predict() pipeline); needs TensorFlow.
+    Calls are serialized on the instance lock.
+    """
+
+    runtime = "keras"
+
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+        self.input_shape = (1,) + tuple(model.input_shape[1:])
+        self._input = np.zeros(self.input_shape, dtype=np.float32)
+
+    def predict(self, window: np.ndarray) -> np.ndarray:
+        with self._lock:
+            self._input[0] = window
+            return np.asarray(self.model(self._input, training=False))[0]
+
+    def predict_batch(self, windows: np.ndarray) -> np.ndarray:
+        with self._lock:
+            return np.asarray(self.model(np.asarray(windows, dtype=np.float32), training=False))
+
+
+def load_form_classifier(runtime: Optional[str] = None, keras_model_loader=None):
+    """
+    Best available form classifier.
+
+    Args:
+        runtime: "onnx", "tflite", "keras" or "auto" (in that order), or
+            "streaming" (opt-in: approximates the window, see lstm_streaming.py).
+            Defaults to the FORM_CLASSIFIER_RUNTIME env var ("auto").
+        keras_model_loader: Returns the Keras model (or None) for the fallback
+
+    Returns:
+        OnnxFormClassifier / TFLiteFormClassifier / KerasFormClassifier /
+        StreamingLSTMClassifier, or None if nothing loads
+    """
+    if runtime is None:
+        runtime = os.getenv("FORM_CLASSIFIER_RUNTIME", "auto")
+    runtime = runtime.lower()
+
+    if runtime == "streaming":
+        from lstm_streaming import WEIGHTS_PATH, StreamingLSTMClassifier
+        if WEIGHTS_PATH.exists():
+            try:
+                classifier = StreamingLSTMClassifier.from_npz(WEIGHTS_PATH, window=WINDOW_SHAPE[0])
+                print(f"[EXERCISE] Form classifier: streaming NumPy LSTM ({WEIGHTS_PATH.name})")
+                return classifier
+            except Exception as e:
+                print(f"[EXERCISE] Failed to load streaming classifier: {e}")
+        else:
+            print(f"[EXERCISE] {WEIGHTS_PATH.name} not found (run export_lstm_weights.py)")
+        runtime = "auto"  # Windowed runtimes as fallback
+
+    if runtime in ("auto", "onnx") and ONNX_MODEL_PATH.exists():
+        try:
+            classifier = OnnxFormClassifier.from_path(ONNX_MODEL_PATH)
+            print(f"[EXERCISE] Form classifier: ONNX Runtime ({ONNX_MODEL_PATH.name})")
+            return classifier
+        except Exception as e:
+            print(f"[EXERCISE] Failed to load ONNX classifier: {e}")
+
+    if runtime in ("auto", "tflite"):
+        for path in TFLITE_MODEL_PATHS:
+            if not path.exists():
+                continue
+            try:
+                classifier = TFLiteFormClassifier.from_path(path)
+                print(f"[EXERCISE] Form classifier: TFLite ({path.name})")
+                return classifier
+            except Exception as e:
+                print(f"[EXERCISE] Failed to load TFLite classifier {path.name}: {e}")
+
+    if runtime in ("auto", "keras") and keras_model_loader is not None:
+        model = keras_model_loader()
+        if model is not None:
+            print("[EXERCISE] Form classifier: Keras")
+            return KerasFormClassifier(model)
+
+    print("[EXERCISE] No form classifier available")
+    return None
@@ -0,0 +1,157 @@
+"""
+Ingest of externally captured frames (PC mode).
+The browser camera sends JPEG frames as binary WebSocket messages; they are
+rate limited per client and decoded straight to a reduced size before
+entering the frame ring.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+
+
+# Decode-time downscale factor -> imdecode flag (JPEG DCT scaling, no resize pass)
+REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+class TokenBucket:
+    """Token bucket rate limiter: `rate` tokens per second, up to `burst` stored."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class FrameIngest:
+    """
+    Rate limiting, decoding and counters for pushed frames.
+    Thread-safe: frames may be pushed from several connections.
+    """
+
+    def __init__(self, max_fps: float = 30.0, burst: int = 5, reduction: int = 2):
+        """
+        Initialize the ingest path.
+
+        Args:
+            max_fps: Per-client ingest rate limit (frames per second)
+            burst: Frames a client may send back-to-back above the rate
+            reduction: Decode-time downscale factor (1, 2, 4 or 8)
+        """
+        if reduction not in REDUCED_DECODE_FLAGS:
+            print(f"[INGEST] Unsupported reduction {reduction}, using 2")
+            reduction = 2
+        self.max_fps = max_fps
+        self.burst = burst
+        self.reduction = reduction
+        self._decode_flag = REDUCED_DECODE_FLAGS[reduction]
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+
+        # Counters
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.frames_decoded = 0
+        self.rate_limited = 0
+        self.decode_errors = 0
+        self.skipped_inference = 0  # Decoded but not sent to inference (workers busy or paced)
+        self.decode_ms_avg = 0.0
+        self.decode_ms_max = 0.0
+        self.ingest_fps = 0.0
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    @classmethod
+    def from_env(cls) -> "FrameIngest":
+        """Build from POSE_INGEST_MAX_FPS / POSE_INGEST_BURST / POSE_INGEST_REDUCTION."""
+        return cls(
+            max_fps=float(os.getenv("POSE_INGEST_MAX_FPS", "30")),
+            burst=int(os.getenv("POSE_INGEST_BURST", "5")),
+            reduction=int(os.getenv("POSE_INGEST_REDUCTION", "2")),
+        )
+
+    def admit(self, client_id: Hashable, size: int = 0, now: Optional[float] = None) -> bool:
+        """
+        Count an incoming frame and apply the client's rate limit.
+
+        Returns:
+            False if the frame must be dropped (client over its rate)
+        """
+        with self._lock:
+            self.frames_received += 1
+            self.bytes_received += size
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = self._buckets[client_id] = TokenBucket(self.max_fps, self.burst)
+            if bucket.allow(now):
+                return True
+            self.rate_limited += 1
+            return False
+
+    def decode(self, data: bytes) -> Optional[np.ndarray]:
+        """Decode a JPEG/PNG buffer at the reduced size. Returns a BGR frame or None."""
+        start = time.perf_counter()
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), self._decode_flag) if data else None
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        with self._lock:
+            if frame is None or frame.size == 0:
+                self.decode_errors += 1
+                return None
+            self.frames_decoded += 1
+            n = self.frames_decoded
+            self.decode_ms_avg += (elapsed_ms - self.decode_ms_avg) / min(n, 100)  # ~100-frame running mean
+            self.decode_ms_max = max(self.decode_ms_max, elapsed_ms)
+
+            self._window_frames += 1
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self.ingest_fps = self._window_frames / (now - self._window_start)
+                self._window_start = now
+                self._window_frames = 0
+        return frame
+
+    def mark_skipped(self):
+        """Count a decoded frame that was not sent to inference."""
+        with self._lock:
+            self.skipped_inference += 1
+
+    def forget(self, client_id: Hashable):
+        """Drop a disconnected client's rate-limit state."""
+        with self._lock:
+            self._buckets.pop(client_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._buckets),
+                "frames_received": self.frames_received,
+                "bytes_received": self.bytes_received,
+                "frames_decoded": self.frames_decoded,
+                "rate_limited": self.rate_limited,
+                "decode_errors": self.decode_errors,
+                "skipped_inference": self.skipped_inference,
+                "ingest_fps": round(self.ingest_fps, 1),
+                "decode_ms_avg": round(self.decode_ms_avg, 2),
+                "decode_ms_max": round(self.decode_ms_max, 2),
+                "reduction": self.reduction,
+            }
@@ -0,0 +1,90 @@
+"""
+Copy-free preprocessing for the pose models.
+Frames are letterboxed straight into a persistent RGB buffer: the BGR->RGB
+conversion writes into the centre of the buffer, so there is no separate
+flip, pad or convert allocation per inference. Governor downscales go to
+persistent per-size buffers the same way (ResizeBuffer).
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class LetterboxBuffer:
+    """
+    Persistent square RGB buffer a frame is letterboxed into.
+
+    The buffer (and its black borders) is only reallocated when the frame
+    geometry changes; each call overwrites the centre region in place.
+    Not thread-safe: use one instance per inference worker.
+    """
+
+    def __init__(self):
+        self._buffer: Optional[np.ndarray] = None
+        self._roi: Optional[np.ndarray] = None
+        self._shape: Optional[Tuple[int, ...]] = None
+        self.size = 0
+        self.pad_w = 0
+        self.pad_h = 0
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Letterbox a BGR frame into the buffer as RGB.
+
+        Args:
+            frame: BGR image (any layout cv2 accepts, e.g. a read-only ring view)
+
+        Returns:
+            The (size, size, 3) RGB buffer. It is overwritten by the next call;
+            pad_w / pad_h / size describe where the frame sits in it.
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._roi)
+        return self._buffer
+
+    def _allocate(self, shape: Tuple[int, ...]):
+        h, w = shape[:2]
+        self.size = max(h, w)
+        self.pad_h = (self.size - h) // 2
+        self.pad_w = (self.size - w) // 2
+        self._buffer = np.zeros((self.size, self.size, 3), dtype=np.uint8)
+        self._roi = self._buffer[self.pad_h:self.pad_h + h, self.pad_w:self.pad_w + w]
+        self._shape = shape
+
+    def to_frame_coordinates(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Map (..., 2) coordinates normalized to the square buffer back to
+        pixel coordinates of the original frame (in place).
+        """
+        xy *= self.size
+        xy[..., 0] -= self.pad_w
+        xy[..., 1] -= self.pad_h
+        return xy
+
+
+class ResizeBuffer:
+    """
+    Persistent cv2.resize destinations, one per output geometry.
+
+    The governor's input scale and the ROI crop move between a few coarse
+    sizes, so each size keeps its own buffer (the oldest is dropped beyond
+    max_sizes). Not thread-safe: use one instance per inference worker.
+    """
+
+    def __init__(self, max_sizes: int = 8):
+        self.max_sizes = max(1, max_sizes)
+        self._buffers: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+    def resize(self, frame: np.ndarray, width: int, height: int, interpolation: int = cv2.INTER_AREA) -> np.ndarray:
+        """Resized frame, written into the buffer for this size (valid until the next call for it)."""
+        shape = (height, width) + frame.shape[2:]
+        key = shape + (frame.dtype.str,)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            if len(self._buffers) >= self.max_sizes:
+                del self._buffers[next(iter(self._buffers))]
+            buffer = self._buffers[key] = np.empty(shape, dtype=frame.dtype)
+        cv2.resize(frame, (width, height), dst=buffer, interpolation=interpolation)
+        return buffer
@@ -0,0 +1,171 @@
+"""
+Zero-copy frame hand-off between the capture thread and its consumers.
+A small ring of preallocated frame slots with sequence numbers: the capture
+thread reads straight into a free slot, consumers get read-only views.
+"""
+import threading
+from typing import Optional, Tuple, List
+
+import numpy as np
+
+
+class FrameLease:
+    """
+    A pinned ring slot. The slot is not reused by the writer until the
+    lease is released, so the view stays valid for as long as it is held.
+    """
+
+    def __init__(self, ring: "FrameRing", slot: int, frame_id: int, frame: np.ndarray, capture_ts_ms: int):
+        self._ring = ring
+        self._slot = slot
+        self.frame_id = frame_id
+        self.frame = frame  # Read-only view
+        self.capture_ts_ms = capture_ts_ms
+        self._released = False
+
+    def release(self):
+        """Unpin the slot (idempotent)."""
+        if not self._released:
+            self._released = True
+            self._ring._unpin(self._slot)
+
+    def __enter__(self) -> "FrameLease":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class FrameRing:
+    """
+    Ring of preallocated frame buffers.
+
+    Writers reserve a free slot, fill it (ideally in place, e.g. cap.read(buf))
+    and commit it. Readers get the latest frame as a read-only view plus its
+    frame id; writes by a consumer must go to a copy (e.g. draw_pose).
+    """
+
+    def __init__(self, num_slots: int = 4):
+        """
+        Initialize the ring.
+
+        Args:
+            num_slots: Number of frame slots (>= 2). Views returned by latest()
+                stay valid until the writer wraps around the ring.
+        """
+        self.num_slots = max(2, num_slots)
+        self._lock = threading.Lock()
+        self._buffers: List[Optional[np.ndarray]] = [None] * self.num_slots
+        self._views: List[Optional[np.ndarray]] = [None] * self.num_slots
+        self._pins = [0] * self.num_slots
+        self._writing = [False] * self.num_slots
+        self._frame_ids = [-1] * self.num_slots
+        self._timestamps = [0] * self.num_slots
+        self._next_slot = 0
+        self._latest_slot = -1
+        self._frame_id = 0
+        self.dropped_frames = 0  # Writes skipped because every slot was pinned
+
+    @property
+    def latest_id(self) -> int:
+        """Frame id of the latest committed frame (-1 if none)."""
+        with self._lock:
+            if self._latest_slot < 0:
+                return -1
+            return self._frame_ids[self._latest_slot]
+
+    def reset(self):
+        """Forget the latest frame (e.g. when the camera restarts). Buffers are kept."""
+        with self._lock:
+            self._latest_slot = -1
+
+    def reserve(self) -> Tuple[Optional[int], Optional[np.ndarray]]:
+        """
+        Reserve a free slot for writing.
+
+        Returns:
+            Tuple of (slot, buffer). buffer is None when the slot has not been
+            allocated yet; slot is None when every slot is pinned.
+        """
+        with self._lock:
+            for _ in range(self.num_slots):
+                slot = self._next_slot
+                self._next_slot = (self._next_slot + 1) % self.num_slots
+                if slot == self._latest_slot or self._pins[slot] or self._writing[slot]:
+                    continue
+                self._writing[slot] = True
+                return slot, self._buffers[slot]
+            self.dropped_frames += 1
+            return None, None
+
+    def commit(self, slot: int, frame: np.ndarray, capture_ts_ms: int = 0) -> int:
+        """
+        Publish a reserved slot as the latest frame.
+
+        Args:
+            slot: Slot returned by reserve()
+            frame: The filled frame. If it is not the slot buffer (e.g. the
+                capture backend allocated a new array), it is copied in.
+            capture_ts_ms: Monotonic capture timestamp
+
+        Returns:
+            The new frame id
+        """
+        buf = self._buffers[slot]
+        if frame is not buf:
+            if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+                buf = np.empty_like(frame)
+                view = buf.view()
+                view.flags.writeable = False
+                self._buffers[slot] = buf
+                self._views[slot] = view
+            np.copyto(buf, frame)
+
+        with self._lock:
+            self._writing[slot] = False
+            self._frame_id += 1
+            self._frame_ids[slot] = self._frame_id
+            self._timestamps[slot] = capture_ts_ms
+            self._latest_slot = slot
+            return self._frame_id
+
+    def abort(self, slot: int):
+        """Release a reserved slot without publishing it."""
+        with self._lock:
+            self._writing[slot] = False
+
+    def write(self, frame: np.ndarray, capture_ts_ms: int = 0) -> Optional[int]:
+        """Copy a frame into the ring. Returns the frame id, or None if it was dropped."""
+        slot, _ = self.reserve()
+        if slot is None:
+            return None
+        return self.commit(slot, frame, capture_ts_ms)
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Get the latest frame without copying or pinning it.
+
+        The view is overwritten once the writer wraps around the ring: use
+        lease() for anything that outlives the call (encoding, awaits).
+
+        Returns:
+            Tuple of (frame_id, read-only view). (-1, None) if no frame yet.
+        """
+        with self._lock:
+            slot = self._latest_slot
+            if slot < 0:
+                return -1, None
+            return self._frame_ids[slot], self._views[slot]
+
+    def lease(self) -> Optional[FrameLease]:
+        """Pin the latest frame so it is not overwritten until released."""
+        with self._lock:
+            slot = self._latest_slot
+            if slot < 0:
+                return None
+            self._pins[slot] += 1
+            return FrameLease(self, slot, self._frame_ids[slot], self._views[slot], self._timestamps[slot])
+
+    def _unpin(self, slot: int):
+        with self._lock:
+            self._pins[slot] = max(0, self._pins[slot] - 1)
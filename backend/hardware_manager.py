@@ -4,13 +4,17 @@ and a simulator based on availability and platform.
 """
 import platform
 import os
+import threading
 import time
 from typing import Any, Dict, Optional
 
 # Import controllers
-from hardware_sim import get_hardware_simulator, HardwareSimulator
+from hardware_sim import get_hardware_simulator, HardwareSimulator, WorkoutCounters
 from hardware_pi import get_pi_controller, PiHardwareController
 
+# Shared sensors advance at most this often, however many sessions poll them
+SENSOR_TICK_SECONDS = 0.1
+
 class HardwareManager:
     """
     Unified manager for hardware interactions.
@@ -34,6 +38,12 @@ class HardwareManager:
         
         # Use Pi if available, otherwise simulation
         self.use_real_hw = self.is_pi and self.pi.enabled
+
+        # Per-session sensor ticks (tick())
+        self._tick_lock = threading.Lock()
+        self._last_tick = 0.0
+        self._last_status: Optional[Dict[str, Any]] = None
+        self._session_intensities: Dict["HardwareSession", float] = {}
         
         if self.use_real_hw:
             print("[HW-MGR] Using REAL hardware (Raspberry Pi)")
@@ -43,17 +53,27 @@ class HardwareManager:
     def start_session(self):
         """Start a workout session."""
         self.sim.start_session()
-        if self.use_real_hw:
-            self.pi.set_led("green", "blink")
-            self.pi.play_buzzer("success")
+        self._signal_session_start()
 
     def stop_session(self):
         """Stop the workout session."""
         self.sim.stop_session()
+        self._signal_session_stop()
+
+    def _signal_session_start(self):
+        if self.use_real_hw:
+            self.pi.set_led("green", "blink")
+            self.pi.play_buzzer("success")
+
+    def _signal_session_stop(self):
         if self.use_real_hw:
             self.pi.set_led("off")
             self.pi.play_buzzer("long")
 
+    def create_session(self) -> "HardwareSession":
+        """Per-connection view with its own workout counters."""
+        return HardwareSession(self)
+
     def set_exercise_intensity(self, intensity: float):
         """Set exercise intensity for simulation/sensors."""
         self.sim.set_exercise_intensity(intensity)
@@ -64,6 +84,29 @@ class HardwareManager:
         # For now, we use the simulator values but controlled by the manager
         return self.sim.update()
 
+    def tick(self) -> Dict[str, Any]:
+        """
+        Shared sensor values for the per-session views: the sensors advance
+        at most once per SENSOR_TICK_SECONDS, driven by the highest intensity
+        among the exercising sessions; other calls return the last values.
+        """
+        with self._tick_lock:
+            now = time.monotonic()
+            if self._last_status is None or now - self._last_tick >= SENSOR_TICK_SECONDS:
+                if self._session_intensities:
+                    self.sim.set_exercise_intensity(max(self._session_intensities.values()))
+                self._last_status = self.sim.update()
+                self._last_tick = now
+            return self._last_status
+
+    def _set_session_intensity(self, session: "HardwareSession", intensity: Optional[float]):
+        """Intensity of an exercising session (None: it stopped)."""
+        with self._tick_lock:
+            if intensity is None:
+                self._session_intensities.pop(session, None)
+            else:
+                self._session_intensities[session] = intensity
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status."""
         status = self.sim.get_status()
@@ -74,6 +117,10 @@ class HardwareManager:
         """Safety checks."""
         return self.sim.should_pause_exercise()
 
+    def get_eco_recommendations(self) -> Dict[str, Any]:
+        """Eco mode recommendations (fps target, feedback mode...)."""
+        return self.sim.get_eco_recommendations()
+
     def set_led(self, color: str, action: str = "on"):
         """Control LED."""
         if self.use_real_hw:
@@ -102,6 +149,57 @@ class HardwareManager:
             self._last_sim_pan_log = time.time()
             print(f"[HW-MGR] SIM CAMERA PAN: {angle:.1f}°")
 
+
+class HardwareSession:
+    """
+    One trainee's view of the hardware (same interface as HardwareManager's
+    session methods). Calories, duration and intensity are per session;
+    sensors and actuators are the shared ones, advanced by the manager's
+    tick() rather than once per session frame.
+    """
+
+    def __init__(self, manager: HardwareManager):
+        self.manager = manager
+        self.counters = WorkoutCounters()
+        self._intensity = 0.5
+
+    def start_session(self):
+        """Start (or restart) this session's workout."""
+        if not self.counters.is_exercising:
+            self.manager.sim.attach_session()
+        self.manager._set_session_intensity(self, self._intensity)
+        self.counters.start()
+        self.manager._signal_session_start()
+
+    def stop_session(self):
+        """Stop this session's workout (idempotent)."""
+        if not self.counters.is_exercising:
+            return
+        self.counters.stop()
+        self.manager.sim.detach_session()
+        self.manager._set_session_intensity(self, None)
+        self.manager._signal_session_stop()
+        print(f"[HW-MGR] Session stopped. Calories: {self.counters.calories_burned:.1f}")
+
+    def set_exercise_intensity(self, intensity: float):
+        """This session's intensity (calories; the shared sensors follow the highest one)."""
+        self._intensity = max(0.0, min(1.0, intensity))
+        if self.counters.is_exercising:
+            self.manager._set_session_intensity(self, self._intensity)
+
+    def update(self) -> Dict[str, Any]:
+        """Read the shared sensors (ticked by the manager), then update this session's counters."""
+        status = self.manager.tick()
+        self.counters.update(self._intensity, status["heart_rate"])
+        return {**status, **self.counters.get_status()}
+
+    def get_status(self) -> Dict[str, Any]:
+        return {**self.manager.get_status(), **self.counters.get_status()}
+
+    def should_pause_exercise(self) -> tuple[bool, Optional[str]]:
+        return self.manager.should_pause_exercise()
+
+
 # Global instance
 _manager: Optional[HardwareManager] = None
 
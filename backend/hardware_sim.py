@@ -27,18 +27,74 @@ class HardwareState:
     battery_drain_rate: float = 0.1  # % per minute during workout
     eco_mode: bool = False
     
-    # Calories & hydration
-    calories_burned: float = 0.0
-    water_glasses_equivalent: float = 0.0  # ~8 calories = 1 glass of water saved
-    
     # Actuators simulation
     camera_pan: float = 0.0  # -90 to 90 degrees
     
-    # Session timing
-    session_start: float = field(default_factory=time.time)
+    # Sensor timing
     last_update: float = field(default_factory=time.time)
 
 
+def calories_per_minute(intensity: float, heart_rate: int) -> float:
+    """Calorie burn rate from exercise intensity (0-1) and heart rate."""
+    # MET (Metabolic Equivalent of Task) estimation
+    # Resting: 1, Light: 3, Moderate: 5, Vigorous: 8
+    met = 1 + intensity * 7
+    
+    # Calories per minute (assuming 70kg person)
+    # Formula: Calories/min = MET × 3.5 × weight(kg) / 200
+    weight_kg = 70
+    calories = met * 3.5 * weight_kg / 200
+    
+    # Add HR-based adjustment
+    hr_factor = 1 + (heart_rate - 70) / 200
+    return calories * hr_factor
+
+
+class WorkoutCounters:
+    """
+    Calories and duration of one trainee's workout.
+    Kept apart from the (shared) sensors so concurrent sessions each count
+    their own calories instead of resetting each other's.
+    """
+    
+    def __init__(self):
+        self.session_start = time.time()
+        self.last_update = self.session_start
+        self.calories_burned = 0.0
+        self.water_glasses_equivalent = 0.0  # ~8 calories = 1 glass of water saved
+        self.is_exercising = False
+    
+    def start(self):
+        self.session_start = time.time()
+        self.last_update = self.session_start
+        self.calories_burned = 0.0
+        self.water_glasses_equivalent = 0.0
+        self.is_exercising = True
+    
+    def stop(self):
+        self.is_exercising = False
+    
+    def update(self, intensity: float, heart_rate: int):
+        """Add the calories burned since the last update."""
+        current_time = time.time()
+        dt = current_time - self.last_update
+        self.last_update = current_time
+        if not self.is_exercising:
+            return
+        self.calories_burned += calories_per_minute(intensity, heart_rate) * (dt / 60)
+        # Water glass equivalent (1 glass ≈ 8 oz of water, saves ~8 calories worth of sugary drink)
+        self.water_glasses_equivalent = self.calories_burned / 100  # Simplified
+    
+    def get_status(self) -> Dict[str, Any]:
+        session_duration = time.time() - self.session_start if self.is_exercising else 0
+        return {
+            "calories_burned": round(self.calories_burned, 1),
+            "water_glasses_saved": round(self.water_glasses_equivalent, 1),
+            "session_duration_seconds": int(session_duration),
+            "is_exercising": self.is_exercising,
+        }
+
+
 class HardwareSimulator:
     """
     Simulates hardware sensors for laptop testing.
@@ -48,22 +104,32 @@ class HardwareSimulator:
     def __init__(self):
         """Initialize the hardware simulator."""
         self.state = HardwareState()
+        self.counters = WorkoutCounters()  # Single-session API (start_session / get_status)
         self._exercise_intensity = 0.5  # 0.0 to 1.0
-        self._is_exercising = False
+        self._active_sessions = 0  # Per-connection sessions (HardwareSession) exercising
         print("[HW-SIM] Hardware simulator initialized")
     
+    @property
+    def _is_exercising(self) -> bool:
+        return self.counters.is_exercising or self._active_sessions > 0
+    
     def start_session(self):
         """Start a workout session."""
-        self.state.session_start = time.time()
         self.state.last_update = time.time()
-        self.state.calories_burned = 0.0
-        self._is_exercising = True
+        self.counters.start()
         print("[HW-SIM] Session started")
     
     def stop_session(self):
         """Stop the workout session."""
-        self._is_exercising = False
-        print(f"[HW-SIM] Session stopped. Calories: {self.state.calories_burned:.1f}")
+        self.counters.stop()
+        print(f"[HW-SIM] Session stopped. Calories: {self.counters.calories_burned:.1f}")
+    
+    def attach_session(self):
+        """A per-connection session started exercising (drives battery drain)."""
+        self._active_sessions += 1
+    
+    def detach_session(self):
+        self._active_sessions = max(0, self._active_sessions - 1)
     
     def set_exercise_intensity(self, intensity: float):
         """
@@ -96,8 +162,7 @@ class HardwareSimulator:
         self._update_battery(dt)
         
         # Update calories
-        if self._is_exercising:
-            self._update_calories(dt)
+        self.counters.update(self._exercise_intensity, self.state.heart_rate)
         
         return self.get_status()
     
@@ -187,32 +252,8 @@ class HardwareSimulator:
         if self.state.eco_mode and not old_eco:
             print(f"[HW-SIM] 🔋 ECO MODE ACTIVATED - Battery: {self.state.battery_level:.0f}%")
     
-    def _update_calories(self, dt: float):
-        """Calculate calories burned based on exercise intensity and duration."""
-        # MET (Metabolic Equivalent of Task) estimation
-        # Resting: 1, Light: 3, Moderate: 5, Vigorous: 8
-        met = 1 + self._exercise_intensity * 7
-        
-        # Calories per minute (assuming 70kg person)
-        # Formula: Calories/min = MET × 3.5 × weight(kg) / 200
-        weight_kg = 70
-        calories_per_min = met * 3.5 * weight_kg / 200
-        
-        # Add HR-based adjustment
-        hr_factor = 1 + (self.state.heart_rate - 70) / 200
-        calories_per_min *= hr_factor
-        
-        # Calculate for this time interval
-        calories_delta = calories_per_min * (dt / 60)
-        self.state.calories_burned += calories_delta
-        
-        # Water glass equivalent (1 glass ≈ 8 oz of water, saves ~8 calories worth of sugary drink)
-        self.state.water_glasses_equivalent = self.state.calories_burned / 100  # Simplified
-    
     def get_status(self) -> Dict[str, Any]:
         """Get current hardware status as dictionary."""
-        session_duration = time.time() - self.state.session_start if self._is_exercising else 0
-        
         return {
             "heart_rate": self.state.heart_rate,
             "heart_rate_warning": self.state.hr_warning,
@@ -220,10 +261,7 @@ class HardwareSimulator:
             "imu_tremor_intensity": round(self.state.tremor_intensity, 2),
             "battery_level": round(self.state.battery_level),
             "eco_mode": self.state.eco_mode,
-            "calories_burned": round(self.state.calories_burned, 1),
-            "water_glasses_saved": round(self.state.water_glasses_equivalent, 1),
-            "session_duration_seconds": int(session_duration),
-            "is_exercising": self._is_exercising,
+            **self.counters.get_status(),
             "camera_pan": round(self.state.camera_pan, 1)
         }
     
@@ -265,8 +303,8 @@ class HardwareSimulator:
     
     def get_calorie_message(self) -> str:
         """Generate motivational calorie message."""
-        calories = self.state.calories_burned
-        glasses = self.state.water_glasses_equivalent
+        calories = self.counters.calories_burned
+        glasses = self.counters.water_glasses_equivalent
         
         if calories < 50:
             return f"Tu as brûlé {calories:.0f} calories. Continue!"
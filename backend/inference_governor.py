@@ -0,0 +1,201 @@
+"""
+Adaptive inference-rate governor for the pose pipeline.
+Picks how often frames are sent to inference and at which input scale,
+from the measured inference latency, the CPU load and the eco-mode
+recommendations of the hardware manager.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # CPU load is then ignored
+    psutil = None
+
+
+# Input scales the governor moves between (coarse steps avoid buffer churn)
+SCALE_STEP = 0.125
+
+
+class InferenceGovernor:
+    """
+    Decides the target inference rate and input scale.
+
+    Every update_interval seconds the governor re-evaluates:
+      - capacity: workers / smoothed inference latency (what the pool can sustain)
+      - ceiling: max_fps, lowered to the eco-mode fps_target when eco mode is active
+      - CPU load: above cpu_high the rate steps down, below cpu_low it steps back up
+    The target rate stays within [min_fps, ceiling]. When even min_fps cannot
+    be sustained (or the CPU stays saturated at the floor) the input scale
+    steps down towards min_scale; it steps back up once there is headroom.
+    """
+
+    def __init__(
+        self,
+        min_fps: float = 5.0,
+        max_fps: float = 30.0,
+        min_scale: float = 0.5,
+        max_scale: float = 1.0,
+        cpu_high: float = 85.0,
+        cpu_low: float = 60.0,
+        latency_alpha: float = 0.2,
+        update_interval: float = 1.0,
+        eco_source: Optional[Callable[[], Dict[str, Any]]] = None,
+        workers: int = 1
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            min_fps: Floor of the target inference rate
+            max_fps: Ceiling of the target inference rate
+            min_scale: Smallest input scale (fraction of the camera resolution)
+            max_scale: Largest input scale
+            cpu_high: CPU percentage above which the rate is lowered
+            cpu_low: CPU percentage below which the rate may rise again
+            latency_alpha: Smoothing factor of the latency EWMA
+            update_interval: Seconds between decisions
+            eco_source: Returns eco recommendations ({"active", "fps_target"})
+            workers: Number of inference workers (parallel capacity)
+        """
+        self.min_fps = min_fps
+        self.max_fps = max(min_fps, max_fps)
+        self.min_scale = min_scale
+        self.max_scale = max(min_scale, max_scale)
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.latency_alpha = latency_alpha
+        self.update_interval = update_interval
+        self.eco_source = eco_source
+        self.workers = max(1, workers)
+
+        self._lock = threading.Lock()
+        self.target_fps = self.max_fps
+        self.scale = self.max_scale
+        self.latency_ms: Optional[float] = None
+        self.cpu_percent: Optional[float] = None
+        self.eco_active = False
+        self.reason = "startup"
+        self._last_update = 0.0
+        self._last_dispatch = 0.0
+
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # Prime the counter
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "InferenceGovernor":
+        """Build a governor with limits from POSE_MIN_FPS / POSE_MAX_FPS / POSE_MIN_SCALE / POSE_MAX_SCALE."""
+        return cls(
+            min_fps=float(os.getenv("POSE_MIN_FPS", "5")),
+            max_fps=float(os.getenv("POSE_MAX_FPS", "30")),
+            min_scale=float(os.getenv("POSE_MIN_SCALE", "0.5")),
+            max_scale=float(os.getenv("POSE_MAX_SCALE", "1.0")),
+            **kwargs
+        )
+
+    def record_latency(self, seconds: float):
+        """Feed the duration of one inference."""
+        ms = seconds * 1000.0
+        with self._lock:
+            if self.latency_ms is None:
+                self.latency_ms = ms
+            else:
+                self.latency_ms += self.latency_alpha * (ms - self.latency_ms)
+
+    def should_dispatch(self, now: Optional[float] = None) -> bool:
+        """
+        True if a frame may be sent to inference now (paces dispatch to target_fps).
+        Call mark_dispatched() when the frame was actually handed to a worker.
+        """
+        now = time.monotonic() if now is None else now
+        if now - self._last_update >= self.update_interval:
+            self.update(now)
+        return now - self._last_dispatch >= 1.0 / self.target_fps
+
+    def mark_dispatched(self, now: Optional[float] = None):
+        self._last_dispatch = time.monotonic() if now is None else now
+
+    def _read_eco(self) -> Optional[float]:
+        """Eco-mode fps target, or None when eco mode is off."""
+        if self.eco_source is None:
+            return None
+        try:
+            eco = self.eco_source()
+        except Exception as e:
+            print(f"[GOVERNOR] Eco recommendations unavailable: {e}")
+            return None
+        if not eco or not eco.get("active"):
+            return None
+        return float(eco.get("fps_target", self.max_fps))
+
+    def update(self, now: Optional[float] = None, cpu_percent: Optional[float] = None):
+        """
+        Re-evaluate target_fps and scale.
+
+        Args:
+            now: Monotonic time (defaults to now)
+            cpu_percent: CPU load override (defaults to psutil's system-wide load)
+        """
+        now = time.monotonic() if now is None else now
+        if cpu_percent is None and psutil is not None:
+            cpu_percent = psutil.cpu_percent(interval=None)
+        eco_fps = self._read_eco()
+
+        with self._lock:
+            self._last_update = now
+            self.cpu_percent = cpu_percent
+            self.eco_active = eco_fps is not None
+
+            ceiling = self.max_fps
+            reason = "ceiling"
+            if eco_fps is not None and eco_fps < ceiling:
+                ceiling = max(self.min_fps, eco_fps)
+                reason = "eco"
+
+            capacity = None
+            if self.latency_ms:
+                capacity = self.workers * 1000.0 / self.latency_ms
+                if capacity < ceiling:
+                    ceiling = max(self.min_fps, capacity)
+                    reason = "latency"
+
+            target = self.target_fps
+            if cpu_percent is not None and cpu_percent > self.cpu_high:
+                target *= 0.8
+                reason = "cpu"
+            elif cpu_percent is None or cpu_percent < self.cpu_low:
+                target *= 1.25
+            target = min(max(target, self.min_fps), ceiling)
+
+            # Resolution: drop when the floor rate is not sustainable, recover with headroom
+            saturated = (capacity is not None and capacity < self.min_fps) or \
+                (target <= self.min_fps and cpu_percent is not None and cpu_percent > self.cpu_high)
+            if saturated:
+                self.scale = max(self.min_scale, self.scale - SCALE_STEP)
+                reason = "scale_down"
+            elif self.scale < self.max_scale and (cpu_percent is None or cpu_percent < self.cpu_low) \
+                    and (capacity is None or capacity > 1.5 * target):
+                self.scale = min(self.max_scale, self.scale + SCALE_STEP)
+
+            self.target_fps = target
+            self.reason = reason
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current decisions and inputs (for /status)."""
+        with self._lock:
+            return {
+                "target_fps": round(self.target_fps, 1),
+                "scale": self.scale,
+                "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+                "cpu_percent": self.cpu_percent,
+                "eco_active": self.eco_active,
+                "reason": self.reason,
+                "limits": {
+                    "min_fps": self.min_fps,
+                    "max_fps": self.max_fps,
+                    "min_scale": self.min_scale,
+                    "max_scale": self.max_scale,
+                },
+            }
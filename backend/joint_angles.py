@@ -0,0 +1,180 @@
+"""
+Table-driven, vectorized joint-angle kernel shared by the pose detector
+and the exercise engine. One NumPy pass computes every angle of a pose
+(or of a batch of poses) from an (N, 3) index-triple table.
+"""
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from pose_frame import KEYPOINT_INDEX, NUM_KEYPOINTS
+
+
+def joint_angles(points: np.ndarray, triples: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    """
+    Angles at the middle point of each (a, b, c) index triple.
+
+    Args:
+        points: (..., K, D) keypoint coordinates, D = 2 (pixel space) or 3.
+            Leading axes are batch axes (frames, sessions).
+        triples: (N, 3) integer table of (first point, vertex, third point)
+        eps: Guard against zero-length vectors
+
+    Returns:
+        (..., N) angles in degrees
+    """
+    a = points[..., triples[:, 0], :]
+    b = points[..., triples[:, 1], :]
+    c = points[..., triples[:, 2], :]
+    ba = a - b
+    bc = c - b
+    cosine = np.einsum("...d,...d->...", ba, bc)
+    cosine /= np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1) + eps
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def point_distances(points: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distances between (a, b) index pairs.
+
+    Args:
+        points: (..., K, D) keypoint coordinates
+        pairs: (M, 2) integer table
+
+    Returns:
+        (..., M) distances
+    """
+    return np.linalg.norm(points[..., pairs[:, 0], :] - points[..., pairs[:, 1], :], axis=-1)
+
+
+def _triples(table: Sequence[Tuple[str, str, str]], index: Dict[str, int]) -> np.ndarray:
+    return np.array([[index[a], index[b], index[c]] for a, b, c in table], dtype=np.intp)
+
+
+# ==================== Detector angles (2D, pixel space) ====================
+
+DETECTOR_ANGLES = {
+    "left_elbow": ("left_shoulder", "left_elbow", "left_wrist"),         # shoulder-elbow-wrist
+    "right_elbow": ("right_shoulder", "right_elbow", "right_wrist"),
+    "left_knee": ("left_hip", "left_knee", "left_ankle"),                 # hip-knee-ankle
+    "right_knee": ("right_hip", "right_knee", "right_ankle"),
+    "left_hip": ("left_shoulder", "left_hip", "left_knee"),               # shoulder-hip-knee
+    "right_hip": ("right_shoulder", "right_hip", "right_knee"),
+    "left_shoulder": ("left_elbow", "left_shoulder", "left_hip"),         # elbow-shoulder-hip
+    "right_shoulder": ("right_elbow", "right_shoulder", "right_hip"),
+}
+DETECTOR_ANGLE_NAMES = tuple(DETECTOR_ANGLES) + ("torso_angle",)
+DETECTOR_TRIPLES = _triples(DETECTOR_ANGLES.values(), KEYPOINT_INDEX)
+
+_LS, _RS = KEYPOINT_INDEX["left_shoulder"], KEYPOINT_INDEX["right_shoulder"]
+_LH, _RH = KEYPOINT_INDEX["left_hip"], KEYPOINT_INDEX["right_hip"]
+
+
+def torso_angles(points: np.ndarray) -> np.ndarray:
+    """
+    Torso angle from vertical (shoulder midpoint vs hip midpoint), 2D.
+
+    Args:
+        points: (..., K, >=2) keypoints
+
+    Returns:
+        (...,) angles in degrees
+    """
+    d = (points[..., _LS, :2] + points[..., _RS, :2]) - (points[..., _LH, :2] + points[..., _RH, :2])
+    return np.degrees(np.arctan2(np.abs(d[..., 0]), np.abs(d[..., 1])))
+
+
+def detector_angles(points: np.ndarray) -> np.ndarray:
+    """
+    All detector angles in one pass (order: DETECTOR_ANGLE_NAMES).
+
+    Args:
+        points: (..., 17, >=2) keypoints; only x/y are used (pixel space)
+
+    Returns:
+        (..., 9) angles in degrees: 8 joint angles + torso angle
+    """
+    xy = points[..., :2]
+    return np.concatenate([joint_angles(xy, DETECTOR_TRIPLES), torso_angles(xy)[..., None]], axis=-1)
+
+
+# ==================== Engine features (3D) ====================
+
+# Virtual points appended after the 17 keypoints
+_MID_SHOULDER = NUM_KEYPOINTS
+_ABOVE_LEFT_HIP = NUM_KEYPOINTS + 1
+_INDEX_3D = dict(KEYPOINT_INDEX, mid_shoulder=_MID_SHOULDER, above_left_hip=_ABOVE_LEFT_HIP)
+
+FEATURE_ANGLES = {
+    "left_elbow": ("left_shoulder", "left_elbow", "left_wrist"),
+    "right_elbow": ("right_shoulder", "right_elbow", "right_wrist"),
+    "left_shoulder": ("left_elbow", "left_shoulder", "left_hip"),
+    "right_shoulder": ("right_elbow", "right_shoulder", "right_hip"),
+    "left_hip": ("left_shoulder", "left_hip", "left_knee"),
+    "right_hip": ("right_shoulder", "right_hip", "right_knee"),
+    "left_knee": ("left_hip", "left_knee", "left_ankle"),
+    "right_knee": ("right_hip", "right_knee", "right_ankle"),
+    "left_ankle": ("left_knee", "left_ankle", "left_foot_index"),
+    "right_ankle": ("right_knee", "right_ankle", "right_foot_index"),
+    "back": ("left_shoulder", "mid_shoulder", "left_hip"),
+    # Angle at the left hip between the shoulder midpoint and straight up (y - 1)
+    "torso_angle": ("mid_shoulder", "left_hip", "above_left_hip"),
+}
+FEATURE_TRIPLES = _triples(FEATURE_ANGLES.values(), _INDEX_3D)
+
+# LSTM feature vector layout (must match training)
+FEATURE_NAMES = (
+    "left_elbow", "right_elbow", "left_shoulder", "right_shoulder",
+    "left_hip", "right_hip", "left_knee", "right_knee",
+    "left_ankle", "right_ankle", "back", "knee_dist",
+    "left_heel", "right_heel", "asymmetry",
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+_NUM_FEATURE_ANGLES = 11  # FEATURE_ANGLES starts with the 11 angle features, in FEATURE_NAMES order
+_F = {name: i for i, name in enumerate(FEATURE_NAMES)}
+_KNEES = np.array([[KEYPOINT_INDEX["left_knee"], KEYPOINT_INDEX["right_knee"]]])
+_HEEL_PAIRS = np.array([
+    [KEYPOINT_INDEX["left_ankle"], KEYPOINT_INDEX["left_foot_index"]],
+    [KEYPOINT_INDEX["right_ankle"], KEYPOINT_INDEX["right_foot_index"]],
+])
+
+
+def _with_virtual_points(points: np.ndarray) -> np.ndarray:
+    """Append the shoulder midpoint and a point one unit above the left hip."""
+    mid_shoulder = (points[..., _LS, :] + points[..., _RS, :]) / 2
+    above_left_hip = points[..., _LH, :].copy()
+    above_left_hip[..., 1] -= 1
+    return np.concatenate([points, mid_shoulder[..., None, :], above_left_hip[..., None, :]], axis=-2)
+
+
+def engine_angles(points: np.ndarray) -> np.ndarray:
+    """
+    3D joint angles used by the exercise engine (order: FEATURE_ANGLES).
+
+    Args:
+        points: (..., 17, 3) keypoints (x, y, z)
+
+    Returns:
+        (..., 12) angles in degrees
+    """
+    # No eps here: features must match the ones the LSTM was trained on
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return joint_angles(_with_virtual_points(points), FEATURE_TRIPLES, eps=0.0)
+
+
+def pose_features(points: np.ndarray) -> np.ndarray:
+    """
+    The 15 LSTM features in one pass (order: FEATURE_NAMES).
+
+    Args:
+        points: (..., 17, 3) keypoints (x, y, z)
+
+    Returns:
+        (..., 15) feature vectors
+    """
+    angles = engine_angles(points)[..., :_NUM_FEATURE_ANGLES]
+    knee_dist = point_distances(points, _KNEES)
+    heels = np.abs(points[..., _HEEL_PAIRS[:, 0], 2] - points[..., _HEEL_PAIRS[:, 1], 2])
+    asymmetry = (np.abs(angles[..., _F["left_knee"]] - angles[..., _F["right_knee"]]) +
+                 np.abs(angles[..., _F["left_hip"]] - angles[..., _F["right_hip"]]))
+    return np.concatenate([angles, knee_dist, heels, asymmetry[..., None]], axis=-1)
@@ -0,0 +1,131 @@
+"""
+Lazy loading of heavy components (TensorFlow, the LSTM, ONNX Runtime
+sessions, MediaPipe, the pose detector).
+Each component loads once, on first use or from a background warmup thread,
+so the server accepts requests before the models are in memory. Load times
+are recorded for /status and the cold-start benchmark.
+"""
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class LazyComponent:
+    """
+    A value built by loader() on first get(). Thread-safe: concurrent
+    callers wait for the single load. A failed load is remembered (get()
+    returns None) instead of being retried on every call.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._value: Any = None
+        self.loaded = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.loaded_by: Optional[str] = None  # Thread that paid for the load
+
+    def get(self) -> Any:
+        """The value, loading it in the calling thread if needed."""
+        if self._done.is_set():
+            return self._value
+        with self._lock:
+            if not self._done.is_set():
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                    self.loaded = True
+                except Exception as e:
+                    print(f"[LAZY] Failed to load {self.name}: {e}")
+                    self.error = str(e)
+                self.load_seconds = time.perf_counter() - start
+                self.loaded_by = threading.current_thread().name
+                self._done.set()
+                print(f"[LAZY] {self.name} ready in {self.load_seconds:.2f}s")
+        return self._value
+
+    async def get_async(self) -> Any:
+        """get() for coroutines: a pending load is waited for on a worker thread, not the event loop."""
+        if self._done.is_set():
+            return self._value
+        return await asyncio.to_thread(self.get)
+
+    def peek(self) -> Any:
+        """The value if already loaded, else None (never blocks or loads)."""
+        return self._value if self._done.is_set() else None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def load_in_background(self):
+        """Start loading in a daemon thread unless already loading or loaded."""
+        if not self._done.is_set() and not self._lock.locked():
+            threading.Thread(target=self.get, daemon=True, name=f"load-{self.name}").start()
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Block until the value is ready (loaded elsewhere) or timeout."""
+        self._done.wait(timeout)
+        return self.peek()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "loaded": self.loaded,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "loaded_by": self.loaded_by,
+            "error": self.error,
+        }
+
+
+# Registry of named components (for warmup and reporting)
+_components: Dict[str, LazyComponent] = {}
+
+
+def register(name: str, loader: Callable[[], Any]) -> LazyComponent:
+    """Create (or return the existing) named lazy component."""
+    component = _components.get(name)
+    if component is None:
+        component = _components[name] = LazyComponent(name, loader)
+    return component
+
+
+def lazy_import(module_name: str) -> LazyComponent:
+    """Lazy component importing a module (e.g. "tensorflow")."""
+    return register(f"import:{module_name}", lambda: importlib.import_module(module_name))
+
+
+def get_component(name: str) -> Optional[LazyComponent]:
+    return _components.get(name)
+
+
+def start_warmup(names: Iterable[str], on_done: Optional[Callable[[], None]] = None) -> threading.Thread:
+    """
+    Load components one after the other in a background thread (in order,
+    so the first ones are ready soonest).
+    """
+    names: List[str] = list(names)
+
+    def run():
+        start = time.perf_counter()
+        for name in names:
+            component = _components.get(name)
+            if component is not None:
+                component.get()
+        print(f"[LAZY] Warmup finished in {time.perf_counter() - start:.2f}s")
+        if on_done is not None:
+            on_done()
+
+    thread = threading.Thread(target=run, daemon=True, name="warmup")
+    thread.start()
+    return thread
+
+
+def get_load_report() -> Dict[str, Any]:
+    """Load state of every registered component."""
+    return {name: component.get_stats() for name, component in _components.items()}
@@ -0,0 +1,159 @@
+"""
+Streaming (stateful) inference of the form-classification LSTM in NumPy.
+The windowed classifier re-runs both LSTM layers over all 20 frames for
+every new frame. Here hidden and cell states are carried per session and
+advanced one timestep per frame; the window is approximated by resetting
+the state every `window` frames. With `phases` staggered states there is
+always one with at least window / phases frames of history, at `phases`
+timesteps of compute per frame instead of `window`.
+
+Weights come from export_lstm_weights.py (Keras gate order i, f, c, o).
+"""
+from pathlib import Path
+from typing import Mapping, Optional
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).parent / "models"
+WEIGHTS_PATH = MODELS_DIR / "model_lstm_tache2_weights.npz"
+
+# npz keys written by export_lstm_weights.py
+LSTM_LAYERS = ("lstm1", "lstm2")
+DENSE_LAYERS = ("dense1", "dense2")
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)  # Overflow-free logistic
+
+
+def lstm_step(x_proj: np.ndarray, h: np.ndarray, c: np.ndarray, recurrent: np.ndarray):
+    """
+    One LSTM timestep (Keras defaults: sigmoid gates, tanh cell).
+
+    Args:
+        x_proj: Input projection x @ kernel + bias, (..., 4 * units)
+        h, c: Hidden and cell state, (..., units)
+        recurrent: Recurrent kernel (units, 4 * units)
+
+    Returns:
+        New (h, c)
+    """
+    z = x_proj + h @ recurrent
+    units = h.shape[-1]
+    i = _sigmoid(z[..., :units])
+    f = _sigmoid(z[..., units:2 * units])
+    g = np.tanh(z[..., 2 * units:3 * units])
+    o = _sigmoid(z[..., 3 * units:])
+    c = f * c + i * g
+    return o * np.tanh(c), c
+
+
+class StreamState:
+    """Per-session recurrent state: `phases` staggered copies of both layers."""
+
+    __slots__ = ("h1", "c1", "h2", "c2", "steps")
+
+    def __init__(self, phases: int, units1: int, units2: int):
+        self.h1 = np.zeros((phases, units1), dtype=np.float32)
+        self.c1 = np.zeros_like(self.h1)
+        self.h2 = np.zeros((phases, units2), dtype=np.float32)
+        self.c2 = np.zeros_like(self.h2)
+        self.steps = np.zeros(phases, dtype=np.int64)  # Frames since each phase's reset
+
+
+class StreamingLSTMClassifier:
+    """
+    Two LSTM layers + dense head of the form classifier, step by step.
+    Stateless itself: callers own one StreamState per session.
+    """
+
+    runtime = "numpy-streaming"
+
+    def __init__(self, weights: Mapping[str, np.ndarray], window: int = 20, phases: int = 2,
+                 min_history: Optional[int] = None):
+        """
+        Args:
+            weights: Arrays keyed "<layer>_kernel", "<layer>_recurrent" (LSTMs), "<layer>_bias"
+            window: Frames per classification window (state reset period)
+            phases: Staggered states (1 = lowest compute, no output right after a reset)
+            min_history: Frames of history needed before an output (default window // phases)
+        """
+        f32 = lambda key: np.asarray(weights[key], dtype=np.float32)
+        self.kernels = [f32(f"{name}_kernel") for name in LSTM_LAYERS]
+        self.recurrents = [f32(f"{name}_recurrent") for name in LSTM_LAYERS]
+        self.lstm_biases = [f32(f"{name}_bias") for name in LSTM_LAYERS]
+        self.dense = [(f32(f"{name}_kernel"), f32(f"{name}_bias")) for name in DENSE_LAYERS]
+        self.units = [r.shape[0] for r in self.recurrents]
+        self.window = window
+        self.phases = max(1, min(phases, window))
+        self.min_history = min_history if min_history is not None else max(1, window // self.phases)
+        # Reset offsets: phase p restarts every `window` frames, shifted by p * window / phases
+        self._offsets = np.array([p * window // self.phases for p in range(self.phases)])
+        self.input_shape = (1, window, self.kernels[0].shape[0])
+
+    @classmethod
+    def from_npz(cls, path: Path = WEIGHTS_PATH, **kwargs) -> "StreamingLSTMClassifier":
+        with np.load(path) as weights:
+            return cls(dict(weights), **kwargs)
+
+    def new_state(self) -> StreamState:
+        """Fresh session state; phase p starts after its offset (negative steps)."""
+        state = StreamState(self.phases, self.units[0], self.units[1])
+        state.steps[:] = -self._offsets
+        return state
+
+    def _head(self, h: np.ndarray) -> np.ndarray:
+        (k1, b1), (k2, b2) = self.dense
+        hidden = np.maximum(h @ k1 + b1, 0.0)
+        logits = hidden @ k2 + b2
+        e = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return e / e.sum(axis=-1, keepdims=True)
+
+    def step(self, state: StreamState, features: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Advance one frame.
+
+        Args:
+            state: The session's StreamState (updated in place)
+            features: (features,) scaled features of the new frame
+
+        Returns:
+            Class probabilities from the phase with the longest history, or
+            None while no phase has min_history frames
+        """
+        # Phases due for a reset start from zero state (window boundary)
+        due = (state.steps > 0) & (state.steps % self.window == 0)
+        if due.any():
+            state.h1[due] = state.c1[due] = state.h2[due] = state.c2[due] = 0.0
+            state.steps[due] = 0
+
+        # Phases still waiting for their staggered start keep zero state
+        active = state.steps >= 0
+        x = np.asarray(features, dtype=np.float32)
+        x1 = x @ self.kernels[0] + self.lstm_biases[0]  # Shared by all phases
+        h1, c1 = lstm_step(x1, state.h1, state.c1, self.recurrents[0])
+        x2 = h1 @ self.kernels[1] + self.lstm_biases[1]
+        h2, c2 = lstm_step(x2, state.h2, state.c2, self.recurrents[1])
+        state.h1[active], state.c1[active] = h1[active], c1[active]
+        state.h2[active], state.c2[active] = h2[active], c2[active]
+        state.steps += 1
+
+        best = int(np.argmax(state.steps))
+        if state.steps[best] < self.min_history:
+            return None
+        return self._head(state.h2[best])
+
+    def predict(self, window: np.ndarray) -> np.ndarray:
+        """
+        Full-window classification (same semantics as the batch model).
+        A leading batch axis, (n, window, features), gives (n, classes).
+        """
+        h1 = c1 = np.zeros(self.units[0], dtype=np.float32)
+        h2 = c2 = np.zeros(self.units[1], dtype=np.float32)
+        x1 = np.asarray(window, dtype=np.float32) @ self.kernels[0] + self.lstm_biases[0]  # All timesteps at once
+        for t in range(x1.shape[-2]):
+            h1, c1 = lstm_step(x1[..., t, :], h1, c1, self.recurrents[0])
+            h2, c2 = lstm_step(h1 @ self.kernels[1] + self.lstm_biases[1], h2, c2, self.recurrents[1])
+        return self._head(h2)
+
+    predict_batch = predict
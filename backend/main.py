@@ -11,7 +11,6 @@ import io   # Added for BytesIO
 from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, List
 import numpy as np
-from functools import lru_cache
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -28,17 +27,30 @@ from models import (
 )
 # from pose_detector import get_pose_detector, PoseDetector, POSE_LANDMARKS # Original import
 from pose_detector import PoseDetector, POSE_LANDMARKS # Import PoseDetector and POSE_LANDMARKS directly
-from exercise_engine import get_exercise_engine, ExerciseType, map_exercise_name, lstm_model
+from exercise_engine import ExerciseType, map_exercise_name, lstm_available, batch_service_component
 from calibration import Calibrator, CalibrationConfig, run_calibration_async, get_calibrator
 from feedback import get_feedback_engine, POSTURE_MESSAGES
 from hardware_manager import get_hardware_manager
+from lazy_loader import register, start_warmup, get_component, get_load_report
+from session_context import SessionContext, get_session_stats
+
+# Heavy components, in warmup order: the pose detector first (time to first
+# keypoint), then the models only needed once an exercise starts.
+WARMUP_ORDER = ["pose_detector", "exercise_engine", "calibrator", "scaler", "form_classifier", "body_type_model"]
+
+# Built on first use or by the startup warmup (thread-safe, built once)
+pose_detector_component = register("pose_detector", PoseDetector)
 
 
-@lru_cache()
 def get_pose_detector() -> PoseDetector:
-    """Cached function to get the pose detector instance."""
+    """Get the pose detector instance (waits for it if it is still loading)."""
     # This function is now defined locally to allow modification of its parameters
-    return PoseDetector() 
+    return pose_detector_component.get()
+
+
+async def get_pose_detector_async() -> PoseDetector:
+    """get_pose_detector() for async handlers: never blocks the event loop while warming up."""
+    return await pose_detector_component.get_async()
 
 
 # ==================== App Lifecycle ====================
@@ -50,13 +62,12 @@ async def lifespan(app: FastAPI):
     print("[STARTUP] Initializing systems...")
     # Initialize database first
     await db.init_db()
-    # Preload singletons
-    get_pose_detector()
-    get_exercise_engine()
-    get_calibrator()
+    # Light singletons now; models load in the background so requests are
+    # served right away (endpoints needing a model wait for it on first use)
     get_feedback_engine()
     get_hardware_manager()
-    print("[STARTUP] Systems ready")
+    start_warmup(WARMUP_ORDER)
+    print("[STARTUP] Systems ready (models warming up in background)")
     
     print("[APP] Backend ready!")
     
@@ -75,7 +86,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("[APP] Shutting down...")
-    get_pose_detector().cleanup()
+    pose_detector = pose_detector_component.peek()
+    if pose_detector is not None:
+        pose_detector.cleanup()
+    batch_service = batch_service_component.peek()
+    if batch_service is not None:
+        batch_service.close()
     feedback_engine.shutdown()
 
 
@@ -140,41 +156,46 @@ async def cors_options():
 
 @app.get("/", response_model=HealthCheck)
 async def health_check():
-    """Health check endpoint."""
-    pose_detector = get_pose_detector()
-    exercise_engine = get_exercise_engine()
+    """Health check endpoint (never waits for models still warming up)."""
+    pose_detector = pose_detector_component.peek()
+    exercise_engine = get_component("exercise_engine").peek()
     
     return HealthCheck(
         status="ok",
         version="1.0.0",
-        camera_available=pose_detector.is_camera_available(),
+        camera_available=pose_detector is not None and pose_detector.is_camera_available(),
         models_loaded={
-            "pose_detector": True,
-            "lstm_model": lstm_model is not None,
-            "correction_model": exercise_engine.correction_model is not None,
-            "fitness_model": exercise_engine.fitness_model is not None,
+            "pose_detector": pose_detector is not None,
+            "lstm_model": lstm_available(),
+            "correction_model": exercise_engine is not None and exercise_engine.correction_model is not None,
+            "fitness_model": exercise_engine is not None and exercise_engine.fitness_model is not None,
         }
     )
 
 
 @app.get("/status")
 async def get_status():
-    """Get system status."""
-    pose = get_pose_detector()
+    """Get system status (components still warming up are reported as such, not loaded)."""
+    pose = pose_detector_component.peek()
     hw = get_hardware_manager()
-    ex = get_exercise_engine()
+    ex = get_component("exercise_engine").peek()
+    batch_service = batch_service_component.peek()
     
     return {
         "camera": {
-            "connected": pose.is_running,
-            "fps": pose.fps
+            "connected": pose is not None and pose.is_running,
+            "fps": pose.fps if pose is not None else 0.0
         },
+        "inference": pose.get_inference_stats() if pose is not None else "warming_up",
         "hardware": hw.get_status(),
+        "sessions": get_session_stats(),
+        "form_classifier_batching": batch_service.get_stats() if batch_service else None,
         "models": {
-            "lstm": lstm_model is not None,
-            "correction": ex.correction_model is not None,
-            "fitness": ex.fitness_model is not None
-        }
+            "lstm": lstm_available(),
+            "correction": ex.correction_model is not None if ex is not None else "warming_up",
+            "fitness": ex.fitness_model is not None if ex is not None else "warming_up"
+        },
+        "startup": get_load_report()
     }
 
 
@@ -269,7 +290,7 @@ async def debug_camera_indices():
             
     return {
         "available_cameras": available_cameras,
-        "current_camera_status": get_pose_detector().is_running,
+        "current_camera_status": (await get_pose_detector_async()).is_running,
         "info": "Tested first 5 indices with DSHOW and Default backends."
     }
 
@@ -278,7 +299,7 @@ async def debug_camera_indices():
 
 async def generate_frames(cam_id: int = 0):
     """Generate MJPEG frames from pose detector."""
-    pose_detector = get_pose_detector()
+    pose_detector = await get_pose_detector_async()
     
     print(f"[FEED] Starting MJPEG stream loop for camera {cam_id}")
     
@@ -287,10 +308,12 @@ async def generate_frames(cam_id: int = 0):
         pose_detector.start_camera(camera_id=cam_id)
         
     retry_count = 0
+    last_frame_id = -1
+    last_result_id = -1
     while True:
-        success, frame = pose_detector.get_frame()
+        frame_id = pose_detector.latest_frame_id
         
-        if not success or frame is None:
+        if frame_id < 0:
             # yield a "Loading" frame if we've been waiting too long
             retry_count += 1
             if retry_count > 5:
@@ -311,6 +334,29 @@ async def generate_frames(cam_id: int = 0):
             
         retry_count = 0 # Reset
         
+        # Skip re-encoding when neither the frame nor the pose changed
+        result_id = (pose_detector.latest_result or {}).get("result_id", -1)
+        if frame_id == last_frame_id and result_id == last_result_id:
+            await asyncio.sleep(0.01)
+            continue
+        last_frame_id = frame_id
+        last_result_id = result_id
+        
+        # Pin the ring slot while taking our single copy (draw_pose returns an
+        # annotated copy), so the capture thread cannot overwrite it mid-copy.
+        # The overlay follows the motion model between inference results.
+        lease = pose_detector.get_frame_lease()
+        if lease is None:
+            await asyncio.sleep(0.01)
+            continue
+        with lease:
+            last_frame_id = lease.frame_id
+            display_pose, _ = pose_detector.get_display_pose()
+            if display_pose is not None:
+                frame = pose_detector.draw_pose(lease.frame, display_pose)
+            else:
+                frame = lease.frame.copy()
+        
         # Diagnostic: Check brightness
         mean_brightness = np.mean(frame)
         if mean_brightness < 5:
@@ -321,10 +367,6 @@ async def generate_frames(cam_id: int = 0):
         cv2.putText(frame, time.strftime("%H:%M:%S"), (50, 450), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
             
-        # Draw skeleton if pose available
-        if pose_detector.latest_result:
-            frame = pose_detector.draw_pose(frame)
-            
         # Optimize size
         frame = cv2.resize(frame, (640, 480))
             
@@ -343,7 +385,7 @@ async def generate_frames(cam_id: int = 0):
 @app.get("/video_feed")
 async def video_feed(cam_id: int = 0):
     """Stream video with pose overlay. Follows auto-detection if it happens."""
-    pose_detector = get_pose_detector()
+    pose_detector = await get_pose_detector_async()
     
     # Check if we should manually switch or if auto-detection already switched it
     current_active_id = getattr(pose_detector, 'camera_id', 0)
@@ -368,15 +410,15 @@ async def get_video_frame(cam_id: int = 0):
     """
     Get a single frame for manual fetching (fixes ngrok issues).
     """
-    pose_detector = get_pose_detector()
+    pose_detector = await get_pose_detector_async()
     
     # Ensure camera is running
     if not pose_detector.is_running:
          pose_detector.start_camera(camera_id=cam_id)
          
-    success, frame = pose_detector.get_frame()
+    lease = pose_detector.get_frame_lease()
     
-    if not success or frame is None:
+    if lease is None:
         # Create a black frame with "Loading..." text
         loading_frame = np.zeros((480, 640, 3), dtype=np.uint8)
         cv2.putText(loading_frame, "Initialisation...", (150, 240), 
@@ -384,11 +426,11 @@ async def get_video_frame(cam_id: int = 0):
         loading_frame = cv2.flip(loading_frame, 1)
         frame = loading_frame
     else:
-        # Draw skeleton if pose available
-        if pose_detector.latest_result:
-            frame = pose_detector.draw_pose(frame)
-        # Resize for performance
-        frame = cv2.resize(frame, (640, 480))
+        with lease:  # Slot pinned until the resized copy exists
+            # Draw skeleton if pose available (annotated copy)
+            frame = pose_detector.draw_pose(lease.frame) if pose_detector.latest_result else lease.frame
+            # Resize for performance
+            frame = cv2.resize(frame, (640, 480))
 
     # Encode to JPEG
     ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 60])
@@ -487,7 +529,7 @@ async def calibrate(request: CalibrationRequest):
         )
         
         # Estimate body type (use ONNX model result if available from calibration)
-        exercise_engine = get_exercise_engine()
+        exercise_engine = await get_component("exercise_engine").get_async()
         body_type = result.get("body_type") or exercise_engine.estimate_body_type(result["ratios"])
         if body_type:
             await db.update_user(request.user_id, body_type=body_type)
@@ -507,6 +549,26 @@ async def calibrate(request: CalibrationRequest):
     )
 
 
+# ==================== Recording Endpoints ====================
+
+@app.post("/recording/start")
+async def start_recording():
+    """Record the pose result stream to a session file (replayable without a camera)."""
+    pose_detector = await get_pose_detector_async()
+    recorder = await asyncio.to_thread(pose_detector.start_recording)
+    return recorder.get_stats()
+
+
+@app.post("/recording/stop")
+async def stop_recording():
+    """Stop recording; returns the file path and frame counts."""
+    pose_detector = await get_pose_detector_async()
+    stats = await asyncio.to_thread(pose_detector.stop_recording)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Not recording")
+    return stats
+
+
 # ==================== History Endpoints ====================
 
 @app.get("/history/{user_id}", response_model=SessionSummary)
@@ -586,6 +648,8 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time pose streaming.
     
     Client Messages:
+    - {"type": "start_camera", "data": {"camera_id": N}}  (-1: PC mode, frames pushed by the client)
+    - binary message: one JPEG-encoded camera frame (PC mode)
     - {"type": "start_session", "data": {"user_id": "...", "exercises": [...]}}
     - {"type": "stop_session"}
     - {"type": "start_calibration", "data": {"user_id": "...", "duration": 5}}
@@ -600,12 +664,16 @@ async def websocket_endpoint(websocket: WebSocket):
     - {"type": "hardware_status", "data": {...}}
     """
     await manager.connect(websocket)
+    client_key = id(websocket)  # Per-client ingest rate limiting (PC mode)
     
-    # Get components
-    pose_detector = get_pose_detector()
-    exercise_engine = get_exercise_engine()
+    # Shared components (waited for off the event loop while warming up)
+    pose_detector = await get_pose_detector_async()
     feedback_engine = get_feedback_engine()
-    hardware = get_hardware_manager()
+
+    # Per-connection state: exercise engine, feedback throttle, workout counters
+    session = await asyncio.to_thread(SessionContext, client_key)
+    exercise_engine = session.engine
+    hardware = session.hardware
     
     # Session state
     session_active = False
@@ -622,9 +690,9 @@ async def websocket_endpoint(websocket: WebSocket):
     calories_at_exercise_start = 0.0
     active_session_id = None # Tracks the current database record for the activity
     last_processed_id = -1
-    last_feedback_time = 0
-    last_feedback_msg = ""
     session_resting = False
+    last_keypoints_time = 0.0
+    display_interval = 1.0 / float(os.getenv("POSE_DISPLAY_FPS", "30"))  # Predicted keypoint stream rate
     
     async def save_session_data():
         nonlocal current_user_id, session_active, exercise_start_time, total_session_reps, calories_at_exercise_start, active_session_id
@@ -683,11 +751,18 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 # Check for incoming messages (non-blocking)
                 try:
-                    message_data = await asyncio.wait_for(
-                        websocket.receive_text(),
+                    received = await asyncio.wait_for(
+                        websocket.receive(),
                         timeout=0.01
                     )
-                    message = json.loads(message_data)
+                    if received["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(received.get("code", 1000))
+                    if received.get("bytes") is not None:
+                        # PC mode: JPEG frame from the browser camera (decoded off the event loop)
+                        await asyncio.to_thread(pose_detector.push_external_frame, received["bytes"], client_key)
+                        message = None
+                    else:
+                        message = json.loads(received["text"])
                 except asyncio.TimeoutError:
                     # No message, continue loop (to send frames if needed)
                     pass
@@ -699,6 +774,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     pass
                 else:
                     # Process message
+                    msg_type, msg_data = "", {}
                     if message and isinstance(message, dict):
                         msg_type = message.get("type", "")
                         msg_data = message.get("data", {})
@@ -756,8 +832,7 @@ async def websocket_endpoint(websocket: WebSocket):
                                 print(f"[WS] Loaded personalized thresholds for user {current_user_id}")
                         
                         # Reset feedback cache for a clean state
-                        last_feedback_msg = None
-                        last_feedback_time = 0
+                        session.feedback.reset()
                         
                         hardware.start_session()
                         
@@ -805,8 +880,7 @@ async def websocket_endpoint(websocket: WebSocket):
                             calories_at_exercise_start = hardware.get_status()["calories_burned"]
                             
                             # Reset feedback cache to allow immediate new messages
-                            last_feedback_msg = None
-                            last_feedback_time = 0
+                            session.feedback.reset()
                             
                             ex_name = current_exercises[idx]
                             feedback_engine.speak(f"Exercice suivant: {ex_name}")
@@ -902,9 +976,7 @@ async def websocket_endpoint(websocket: WebSocket):
             
                 # Process pose if session active and not paused
                 # Always capture frame and detect pose if camera is "running" (passive or active)
-                success, frame = pose_detector.get_frame()
-                
-                if success:
+                if pose_detector.has_frame():
                     # In PC mode (camera_id == -1), frames are pushed via push_external_frame.
                     # The dedicated worker thread in PoseDetector handles detection asynchronously.
                     # We strictly use the latest_result and only if it's FRESH.
@@ -913,9 +985,10 @@ async def websocket_endpoint(websocket: WebSocket):
                     if pose_data and pose_data.get("result_id", 0) > last_processed_id:
                         last_processed_id = pose_data["result_id"]
 
+                        pose = pose_data["pose"]
+                        
                         # Calculate average visibility
-                        vis_scores = [kpt.get("visibility", 0) for kpt in pose_data.get("keypoints", {}).values()]
-                        avg_visibility = sum(vis_scores) / len(vis_scores) if vis_scores else 0
+                        avg_visibility = pose.mean_visibility()
                         
                         # Forward any voice messages from the engine
                         voice_messages = feedback_engine.get_ws_messages()
@@ -923,24 +996,18 @@ async def websocket_endpoint(websocket: WebSocket):
                             await websocket.send_json({"type": "voice", "data": {"text": msg}})
 
                         # 1. Send keypoints to frontend (Only on fresh result)
-                        keypoints_to_send = {}
-                        for k, v in pose_data.get("keypoints", {}).items():
-                            name = (POSE_LANDMARKS.get(int(k)) if (isinstance(k, int) or (isinstance(k, str) and k.isdigit())) else k)
-                            if isinstance(v, dict) and "normalized" in v:
-                                keypoints_to_send[name] = {
-                                    "x": v["normalized"]["x"],
-                                    "y": v["normalized"]["y"],
-                                    "visibility": v.get("visibility", 1.0)
-                                }
+                        keypoints_to_send = pose.to_wire()
                         
                         await websocket.send_json({
                             "type": "keypoints",
                             "data": {
                                 "keypoints": keypoints_to_send,
                                 "angles": pose_data.get("angles", {}),
-                                "fps": round(pose_detector.fps, 1)
+                                "fps": round(pose_detector.fps, 1),
+                                "predicted": False
                             }
                         })
+                        last_keypoints_time = time.time()
 
                         # 2. Session Logic (Only if active and NOT in rest period)
                         if session_active and not session_paused and not session_resting:
@@ -953,7 +1020,10 @@ async def websocket_endpoint(websocket: WebSocket):
                             
                             angles = pose_data.get("angles", {})
                             try:
-                                exercise_result = exercise_engine.update(angles, pose_data.get("keypoints", {}), exercise_type, visibility=avg_visibility)
+                                # Off the event loop, on this session's ordered lane
+                                exercise_result = await session.run(
+                                    exercise_engine.update, angles, pose, exercise_type, visibility=avg_visibility
+                                )
                             except Exception as e:
                                 print(f"[EXERCISE-ERR] Update failed: {e}")
                                 # Provide a minimal safe result to avoid downstream errors
@@ -983,8 +1053,7 @@ async def websocket_endpoint(websocket: WebSocket):
                                     if count >= target_reps:
                                         session_resting = True
                                         # Reset feedback on transition to avoid stuck messages
-                                        last_feedback_msg = None
-                                        last_feedback_time = 0
+                                        session.feedback.reset()
                                         
                                         if current_set < target_sets:
                                             current_set += 1
@@ -1078,28 +1147,20 @@ async def websocket_endpoint(websocket: WebSocket):
                                 feedback_data = {"status": "warning", "message": message}
                             elif exercise_result.get("form_quality", 0) > 0.9:
                                 feedback_data = {"status": "perfect", "message": "Posture parfaite"}
-                            elif last_feedback_msg != "Posture OK":
+                            elif session.feedback.last_message != "Posture OK":
                                 feedback_data = {"status": "perfect", "message": "Posture OK"}
 
                             # --- Throttling Logic ---
                             if feedback_data:
                                 new_msg = feedback_data["message"]
-                                should_send = False
-                                
-                                # IMMEDIATE SEND if switching status or message (e.g. clearing a warning)
-                                if new_msg != last_feedback_msg:
-                                    should_send = True
-                                # THROTTLED SEND for repeated same message
-                                elif current_time - last_feedback_time > 3.0:
-                                    should_send = True
                                 
-                                if should_send:
-                                    if feedback_data["status"] == "warning" and new_msg != last_feedback_msg:
+                                # Immediate on a new message, throttled when repeated
+                                if session.feedback.should_send(new_msg, current_time):
+                                    if feedback_data["status"] == "warning" and new_msg != session.feedback.last_message:
                                         feedback_engine.speak(new_msg)
                                     
                                     await websocket.send_json({"type": "feedback", "data": feedback_data})
-                                    last_feedback_time = current_time
-                                    last_feedback_msg = new_msg
+                                    session.feedback.mark_sent(new_msg, current_time)
 
                             # Fatigue and Hardware
                             is_fatigued, slowdown = exercise_engine.detect_fatigue()
@@ -1118,6 +1179,21 @@ async def websocket_endpoint(websocket: WebSocket):
                                 await websocket.send_json({"type": "paused", "data": {"reason": reason}})
                     
                     # Ensure we indent correctly for the if pose_data block
+                    elif pose_detector.motion is not None and time.time() - last_keypoints_time >= display_interval:
+                        # Between inference results: extrapolated keypoints for the overlay only
+                        # (exercise logic above only ever sees measured poses)
+                        display_pose, predicted = pose_detector.get_display_pose()
+                        if display_pose is not None and predicted:
+                            await websocket.send_json({
+                                "type": "keypoints",
+                                "data": {
+                                    "keypoints": display_pose.to_wire(),
+                                    "angles": {},
+                                    "fps": round(pose_detector.fps, 1),
+                                    "predicted": True
+                                }
+                            })
+                            last_keypoints_time = time.time()
                 else:
                     # No pose detected - throttle this message to avoid saturating WebSocket
                     if pose_detector.frame_count % 30 == 0:
@@ -1150,6 +1226,10 @@ async def websocket_endpoint(websocket: WebSocket):
         if session_active:
             await save_session_data()
             hardware.stop_session()
+    
+    finally:
+        session.close()
+        pose_detector.release_external_client(client_key)
 
 
 # ==================== Run Server ====================
@@ -0,0 +1,202 @@
+"""
+Integrity manifest for the model artifacts in models/.
+Stores size, mtime and SHA-256 per file so startup only re-verifies an
+artifact (hash + format check, e.g. the .task zip CRC scan) when its size or
+mtime changed. A full re-verification runs on demand:
+
+    python model_manifest.py --verify
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+MODELS_DIR = Path(__file__).parent / "models"
+MANIFEST_NAME = "manifest.json"
+
+# Files tracked by verify_all()
+ARTIFACT_SUFFIXES = {".task", ".tflite", ".onnx", ".keras", ".h5", ".npz", ".pkl", ".pt"}
+
+Validator = Callable[[Path], bool]
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_valid_zip(path: Path) -> bool:
+    """Full CRC check of a zip archive (MediaPipe .task files are zips)."""
+    try:
+        with zipfile.ZipFile(path) as z:
+            return z.testzip() is None
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+# Format check per suffix (run on first sight and whenever the content changes)
+VALIDATORS: Dict[str, Validator] = {
+    ".task": is_valid_zip,
+    ".keras": is_valid_zip,
+    ".npz": is_valid_zip,
+}
+
+
+class ModelManifest:
+    """
+    Cached integrity state of model artifacts (models/manifest.json).
+    Thread-safe.
+    """
+
+    def __init__(self, model_dir: Path = MODELS_DIR, manifest_path: Optional[Path] = None):
+        self.model_dir = Path(model_dir)
+        self.path = Path(manifest_path) if manifest_path else self.model_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("artifacts", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "artifacts": self._entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _key(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return str(path.resolve().relative_to(self.model_dir.resolve()))
+        except ValueError:
+            return str(path.resolve())
+
+    def entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(self._key(path))
+            return dict(entry) if entry else None
+
+    def check(self, path: Path, validator: Optional[Validator] = None, force: bool = False) -> bool:
+        """
+        Is the artifact present and intact?
+
+        Trusts the manifest while size and mtime match the recorded ones.
+        Otherwise (or with force) hashes the file; the format validator only
+        runs when the hash differs from the last known-good one.
+
+        Args:
+            path: Artifact path
+            validator: Format check; defaults to VALIDATORS by suffix
+            force: Re-hash even if size and mtime are unchanged
+        """
+        path = Path(path)
+        if validator is None:
+            validator = VALIDATORS.get(path.suffix.lower())
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (not force and entry and entry.get("valid") and entry["size"] == stat.st_size
+                    and entry["mtime_ns"] == stat.st_mtime_ns):
+                return True
+
+            digest = sha256_file(path)
+            same_stat = entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+            if entry and entry.get("valid") and entry.get("sha256") == digest:
+                valid = True  # Touched but identical content
+            elif same_stat and entry.get("sha256") != digest:
+                # Different bytes behind the same size and mtime: storage corruption
+                print(f"[MODELS] {key}: content changed without size/mtime change (corruption?)")
+                valid = False
+            else:
+                valid = validator(path) if validator else True
+
+            self._entries[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+                "valid": valid,
+                "verified_at": time.time(),
+            }
+            try:
+                self._save()
+            except OSError as e:
+                print(f"[MODELS] Could not save manifest: {e}")
+            return valid
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._entries.items()}
+
+    def forget(self, path: Path):
+        """Drop an artifact (e.g. after deleting a corrupt file)."""
+        with self._lock:
+            if self._entries.pop(self._key(path), None) is not None:
+                try:
+                    self._save()
+                except OSError as e:
+                    print(f"[MODELS] Could not save manifest: {e}")
+
+    def verify_all(self) -> Dict[str, bool]:
+        """Re-hash and re-validate every artifact in the model dir (admin command)."""
+        results = {}
+        for path in sorted(self.model_dir.rglob("*")):
+            if path.is_file() and path.suffix.lower() in ARTIFACT_SUFFIXES:
+                results[self._key(path)] = self.check(path, force=True)
+        # Entries whose file disappeared
+        with self._lock:
+            for key in list(self._entries):
+                if key not in results and not (self.model_dir / key).exists():
+                    del self._entries[key]
+            self._save()
+        return results
+
+
+_manifest: Optional[ModelManifest] = None
+
+
+def get_model_manifest() -> ModelManifest:
+    """Get or create the manifest of the default model dir."""
+    global _manifest
+    if _manifest is None:
+        _manifest = ModelManifest()
+    return _manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model artifact integrity manifest")
+    parser.add_argument("--verify", action="store_true", help="Re-hash and re-validate every artifact")
+    parser.add_argument("--dir", type=Path, default=MODELS_DIR, help="Model directory")
+    args = parser.parse_args()
+
+    manifest = ModelManifest(args.dir)
+    if args.verify:
+        start = time.perf_counter()
+        results = manifest.verify_all()
+        for key, ok in results.items():
+            print(f"{'OK     ' if ok else 'CORRUPT'} {key}")
+        print(f"Verified {len(results)} artifact(s) in {time.perf_counter() - start:.2f}s")
+        raise SystemExit(0 if all(results.values()) else 1)
+
+    for key, entry in sorted(manifest.entries().items()):
+        print(f"{'OK     ' if entry.get('valid') else 'CORRUPT'} {key}  {entry['size']} B  {entry['sha256'][:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Shared ONNX Runtime session setup for the exercise models.
+Sessions get tuned SessionOptions (thread counts, full graph optimization)
+and the optimized graph is cached next to the models, so later startups
+load it without re-running the optimizer. ORT_ENABLE_ALL output is specific
+to the hardware it was built on, so the cache is keyed per host.
+"""
+import hashlib
+import os
+import platform
+from pathlib import Path
+from typing import Optional
+
+import onnxruntime as ort
+
+MODELS_DIR = Path(__file__).parent / "models"
+OPTIMIZED_CACHE_DIR = MODELS_DIR / ".ort_cache"
+PROVIDERS = ["CPUExecutionProvider"]
+
+
+def host_tag(providers=PROVIDERS) -> str:
+    """CPU arch plus a short hash of this host and the execution providers."""
+    # Same host identity as pose_backends.host_key (not imported: it pulls in the pose stack)
+    host = f"{platform.node()}|{platform.machine()}|{os.cpu_count()}|{','.join(providers)}"
+    return f"{platform.machine() or 'cpu'}-{hashlib.sha1(host.encode()).hexdigest()[:8]}"
+
+
+def optimized_cache_path(model_path: Path, cache_dir: Path = OPTIMIZED_CACHE_DIR) -> Path:
+    """
+    Cache file of a model's optimized graph, per ONNX Runtime version and host
+    (a models directory copied from another machine never reuses its graphs).
+    """
+    return cache_dir / f"{Path(model_path).stem}.ort-{ort.__version__}.{host_tag()}.opt.onnx"
+
+
+def create_session(
+    model_path: Path,
+    intra_op_threads: Optional[int] = None,
+    cache_dir: Optional[Path] = OPTIMIZED_CACHE_DIR
+) -> ort.InferenceSession:
+    """
+    CPU InferenceSession with tuned options.
+
+    Args:
+        model_path: .onnx model
+        intra_op_threads: Threads per operator; defaults to the ONNX_THREADS
+            env var (1: the exercise models are tiny and run next to pose inference)
+        cache_dir: Where optimized graphs are cached (None: no cache)
+    """
+    model_path = Path(model_path)
+    if intra_op_threads is None:
+        intra_op_threads = int(os.getenv("ONNX_THREADS", "1"))
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+    source = model_path
+    if cache_dir is not None:
+        cached = optimized_cache_path(model_path, cache_dir)
+        if cached.exists() and cached.stat().st_mtime >= model_path.stat().st_mtime:
+            # Already optimized for this runtime: skip the optimizer
+            source = cached
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.optimized_model_filepath = str(cached)
+    else:
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    return ort.InferenceSession(str(source), options, providers=PROVIDERS)
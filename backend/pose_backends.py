@@ -0,0 +1,494 @@
+"""
+Pluggable pose backends.
+A backend describes one pose model (MediaPipe lite/full/heavy, YOLO pose on
+ONNX Runtime, a TFLite single-pose model such as MoveNet) and builds
+inference workers for it. Every worker has the MediaPipeWorker interface:
+detect(frame, timestamp_ms) -> (17, 5) PoseFrame data or None, and close().
+
+At startup select_backend() benchmarks the available backends on synthetic
+frames and picks the fastest one that meets the accuracy tier; the choice is
+cached per host so later startups skip the benchmark.
+"""
+import importlib.util
+import json
+import os
+import platform
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from backend_health import FallbackController, ROLE_PRIMARY, ROLE_FALLBACK
+from frame_preprocess import LetterboxBuffer
+from pose_frame import COCO_INDICES, NUM_KEYPOINTS, NUM_COLUMNS
+from pose_workers import MediaPipeWorker, ProcessWorker, create_landmarker, RUNNING_MODE_IMAGE
+from tflite_loader import load_tflite_interpreter
+
+
+# Accuracy tiers, lowest first
+TIER_LITE = 0
+TIER_FULL = 1
+TIER_HEAVY = 2
+TIER_NAMES = {"lite": TIER_LITE, "full": TIER_FULL, "heavy": TIER_HEAVY}
+
+BACKEND_AUTO = "auto"
+
+MODEL_DIR = Path(__file__).parent / "models"
+BACKEND_CACHE_PATH = MODEL_DIR / "pose_backend_choice.json"
+
+# MediaPipe landmarker variants (models/pose_landmarker_<variant>.task)
+MEDIAPIPE_VARIANTS = {"lite": TIER_LITE, "full": TIER_FULL, "heavy": TIER_HEAVY}
+
+# YOLO pose exported to ONNX (export_yolo_onnx.py), in order of preference
+YOLO_ONNX_PATHS = [MODEL_DIR / "unified_model.onnx", MODEL_DIR / "yolov8n-pose.onnx"]
+
+# TFLite files in models/ that are never pose models (form classifier exports)
+NON_POSE_TFLITE_PREFIXES = ("model_lstm",)
+# Single-pose signature of the other .tflite files, by name (with mtime / size)
+TFLITE_SIGNATURE_CACHE_NAME = "pose_tflite_signatures.json"
+
+
+def coco_to_pose_data(kpts: np.ndarray) -> np.ndarray:
+    """
+    Map COCO-17 keypoints to PoseFrame data.
+
+    Args:
+        kpts: (17, 3) x, y, confidence in frame pixels
+
+    Returns:
+        (17, 5) PoseFrame data (heels / feet absent)
+    """
+    data = np.zeros((NUM_KEYPOINTS, NUM_COLUMNS), dtype=np.float32)
+    rows = np.arange(len(COCO_INDICES))
+    data[rows, 0:2] = kpts[COCO_INDICES, 0:2]
+    data[rows, 3] = kpts[COCO_INDICES, 2]
+    data[rows, 4] = 1.0
+    return data
+
+
+# ==================== Backends ====================
+
+class PoseBackend(ABC):
+    """A pose model that can build inference workers."""
+
+    #: Label reported as the result "model"
+    model = "pose"
+
+    def __init__(self, name: str, tier: int, path: Path):
+        self.name = name
+        self.tier = tier
+        self.path = Path(path)
+
+    @abstractmethod
+    def create_worker(self, running_mode: str, min_detection_confidence: float = 0.5,
+                      min_tracking_confidence: float = 0.5, num_threads: int = 0):
+        """
+        Build one inference worker (not thread-safe, one per caller).
+
+        Args:
+            running_mode: RUNNING_MODE_VIDEO or RUNNING_MODE_IMAGE (only
+                meaningful for backends that track between frames)
+            min_detection_confidence: Minimum confidence for detection
+            min_tracking_confidence: Minimum confidence for tracking
+            num_threads: Intra-op threads for the worker (0 = runtime default)
+        """
+
+    def create_process_worker(self, running_mode: str, min_detection_confidence: float = 0.5,
+                              min_tracking_confidence: float = 0.5):
+        """Worker running in a dedicated process, or None if the backend has no process mode."""
+        return None
+
+    def describe(self) -> Dict[str, Any]:
+        tier = next(name for name, value in TIER_NAMES.items() if value == self.tier)
+        return {"name": self.name, "model": self.model, "tier": tier, "path": self.path.name}
+
+
+class MediaPipeBackend(PoseBackend):
+    """MediaPipe Tasks PoseLandmarker (lite / full / heavy)."""
+
+    model = "mediapipe"
+
+    def create_worker(self, running_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5, num_threads=0):
+        landmarker = create_landmarker(self.path, running_mode, min_detection_confidence, min_tracking_confidence)
+        return MediaPipeWorker(landmarker, running_mode)
+
+    def create_process_worker(self, running_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        return ProcessWorker(self.path, running_mode, min_detection_confidence, min_tracking_confidence)
+
+
+class YoloWorker:
+    """YoloPoseOnnx with the worker interface (best person only)."""
+
+    model = "yolo"
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        kpts, _, _ = self.detector.detect(frame)
+        if len(kpts) == 0:
+            return None
+        return coco_to_pose_data(kpts[0])
+
+    def close(self):
+        self.detector = None
+
+
+class YoloOnnxBackend(PoseBackend):
+    """YOLO pose exported to ONNX (see yolo_onnx.py)."""
+
+    model = "yolo"
+
+    def create_worker(self, running_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5, num_threads=0):
+        from yolo_onnx import YoloPoseOnnx
+        return YoloWorker(YoloPoseOnnx(self.path, conf=min_detection_confidence, num_threads=num_threads))
+
+
+class FallbackWorker:
+    """
+    Primary backend worker with a MediaPipe fallback. The shared
+    FallbackController picks which one runs each frame (normally only one);
+    model reports who produced the last pose.
+    """
+
+    def __init__(self, primary, fallback=None, controller: Optional[FallbackController] = None):
+        self.primary = primary
+        self.fallback = fallback
+        self.controller = controller or FallbackController(primary.model, fallback.model if fallback else None)
+        self.model = primary.model
+
+    def _run(self, role: str, frame: np.ndarray, timestamp_ms: Optional[int]) -> Optional[np.ndarray]:
+        worker = self.primary if role == ROLE_PRIMARY else self.fallback
+        start = time.perf_counter()
+        try:
+            data = worker.detect(frame, timestamp_ms)
+            error = False
+        except Exception as e:
+            print(f"[POSE] {worker.model} detection error: {e}")
+            data, error = None, True
+        self.controller.record(role, data is not None, (time.perf_counter() - start) * 1000.0, error)
+        self.model = worker.model
+        return data
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        if self.fallback is None:
+            return self._run(ROLE_PRIMARY, frame, timestamp_ms)
+        role = self.controller.choose()
+        data = self._run(role, frame, timestamp_ms)
+        if data is None and self.controller.double_infer:
+            self.controller.record_double_inference()
+            data = self._run(ROLE_FALLBACK if role == ROLE_PRIMARY else ROLE_PRIMARY, frame, timestamp_ms)
+        return data
+
+    def close(self):
+        self.primary.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+class TFLitePoseWorker:
+    """
+    Single-pose TFLite model with MoveNet's signature: (1, S, S, 3) image in,
+    (1, 1, 17, 3) normalized y, x, score out.
+    """
+
+    model = "tflite"
+
+    def __init__(self, interpreter, min_confidence: float):
+        self.interpreter = interpreter
+        self.min_confidence = min_confidence
+        interpreter.allocate_tensors()
+        details = interpreter.get_input_details()[0]
+        self._input_index = details["index"]
+        self._output_index = interpreter.get_output_details()[0]["index"]
+        self.input_size = int(details["shape"][1])
+        self._input = np.zeros(tuple(details["shape"]), dtype=details["dtype"])
+        self._resized = np.zeros((self.input_size, self.input_size, 3), dtype=np.uint8)
+        self.letterbox = LetterboxBuffer()
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        letterbox = self.letterbox
+        size = self.input_size
+        cv2.resize(letterbox.prepare(frame), (size, size), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        self._input[0] = self._resized  # Cast to the model's dtype (uint8 / int32 / float32 0..255)
+        self.interpreter.set_tensor(self._input_index, self._input)
+        self.interpreter.invoke()
+        out = self.interpreter.get_tensor(self._output_index)[0, 0]  # (17, 3) y, x, score
+
+        if out[:, 2].mean() < self.min_confidence:
+            return None
+        kpts = out[:, [1, 0, 2]].astype(np.float32)
+        letterbox.to_frame_coordinates(kpts[:, :2])
+        return coco_to_pose_data(kpts)
+
+    def close(self):
+        self.interpreter = None
+
+
+class TFLitePoseBackend(PoseBackend):
+    """Single-pose TFLite model dropped into models/ (MoveNet lightning / thunder)."""
+
+    model = "tflite"
+
+    def create_worker(self, running_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5, num_threads=0):
+        # MoveNet scores are lower than landmarker confidences
+        return TFLitePoseWorker(load_tflite_interpreter(self.path, num_threads), min_detection_confidence * 0.5)
+
+
+def _is_single_pose_tflite(model_path: Path) -> Optional[int]:
+    """Input size if the .tflite file has a single-pose signature, else None."""
+    try:
+        interpreter = load_tflite_interpreter(model_path)
+        inputs = interpreter.get_input_details()
+        outputs = interpreter.get_output_details()
+    except Exception:
+        return None
+    if len(inputs) != 1 or len(outputs) != 1:
+        return None
+    in_shape, out_shape = list(inputs[0]["shape"]), list(outputs[0]["shape"])
+    if len(in_shape) != 4 or in_shape[3] != 3 or in_shape[1] != in_shape[2] or out_shape[-2:] != [17, 3]:
+        return None
+    return int(in_shape[1])
+
+
+# ==================== Registry ====================
+
+# Discovery function per backend family: model_dir -> available backends
+BACKEND_REGISTRY: Dict[str, Callable[[Path], List[PoseBackend]]] = {}
+
+
+def register_backend(family: str):
+    """Decorator registering a discovery function for a backend family."""
+    def decorator(discover: Callable[[Path], List[PoseBackend]]):
+        BACKEND_REGISTRY[family] = discover
+        return discover
+    return decorator
+
+
+@register_backend("mediapipe")
+def _discover_mediapipe(model_dir: Path) -> List[PoseBackend]:
+    return [
+        MediaPipeBackend(f"mediapipe_{variant}", tier, model_dir / f"pose_landmarker_{variant}.task")
+        for variant, tier in MEDIAPIPE_VARIANTS.items()
+        if (model_dir / f"pose_landmarker_{variant}.task").exists()
+    ]
+
+
+@register_backend("yolo")
+def _discover_yolo(model_dir: Path) -> List[PoseBackend]:
+    if importlib.util.find_spec("onnxruntime") is None:  # Checked without importing it
+        return []
+    for path in (model_dir / p.name for p in YOLO_ONNX_PATHS):
+        if path.exists():
+            return [YoloOnnxBackend("yolo_onnx", TIER_FULL, path)]
+    return []
+
+
+@register_backend("tflite")
+def _discover_tflite(model_dir: Path) -> List[PoseBackend]:
+    # Known non-pose models are skipped by name; the others are opened once and
+    # their signature cached by mtime / size (no interpreter on later startups)
+    paths = [p for p in sorted(model_dir.glob("*.tflite")) if not p.name.startswith(NON_POSE_TFLITE_PREFIXES)]
+    if not paths:
+        return []
+    cache_path = model_dir / TFLITE_SIGNATURE_CACHE_NAME
+    cache = _load_cache(cache_path)
+    signatures = {}
+    backends = []
+    for path in paths:
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(path.name)
+        if entry and entry.get("stamp") == stamp:
+            size = entry.get("input_size")
+        else:
+            size = _is_single_pose_tflite(path)
+        signatures[path.name] = {"stamp": stamp, "input_size": size}
+        if size is not None:
+            tier = TIER_FULL if size >= 256 else TIER_LITE  # MoveNet thunder 256, lightning 192
+            backends.append(TFLitePoseBackend(f"tflite_{path.stem}", tier, path))
+    if signatures != cache:
+        try:
+            with open(cache_path, "w") as f:
+                json.dump(signatures, f, indent=2)
+        except OSError as e:
+            print(f"[BACKEND] Could not save TFLite signatures: {e}")
+    return backends
+
+
+def discover_backends(model_dir: Path = MODEL_DIR) -> List[PoseBackend]:
+    """All backends whose model files are present in model_dir."""
+    backends = []
+    for family, discover in BACKEND_REGISTRY.items():
+        try:
+            backends.extend(discover(model_dir))
+        except Exception as e:
+            print(f"[BACKEND] Discovery of {family} backends failed: {e}")
+    return backends
+
+
+# ==================== Benchmark / selection ====================
+
+def synthetic_frames(count: int = 4, width: int = 640, height: int = 480) -> List[np.ndarray]:
+    """Deterministic test frames: a stick figure in a few poses on a textured background."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(60, 120, size=(height, width, 3), dtype=np.uint8)
+        cx, top = width // 2, height // 6
+        unit = height // 12
+        lift = int(unit * 2 * (i % 2))  # Arms up / down
+        body = (200, 170, 150)
+        cv2.circle(frame, (cx, top + unit), unit, body, -1)
+        cv2.line(frame, (cx, top + 2 * unit), (cx, top + 6 * unit), body, unit // 2)
+        for side in (-1, 1):
+            cv2.line(frame, (cx, top + 3 * unit), (cx + side * 2 * unit, top + 5 * unit - lift), body, unit // 3)
+            cv2.line(frame, (cx, top + 6 * unit), (cx + side * unit, top + 9 * unit), body, unit // 3)
+        frames.append(frame)
+    return frames
+
+
+def benchmark_backend(backend: PoseBackend, frames: List[np.ndarray], iterations: int = 10,
+                      warmup: int = 2) -> Optional[float]:
+    """
+    Median single-frame latency of a backend (image mode, one worker).
+
+    Returns:
+        Latency in milliseconds, or None if the backend failed to load or run
+    """
+    worker = None
+    try:
+        worker = backend.create_worker(RUNNING_MODE_IMAGE)
+        for i in range(warmup):
+            worker.detect(frames[i % len(frames)])
+        times = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            worker.detect(frames[i % len(frames)])
+            times.append((time.perf_counter() - start) * 1000.0)
+        return float(np.median(times))
+    except Exception as e:
+        print(f"[BACKEND] Benchmark of {backend.name} failed: {e}")
+        return None
+    finally:
+        if worker is not None:
+            worker.close()
+
+
+def host_key() -> str:
+    """Identifies this machine in the backend cache."""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}"
+
+
+def _load_cache(cache_path: Path) -> Dict[str, Any]:
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def select_backend(
+    backends: List[PoseBackend],
+    min_tier: int = TIER_FULL,
+    cache_path: Optional[Path] = BACKEND_CACHE_PATH,
+    benchmark: Callable[[PoseBackend], Optional[float]] = None,
+    refresh: bool = False
+) -> Optional[PoseBackend]:
+    """
+    Fastest backend meeting the accuracy tier on this host.
+
+    The cached choice is reused while this host sees the same candidate
+    backends (adding or removing a model re-runs the benchmark). If no
+    backend meets min_tier, the most accurate ones available compete.
+
+    Args:
+        backends: Available backends (discover_backends())
+        min_tier: Minimum accuracy tier (TIER_LITE / TIER_FULL / TIER_HEAVY)
+        cache_path: JSON file with the per-host choice (None: no caching)
+        benchmark: backend -> latency in ms or None; defaults to benchmark_backend
+            on synthetic_frames()
+        refresh: Ignore the cached choice and benchmark again
+
+    Returns:
+        The chosen backend, or None if none could run
+    """
+    if not backends:
+        return None
+    candidates = [b for b in backends if b.tier >= min_tier]
+    if not candidates:
+        best = max(b.tier for b in backends)
+        candidates = [b for b in backends if b.tier == best]
+        print("[BACKEND] No backend meets the accuracy tier, using the best available")
+
+    names = sorted(b.name for b in candidates)
+    key = host_key()
+    cache = _load_cache(cache_path) if cache_path else {}
+    entry = cache.get(key)
+    if entry and not refresh and entry.get("candidates") == names and entry.get("backend") in names:
+        chosen = next(b for b in candidates if b.name == entry["backend"])
+        print(f"[BACKEND] Using cached choice for this host: {chosen.name}")
+        return chosen
+
+    if benchmark is None:
+        frames = synthetic_frames()
+        benchmark = lambda backend: benchmark_backend(backend, frames)
+
+    latencies = {}
+    for backend in candidates:
+        latencies[backend.name] = benchmark(backend)
+        print(f"[BACKEND] {backend.name}: {latencies[backend.name]} ms")
+    runnable = [b for b in candidates if latencies[b.name] is not None]
+    if not runnable:
+        return None
+    chosen = min(runnable, key=lambda b: latencies[b.name])
+    print(f"[BACKEND] Selected {chosen.name} ({latencies[chosen.name]:.1f} ms/frame)")
+
+    if cache_path:
+        cache[key] = {
+            "backend": chosen.name,
+            "candidates": names,
+            "latency_ms": {name: (round(ms, 2) if ms is not None else None) for name, ms in latencies.items()},
+            "min_tier": min_tier,
+            "timestamp": time.time(),
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"[BACKEND] Could not save backend choice: {e}")
+    return chosen
+
+
+def choose_backend(name: Optional[str] = None, model_dir: Path = MODEL_DIR) -> Optional[PoseBackend]:
+    """
+    Resolve the pose backend from a name or the environment.
+
+    Args:
+        name: Backend name (e.g. "mediapipe_full", "yolo_onnx") or "auto".
+            Defaults to the POSE_BACKEND env var ("auto").
+
+    Environment:
+        POSE_MIN_TIER: Accuracy tier for "auto" (lite / full / heavy, default full)
+        POSE_BACKEND_REBENCH: "true" ignores the cached choice
+    """
+    if name is None:
+        name = os.getenv("POSE_BACKEND", BACKEND_AUTO)
+    name = name.lower()
+    backends = discover_backends(model_dir)
+    print(f"[BACKEND] Available: {', '.join(b.name for b in backends) or 'none'}")
+
+    if name != BACKEND_AUTO:
+        for backend in backends:
+            if backend.name == name:
+                return backend
+        print(f"[BACKEND] Backend '{name}' not available, selecting automatically")
+
+    tier_name = os.getenv("POSE_MIN_TIER", "full").lower()
+    min_tier = TIER_NAMES.get(tier_name, TIER_FULL)
+    refresh = os.getenv("POSE_BACKEND_REBENCH", "false").lower() == "true"
+    return select_backend(backends, min_tier, model_dir / BACKEND_CACHE_PATH.name, refresh=refresh)
@@ -11,21 +11,38 @@ import math
 import urllib.request
 import os
 import threading
-import queue
 from concurrent.futures import ThreadPoolExecutor
 from hardware_manager import get_hardware_manager
-
-# MediaPipe Tasks imports
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
+from model_manifest import get_model_manifest, is_valid_zip
+from frame_ring import FrameRing, FrameLease
+from frame_ingest import FrameIngest
+from frame_preprocess import ResizeBuffer
+from inference_governor import InferenceGovernor
+from pose_roi import RoiTracker
+from pose_motion import KeypointPredictor
+from session_recorder import SessionRecorder, default_recording_path
+from pose_backends import PoseBackend, MediaPipeBackend, FallbackWorker, choose_backend
+from backend_health import FallbackController
+from joint_angles import detector_angles, DETECTOR_ANGLE_NAMES, DETECTOR_TRIPLES
+from pose_frame import PoseFrame, as_pose_frame, KEYPOINT_INDEX, X, Y, VISIBILITY, PRESENT
+from pose_workers import (
+    MediaPipeWorker, ProcessWorker, InferencePool, create_landmarker,
+    RUNNING_MODE_VIDEO, RUNNING_MODE_IMAGE, POOL_MODE_THREAD, POOL_MODE_PROCESS
+)
 
 
 # Model file paths
 MODEL_DIR = Path(__file__).parent / "models"
 MODEL_PATH = MODEL_DIR / "pose_landmarker_full.task"
 MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/1/pose_landmarker_full.task"
-YOLO_MODEL_PATH = MODEL_DIR / "unified_model.pt"
+
+# Camera id of PC mode: frames come from the client via push_external_frame()
+EXTERNAL_CAMERA_ID = -1
+
+# Landmarker running modes (RUNNING_MODE_VIDEO / RUNNING_MODE_IMAGE).
+# "video" uses detect_for_video(): the person detector only re-runs when
+# landmark tracking is lost (honours min_tracking_confidence).
+# "image" runs the full detector + landmark model on every call.
 
 
 # MediaPipe pose landmark indices (same as legacy API)
@@ -51,40 +68,38 @@ POSE_LANDMARKS = {
 
 
 def download_model():
-    """Download the pose landmarker model if not present or corrupt."""
-    import zipfile
+    """
+    Download the pose landmarker model if not present or corrupt.
+    Integrity comes from the model manifest: the zip CRC scan only runs when
+    the file's size or mtime changed since it was last verified.
+    """
+    manifest = get_model_manifest()
     
     # Check if exists and is valid
     if MODEL_PATH.exists():
+        if manifest.check(MODEL_PATH, is_valid_zip):
+            print(f"[POSE] Model exists and is valid at {MODEL_PATH}")
+            return True
+        print(f"[POSE] Model at {MODEL_PATH} is corrupt. Retying download...")
         try:
-            # MediaPipe task files are zip archives
-            with zipfile.ZipFile(MODEL_PATH) as z:
-                 if z.testzip() is None:
-                     print(f"[POSE] Model exists and is valid at {MODEL_PATH}")
-                     return True
-        except zipfile.BadZipFile:
-            print(f"[POSE] Model at {MODEL_PATH} is corrupt. Retying download...")
-            try:
-                os.remove(MODEL_PATH)
-            except OSError as e:
-                print(f"[POSE] Error removing corrupt model: {e}")
-                return False
+            os.remove(MODEL_PATH)
+            manifest.forget(MODEL_PATH)
+        except OSError as e:
+            print(f"[POSE] Error removing corrupt model: {e}")
+            return False
 
     try:
         MODEL_DIR.mkdir(parents=True, exist_ok=True)
         print(f"[POSE] Downloading pose model from {MODEL_URL}...")
         urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
         
-        # Verify download
+        # Verify download (and record it in the manifest)
         if MODEL_PATH.exists():
-            try:
-                 with zipfile.ZipFile(MODEL_PATH) as z:
-                     if z.testzip() is None:
-                         print(f"[POSE] Model downloaded to {MODEL_PATH}")
-                         return True
-            except zipfile.BadZipFile:
-                print("[POSE] Downloaded model is corrupt.")
-                return False
+            if manifest.check(MODEL_PATH, is_valid_zip, force=True):
+                print(f"[POSE] Model downloaded to {MODEL_PATH}")
+                return True
+            print("[POSE] Downloaded model is corrupt.")
+            return False
                 
         return False
     except Exception as e:
@@ -92,17 +107,30 @@ def download_model():
         return False
 
 
+def carries_video_tracking(worker) -> bool:
+    """True if the worker (or a backend it falls back to) keeps VIDEO-mode tracking state between calls."""
+    if isinstance(worker, FallbackWorker):
+        return any(carries_video_tracking(w) for w in (worker.primary, worker.fallback) if w is not None)
+    return getattr(worker, "running_mode", None) == RUNNING_MODE_VIDEO
+
+
 class PoseDetector:
     """
     Pose detection using MediaPipe Tasks API.
     Extracts 33 body landmarks and calculates joint angles.
     """
     
+    # Rows used by auto-centering (torso)
+    _TORSO_ROWS = np.array([KEYPOINT_INDEX[n] for n in ("left_shoulder", "right_shoulder", "left_hip", "right_hip")])
+    
     def __init__(
         self,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
-        use_yolo: bool = False
+        backend: Optional[str] = None,
+        running_mode: Optional[str] = None,
+        num_workers: Optional[int] = None,
+        pool_mode: Optional[str] = None
     ):
         """
         Initialize the pose detector.
@@ -110,41 +138,86 @@ class PoseDetector:
         Args:
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
+            backend: Pose backend name (see pose_backends, e.g. "mediapipe_full",
+                "yolo_onnx") or "auto" to benchmark the available ones.
+                Defaults to the POSE_BACKEND env var ("auto"). MediaPipe full
+                stays loaded as fallback for other backends.
+            running_mode: "video" (landmark tracking, default) or "image".
+                Defaults to the POSE_RUNNING_MODE env var.
+            num_workers: Number of inference workers, each with its own
+                landmarker. Defaults to the POSE_WORKERS env var (1).
+            pool_mode: "thread" (default) or "process" workers.
+                Defaults to the POSE_POOL_MODE env var.
         """
         self.landmarker = None
-        self.yolo_model = None
+        self._snapshot_worker: Optional[MediaPipeWorker] = None  # Lazily created for snapshot detection
+        self._direct_worker = None  # Primary backend worker for direct (non-pool) calls
+        self._direct_lock = threading.Lock()
+        self.fallback: Optional[FallbackController] = None  # Primary / MediaPipe arbitration
         self.latest_result = None
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
         
-        # Enable YOLO if requested
-        self.use_yolo = use_yolo
-        self.yolo_failed_permanently = False
-        if self.use_yolo:
-            print("[POSE] YOLO mode enabled. Loading model...")
-            self._load_yolo_model()
-        else:
-            print("[POSE] Using MediaPipe for pose detection")
-
+        if running_mode is None:
+            running_mode = os.getenv("POSE_RUNNING_MODE", RUNNING_MODE_VIDEO)
+        running_mode = running_mode.lower()
+        if running_mode not in (RUNNING_MODE_VIDEO, RUNNING_MODE_IMAGE):
+            print(f"[POSE] Unknown running mode '{running_mode}', using '{RUNNING_MODE_VIDEO}'")
+            running_mode = RUNNING_MODE_VIDEO
+        self.running_mode = running_mode
+        
+        if num_workers is None:
+            num_workers = int(os.getenv("POSE_WORKERS", "1"))
+        self.num_workers = max(1, num_workers)
+        if pool_mode is None:
+            pool_mode = os.getenv("POSE_POOL_MODE", POOL_MODE_THREAD)
+        pool_mode = pool_mode.lower()
+        if pool_mode not in (POOL_MODE_THREAD, POOL_MODE_PROCESS):
+            print(f"[POSE] Unknown pool mode '{pool_mode}', using '{POOL_MODE_THREAD}'")
+            pool_mode = POOL_MODE_THREAD
+        self.pool_mode = pool_mode
+        
+        # Inference rate / input scale governor (latency, CPU load, eco mode)
+        self.governor = InferenceGovernor.from_env(
+            eco_source=lambda: get_hardware_manager().get_eco_recommendations(),
+            workers=self.num_workers
+        )
+        
+        # Crop inference to the area around the previous pose (POSE_ROI_CROP);
+        # stateless workers only (YOLO, TFLite, MediaPipe in image mode)
+        self.roi_tracker = RoiTracker.from_env() if os.getenv("POSE_ROI_CROP", "true").lower() == "true" else None
+        
+        # Keypoint motion model: display-rate poses between inference results (POSE_MOTION_MODEL)
+        self.motion = KeypointPredictor.from_env()
+        
+        # Front camera: report L/R from the user's point of view (mirror image)
+        self.mirror = True
+        
+        # Result stream recording (start_recording / POSE_RECORD)
+        self.recorder: Optional[SessionRecorder] = None
+        
         # Initialize MediaPipe (either as primary or backup)
         if True: # Always attempt to load MediaPipe for fallback
             # Download model if needed
             if not download_model():
                 print("[POSE] Warning: Pose detection will not work without model")
-                # return # Don't return, YOLO might work
+                # return # Don't return, another backend might work
+            
+            # Pick the pose backend (cached per host after the first benchmark)
+            self.backend: Optional[PoseBackend] = choose_backend(backend, MODEL_DIR)
+            self.model_path = MODEL_PATH
+            if isinstance(self.backend, MediaPipeBackend):
+                self.model_path = self.backend.path
+                print(f"[POSE] Using {self.backend.name} for pose detection")
+            elif self.backend is not None:
+                print(f"[POSE] Using {self.backend.name} for pose detection (MediaPipe as fallback)")
+                self._direct_worker = self._create_backend_worker(RUNNING_MODE_IMAGE)
+                self.fallback = FallbackController.from_env(self.backend.name, "mediapipe")
 
             # Create pose landmarker
             try:
-                base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
-                options = vision.PoseLandmarkerOptions(
-                    base_options=base_options,
-                    running_mode=vision.RunningMode.IMAGE,
-                    min_pose_detection_confidence=min_detection_confidence,
-                    min_tracking_confidence=min_tracking_confidence,
-                    output_segmentation_masks=False
-                )
-                self.landmarker = vision.PoseLandmarker.create_from_options(options)
-                print("[POSE] MediaPipe Pose detector initialized (Tasks API)")
+                self.landmarker = self._create_landmarker(self.running_mode)
+                print(f"[POSE] MediaPipe Pose detector initialized (Tasks API, {self.running_mode} mode)")
             except Exception as e:
                 print(f"[POSE] Failed to initialize pose detector: {e}")
                 
@@ -154,10 +227,11 @@ class PoseDetector:
                     try:
                          if MODEL_PATH.exists():
                              os.remove(MODEL_PATH)
+                             get_model_manifest().forget(MODEL_PATH)
                          if download_model():
                              # Retry initialization once
                              try:
-                                 self.landmarker = vision.PoseLandmarker.create_from_options(options)
+                                 self.landmarker = self._create_landmarker(self.running_mode)
                                  print("[POSE] MediaPipe Pose detector initialized after recovery")
                              except Exception as retry_e:
                                   print(f"[POSE] Recovery failed: {retry_e}")
@@ -167,60 +241,151 @@ class PoseDetector:
                 
                 if self.landmarker is None:
                     print("[POSE] Critical: MediaPipe could not be initialized.")
+            
+            # Worker state for the primary landmarker (direct detect_pose calls, pool worker 0)
+            self._tracking_worker = (
+                MediaPipeWorker(self.landmarker, self.running_mode) if self.landmarker is not None else None
+            )
         
         # Camera state
         self.cap: Optional[cv2.VideoCapture] = None
         self.is_running = False
-        self.frame_count = 0
+        self.frame_count = 0  # Published results (under _frame_lock)
         self.fps = 0.0
         self.last_fps_time = time.time()
         self.fps_frame_count = 0
         
         # Threading and caching
-        self._latest_frame: Optional[np.ndarray] = None
+        # Frames live in a ring of preallocated slots; consumers get read-only views.
+        # Each worker pins up to two slots (one queued, one in inference).
+        self._frame_ring = FrameRing(num_slots=max(4, 2 * self.num_workers + 2))
         self._frame_lock = threading.Lock()
         self._stop_event = threading.Event()
         self._capture_thread: Optional[threading.Thread] = None
         self.camera_id = 0  # Default to 0, will be updated by start_camera
+        self._ingest = FrameIngest.from_env()  # PC mode (pushed frames)
         
-        # Dedicated worker thread for pose detection
-        self._processing_queue = queue.Queue(maxsize=1)
+        # Inference workers for pose detection (round-robin, see _publish_result)
+        self._resize_buffers: Dict[Any, ResizeBuffer] = {}  # Downscale destinations, per worker (see _detect)
         self._result_id = 0
-        self._detector_active = True # Lifecycle for the worker thread
-        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self._worker_thread.start()
+        self._result_frame_id = -1  # Capture frame id of latest_result
+        self.stale_results = 0      # Results dropped because a newer frame was already published
+        self._pool = InferencePool(self._create_workers(), self._process_lease)
+        
+        # Record from startup (otherwise POST /recording/start)
+        if os.getenv("POSE_RECORD", "false").lower() == "true":
+            self.start_recording()
 
         # Centering state
         self.current_pan_angle = 0
         self.pan_sensitivity = 45.0  # Degrees of pan per 1.0 of normalized offset
         self.pan_threshold = 0.1     # Only move if offset > 10% from center
 
-    def _load_yolo_model(self):
-        """Load YOLO model for pose detection."""
-        try:
-            from ultralytics import YOLO
+    def _create_landmarker(self, running_mode: str):
+        """
+        Create a MediaPipe PoseLandmarker.
+        
+        Args:
+            running_mode: RUNNING_MODE_VIDEO or RUNNING_MODE_IMAGE
             
-            # 1. Try unified model path
-            if YOLO_MODEL_PATH.exists():
-                print(f"[POSE] Loading YOLO model from {YOLO_MODEL_PATH}...")
-                self.yolo_model = YOLO(str(YOLO_MODEL_PATH))
-            else:
-                # 2. Fallback to nano model (will auto-download)
-                print(f"[POSE] Unified model not found. Using {MODEL_DIR / 'yolov8n-pose.pt'}...")
-                self.yolo_model = YOLO(str(MODEL_DIR / "yolov8n-pose.pt"))
-                
-            print("[POSE] YOLO model loaded successfully")
-        except ImportError:
-            print("[POSE] Error: 'ultralytics' library not installed. Falling back to MediaPipe.")
-            self.use_yolo = False
+        Returns:
+            PoseLandmarker instance
+        """
+        return create_landmarker(self.model_path, running_mode, self.min_detection_confidence, self.min_tracking_confidence)
+
+    def _uses_mediapipe(self) -> bool:
+        """True if MediaPipe is the primary backend (not just the fallback)."""
+        return self.backend is None or isinstance(self.backend, MediaPipeBackend)
+
+    def _create_backend_worker(self, running_mode: str):
+        """Worker of the (non-MediaPipe) primary backend, or None if it fails to load."""
+        try:
+            # Split the cores between the pool workers
+            threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+            return self.backend.create_worker(running_mode, self.min_detection_confidence,
+                                              self.min_tracking_confidence, num_threads=threads)
         except Exception as e:
-            print(f"[POSE] Failed to load YOLO model: {e}")
-            self.use_yolo = False
-    
+            print(f"[POSE] Failed to create {self.backend.name} worker: {e}")
+            return None
+
+    def _create_workers(self) -> List[Any]:
+        """
+        Build the inference pool's workers, each with its own landmarker.
+        Worker 0 reuses the primary landmarker in thread mode.
+        With another primary backend, each worker runs it with its own
+        MediaPipe fallback (thread mode only).
+        """
+        if not self._uses_mediapipe():
+            return self._create_fallback_workers()
+        if self._tracking_worker is None:
+            return [None]  # No MediaPipe
+        
+        workers = []
+        for i in range(self.num_workers):
+            try:
+                if self.pool_mode == POOL_MODE_PROCESS:
+                    workers.append(ProcessWorker(self.model_path, self.running_mode,
+                                                 self.min_detection_confidence, self.min_tracking_confidence))
+                elif i == 0:
+                    workers.append(self._tracking_worker)
+                else:
+                    workers.append(MediaPipeWorker(self._create_landmarker(self.running_mode), self.running_mode))
+            except Exception as e:
+                print(f"[POSE] Failed to create inference worker {i}: {e}")
+                break
+        if not workers:
+            workers.append(self._tracking_worker)
+        print(f"[POSE] Inference pool: {len(workers)} {self.pool_mode} worker(s)")
+        return workers
+
+    def _create_fallback_workers(self) -> List[Any]:
+        """Pool workers for a non-MediaPipe primary backend (see _create_workers)."""
+        if self.pool_mode == POOL_MODE_PROCESS:
+            print(f"[POSE] {self.backend.name} has no process mode, using thread workers")
+        workers = []
+        for i in range(self.num_workers):
+            primary = self._create_backend_worker(self.running_mode)
+            if primary is None:
+                break
+            fallback = self._tracking_worker if i == 0 else None
+            if fallback is None and self.landmarker is not None:
+                try:
+                    fallback = MediaPipeWorker(self._create_landmarker(self.running_mode), self.running_mode)
+                except Exception as e:
+                    print(f"[POSE] Failed to create fallback landmarker for worker {i}: {e}")
+            workers.append(FallbackWorker(primary, fallback, self.fallback))
+        if not workers:
+            # Primary backend unusable: MediaPipe only
+            print(f"[POSE] {self.backend.name} failed to load, using MediaPipe")
+            self.backend = None
+            self._direct_worker = None
+            self.fallback = None
+            return self._create_workers()
+        print(f"[POSE] Inference pool: {len(workers)} thread worker(s) ({self.backend.name})")
+        return workers
+
+    def _get_snapshot_worker(self) -> Optional[MediaPipeWorker]:
+        """Get the IMAGE mode worker used for one-off snapshots (created on first use)."""
+        if self._snapshot_worker is None and self.landmarker is not None:
+            if self.running_mode == RUNNING_MODE_IMAGE:
+                # Same landmarker, separate letterbox buffer
+                self._snapshot_worker = MediaPipeWorker(self.landmarker, RUNNING_MODE_IMAGE)
+                return self._snapshot_worker
+            try:
+                self._snapshot_worker = MediaPipeWorker(self._create_landmarker(RUNNING_MODE_IMAGE), RUNNING_MODE_IMAGE)
+                print("[POSE] Snapshot landmarker initialized (image mode)")
+            except Exception as e:
+                print(f"[POSE] Failed to initialize snapshot landmarker: {e}")
+        return self._snapshot_worker
+
     def start_camera(self, camera_id: int = 0, width: int = 640, height: int = 480) -> bool:
         """
         Start webcam capture.
+        camera_id EXTERNAL_CAMERA_ID (-1) selects PC mode: no local capture,
+        frames are pushed by the client (push_external_frame).
         """
+        if camera_id == EXTERNAL_CAMERA_ID:
+            return self._start_external()
 
         # 1. Check if already running with this ID and cap is valid
         if self.is_running and getattr(self, 'camera_id', -1) == camera_id:
@@ -247,8 +412,8 @@ class PoseDetector:
         # Reset state for new capture
         self.camera_id = camera_id
         self._stop_event.clear()
+        self._frame_ring.reset() # Clear cache
         with self._frame_lock:
-            self._latest_frame = None # Clear cache
             self.fps_frame_count = 0
         
         try:
@@ -306,27 +471,23 @@ class PoseDetector:
         consecutive_failures = 0
         while not self._stop_event.is_set():
             if self.cap:
-                ret, frame = self.cap.read()
+                # Read straight into a free ring slot (no per-frame allocation)
+                slot, buf = self._frame_ring.reserve()
+                ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
                 if ret and frame is not None:
+                    # Monotonic capture timestamp (ms) for the VIDEO mode landmarker
+                    capture_ts_ms = int(time.monotonic() * 1000)
                     consecutive_failures = 0
-                    with self._frame_lock:
-                        self._latest_frame = frame
+                    if slot is not None:
+                        self._frame_ring.commit(slot, frame, capture_ts_ms)
+                    else:
+                        self._frame_ring.write(frame, capture_ts_ms)
                     
-                    # Update FPS
-                    self.fps_frame_count += 1
-                    current_time = time.time()
-                    if current_time - self.last_fps_time >= 1.0:
-                        self.fps = self.fps_frame_count / (current_time - self.last_fps_time)
-                        self.fps_frame_count = 0
-                        self.last_fps_time = current_time
-
-                    # Push to inference worker if it's empty (don't backlog)
-                    if self._processing_queue.empty():
-                        try:
-                            self._processing_queue.put_nowait(frame)
-                        except queue.Full:
-                            pass
+                    self._update_fps()
+                    self._dispatch_latest()
                 else:
+                    if slot is not None:
+                        self._frame_ring.abort(slot)
                     consecutive_failures += 1
                     if consecutive_failures % 30 == 0:
                         print(f"[POSE] Warning: {consecutive_failures} consecutive frame read failures")
@@ -360,6 +521,83 @@ class PoseDetector:
                 break
         print("[POSE] Capture loop stopped")
     
+    def _update_fps(self):
+        """Count a new frame for the capture FPS."""
+        self.fps_frame_count += 1
+        current_time = time.time()
+        if current_time - self.last_fps_time >= 1.0:
+            self.fps = self.fps_frame_count / (current_time - self.last_fps_time)
+            self.fps_frame_count = 0
+            self.last_fps_time = current_time
+
+    def _dispatch_latest(self) -> bool:
+        """
+        Push the latest frame to the next free inference worker (don't backlog),
+        paced by the governor's target rate.
+        The slot stays pinned until the worker is done with it.
+        
+        Returns:
+            True if the frame was handed to a worker
+        """
+        if not (self._pool.has_capacity() and self.governor.should_dispatch()):
+            return False
+        lease = self._frame_ring.lease()
+        if lease is None:
+            return False
+        if self._pool.submit(lease):
+            self.governor.mark_dispatched()
+            return True
+        lease.release()
+        return False
+
+    def _start_external(self) -> bool:
+        """Switch to PC mode: release the local camera and accept pushed frames."""
+        if self.is_running and self.camera_id == EXTERNAL_CAMERA_ID:
+            return True
+        self.stop_camera()
+        self.camera_id = EXTERNAL_CAMERA_ID
+        self._frame_ring.reset()
+        with self._frame_lock:
+            self.fps_frame_count = 0
+        self._stop_event.clear()
+        self.is_running = True
+        print("[POSE] PC mode: waiting for frames pushed by the client")
+        return True
+
+    def push_external_frame(self, data: bytes, client_id: Any = None) -> bool:
+        """
+        Ingest one encoded frame (JPEG) from the client in PC mode.
+        
+        The frame is rate limited per client, decoded at reduced size, written
+        to the frame ring and handed to inference only if a worker is free
+        (drop-if-busy; the frame still becomes the latest for display/calibration).
+        
+        Args:
+            data: Encoded image bytes (binary WebSocket message)
+            client_id: Key of the sending client (rate limiting)
+            
+        Returns:
+            True if the frame was accepted into the ring
+        """
+        if self.camera_id != EXTERNAL_CAMERA_ID or not self.is_running:
+            return False
+        if not self._ingest.admit(client_id, len(data)):
+            return False
+        frame = self._ingest.decode(data)
+        if frame is None:
+            return False
+        
+        if self._frame_ring.write(frame, int(time.monotonic() * 1000)) is None:
+            return False
+        self._update_fps()
+        if not self._dispatch_latest():
+            self._ingest.mark_skipped()
+        return True
+
+    def release_external_client(self, client_id: Any):
+        """Forget a disconnected client's ingest state."""
+        self._ingest.forget(client_id)
+
     def stop_camera(self):
         """Stop webcam capture."""
         print("[POSE] Stopping camera...")
@@ -381,50 +619,171 @@ class PoseDetector:
     
     def get_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Get the latest frame from the cache.
+        Get a copy of the latest frame.
+        
+        The copy is taken while the ring slot is pinned, so it is never torn
+        by the capture thread and can be kept across awaits. To avoid the
+        copy, pin the frame with get_frame_lease() and release it once done.
         
         Returns:
             Tuple of (success, frame)
         """
+        frame_id, frame = self.get_latest_frame()
+        return frame is not None, frame
+
+    def get_latest_frame(self) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Get a copy of the latest frame and its id.
+        
+        Returns:
+            Tuple of (frame_id, frame). (-1, None) if no frame.
+        """
+        lease = self.get_frame_lease()
+        if lease is None:
+            return -1, None
+        with lease:
+            return lease.frame_id, lease.frame.copy()
+
+    @property
+    def latest_frame_id(self) -> int:
+        """Id of the latest captured frame (-1 if none), without touching the frame."""
+        return self._frame_ring.latest_id if self.is_running else -1
+
+    def has_frame(self) -> bool:
+        return self.latest_frame_id >= 0
+
+    def get_frame_lease(self) -> Optional[FrameLease]:
+        """Pin the latest frame; release the lease (or use it as a context manager) when done."""
         if not self.is_running:
-            return False, None
-            
+            return None
+        return self._frame_ring.lease()
+    
+    def _process_lease(self, worker, lease: FrameLease):
+        """Inference pool handler: detect on a pinned frame and publish the result."""
+        frame = lease.frame
+        # MediaPipe VIDEO mode tracks its own ROI across calls in normalized image
+        # coordinates: a crop that moves (or a full-frame re-detect) breaks it
+        crop = self.roi_tracker is not None and not carries_video_tracking(worker)
+        roi = self.roi_tracker.next_roi() if crop else None
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            frame = frame[y0:y1, x0:x1]  # View, no copy
+        
+        # Tracking mode uses the capture timestamp
+        start = time.perf_counter()
+        res = self._detect(frame, lease.capture_ts_ms, worker, scale=self.governor.scale)
+        self.governor.record_latency(time.perf_counter() - start)
+        
+        if res and roi is not None:
+            # Back to full-frame coordinates (angles are unaffected by the shift)
+            h, w = lease.frame.shape[:2]
+            res["pose"].translate(roi[0], roi[1], w, h)
+            res["keypoints"] = res["pose"].keypoints
+        if crop:
+            self.roi_tracker.update(res["pose"] if res else None, roi, lease.frame_id)
+        if res:
+            self._publish_result(lease.frame_id, res, lease.capture_ts_ms)
+
+    def _publish_result(self, frame_id: Optional[int], result: Dict[str, Any], capture_ts_ms: int = 0):
+        """
+        Publish a result as latest_result, in capture order.
+        With several workers, results can finish out of order: a result for
+        an older frame than the one already published is dropped, so
+        latest_result and result_id only ever move forward. Direct
+        detect_pose() results have no ring frame id (None) and are published
+        as they come.
+        """
         with self._frame_lock:
-            if self._latest_frame is not None:
-                return True, self._latest_frame.copy()
-            
-        return False, None
+            if frame_id is not None:
+                if frame_id <= self._result_frame_id:
+                    self.stale_results += 1
+                    return
+                self._result_frame_id = frame_id
+            self._result_id += 1
+            self.frame_count += 1
+            result["result_id"] = self._result_id
+            result["frame_id"] = self.frame_count
+            self.latest_result = result
+            if self.motion is not None:
+                self.motion.observe(result["pose"], capture_ts_ms / 1000.0)
+            if self.recorder is not None:
+                self.recorder.record(result["pose"], result["angles"], result["model"], capture_ts_ms)
+        
+        if result.get("model") == "mediapipe":
+            # Auto-centering logic
+            self._update_auto_centering(result)
+
+    def get_display_pose(self) -> Tuple[Optional[PoseFrame], bool]:
+        """
+        Pose to show right now (overlay / keypoint stream).
+        
+        With a motion model, the last results are extrapolated to the current
+        time, so the skeleton moves at display rate between inference results.
+        Predicted poses are for display only: exercise logic uses latest_result.
+        
+        Returns:
+            Tuple of (pose, predicted)
+        """
+        if self.motion is not None:
+            return self.motion.predict(time.monotonic())
+        result = self.latest_result
+        return (result["pose"] if result else None), False
+
+    def get_inference_stats(self) -> Dict[str, Any]:
+        """Inference pool status (for /status)."""
+        stats = self._pool.get_stats()
+        stats.update({
+            "mode": self.pool_mode,
+            "backend": self.backend.describe() if self.backend else None,
+            "fallback": self.fallback.get_stats() if self.fallback else None,
+            "results": self._result_id,
+            "stale_results": self.stale_results,
+            "dropped_frames": self._frame_ring.dropped_frames,
+            "governor": self.governor.get_status(),
+            "roi": self.roi_tracker.get_stats() if self.roi_tracker else None,
+            "ingest": self._ingest.get_stats() if self.camera_id == EXTERNAL_CAMERA_ID else None,
+            "recording": self.recorder.get_stats() if self.recorder else None,
+        })
+        return stats
     
-    def _worker_loop(self):
-        """Dedicated background thread for AI inference."""
-        print("[POSE] Inference worker thread started")
-        while self._detector_active:
-            try:
-                # Get the latest frame from the queue, wait for a bit
-                frame = self._processing_queue.get(timeout=1.0)
-                if frame is None:
-                    continue
-                
-                # Perform inference
-                res = self.detect_pose(frame)
-                if res:
-                    self._result_id += 1
-                    res["result_id"] = self._result_id
-                    with self._frame_lock:
-                        self.latest_result = res
-                
-                self._processing_queue.task_done()
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"[POSE] Worker error: {e}")
-                time.sleep(0.1)
-        print("[POSE] Inference worker thread stopped")
+    def start_recording(self, path: Optional[Path] = None, capacity: Optional[int] = None) -> SessionRecorder:
+        """
+        Record every published result to a session file (see session_recorder).
+        
+        Args:
+            path: Output file; defaults to recordings/session_<time>.poserec
+            capacity: Max frames; defaults to POSE_RECORD_MAX_FRAMES (one hour at 30 Hz)
+        """
+        self.stop_recording()
+        if capacity is None:
+            capacity = int(os.getenv("POSE_RECORD_MAX_FRAMES", "108000"))
+        recorder = SessionRecorder(path or default_recording_path(), capacity=capacity)
+        with self._frame_lock:
+            self.recorder = recorder
+        print(f"[POSE] Recording results to {recorder.path}")
+        return recorder
+    
+    def stop_recording(self) -> Optional[Dict[str, Any]]:
+        """Stop the current recording, if any; returns its stats."""
+        with self._frame_lock:
+            recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return None
+        recorder.close()
+        stats = recorder.get_stats()
+        print(f"[POSE] Recording saved: {stats['path']} ({stats['frames']} frames, {stats['dropped']} dropped)")
+        return stats
 
 
-    def detect_pose(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
+    def detect_pose(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Detect pose in a frame.
+        
+        Args:
+            frame: BGR image
+            timestamp_ms: Monotonic capture timestamp. When given and the detector
+                runs in video mode, the tracking landmarker is used. Without a
+                timestamp the frame is treated as an independent snapshot (IMAGE mode).
         """
         # Debug: Check frame quality
         if self.frame_count % 30 == 0:
@@ -434,54 +793,69 @@ class PoseDetector:
             if brightness < 30:
                 print("[POSE] WARNING: Image is very dark!")
 
-        # Flip frame for correct L/R identification (Front camera assumption)
-        processing_frame = cv2.flip(frame, 1)
-        h, w = frame.shape[:2]
+        result = self._detect(frame, timestamp_ms)
+        if result:
+            capture_ts_ms = timestamp_ms if timestamp_ms is not None else int(time.monotonic() * 1000)
+            self._publish_result(None, result, capture_ts_ms)
+
+        return result
 
-        if self.use_yolo and self.yolo_model:
-            result = self._detect_yolo(processing_frame)
+    def _detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None,
+                worker: Optional[Any] = None, scale: float = 1.0) -> Optional[Dict[str, Any]]:
+        """
+        Run the primary backend (MediaPipe as fallback) on a frame without publishing the result.
+        
+        Args:
+            scale: Input scale (< 1.0 runs inference on a downscaled copy;
+                coordinates are mapped back to the full frame)
+        """
+        if scale < 1.0:
+            h, w = frame.shape[:2]
+            # Per-worker destination buffers: no allocation per downscaled frame
+            resizer = self._resize_buffers.get(worker)
+            if resizer is None:
+                resizer = self._resize_buffers.setdefault(worker, ResizeBuffer())
+            small = resizer.resize(frame, max(1, int(w * scale)), max(1, int(h * scale)))
+            result = self._detect(small, timestamp_ms, worker)
             if result:
-                if self.frame_count % 30 == 0:
-                    print(f"[POSE] YOLO detection successful (conf: {self.min_detection_confidence})")
-                
-                # Flip coordinates back to match the original frame (for frontend display)
-                self._flip_result_coordinates(result, w)
-                
-                self.latest_result = result
-                return result
-            
-            if self.frame_count % 30 == 0:
-                print("[POSE] YOLO failed, falling back to MediaPipe...")
+                # Angles are invariant to uniform scaling; only coordinates move
+                result["pose"].rescale(w, h)
+                result["keypoints"] = result["pose"].keypoints
+            return result
         
-        result = self._detect_mediapipe(processing_frame)
-        if result:
-            # Flip coordinates back for MediaPipe too
-            self._flip_result_coordinates(result, w)
-            self.latest_result = result
-            
-            # Auto-centering logic
-            self._update_auto_centering(result)
+        # Front camera: mirroring is applied to the keypoints (see _build_result), not the pixels
+        if worker is None and self._direct_worker is not None:
+            with self._direct_lock:  # Direct calls share one primary backend worker
+                if not isinstance(self._direct_worker, FallbackWorker):
+                    # Snapshot landmarker as fallback, same arbitration as the pool
+                    self._direct_worker = FallbackWorker(self._direct_worker, self._get_snapshot_worker(), self.fallback)
+                return self._run_worker(self._direct_worker, frame, timestamp_ms)
+        
+        return self._detect_mediapipe(frame, timestamp_ms, worker)
 
-        return result
+    def detect_snapshot(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Detect pose in a single, independent frame (IMAGE mode).
+        Used by calibration; never touches the tracking landmarker's timeline.
+        """
+        return self.detect_pose(frame, timestamp_ms=None)
 
     def _update_auto_centering(self, result: Dict[str, Any]):
         """
         Calculate user offset from center and adjust camera pan.
         """
-        if not result or "keypoints" not in result:
+        if not result or "pose" not in result:
             return
 
         # Calculate average X position of main torso points
-        torso_points = ["left_shoulder", "right_shoulder", "left_hip", "right_hip"]
-        x_coords = []
-        for p in torso_points:
-            if p in result["keypoints"] and result["keypoints"][p].get("visibility", 0) > 0.5:
-                x_coords.append(result["keypoints"][p]["normalized"]["x"])
-        
-        if not x_coords:
+        pose: PoseFrame = result["pose"]
+        torso = self._TORSO_ROWS
+        visible = (pose.data[torso, VISIBILITY] > 0.5) & (pose.data[torso, PRESENT] > 0)
+        if not visible.any():
             return
+        x_coords = pose.data[torso[visible], X] / pose.width
 
-        avg_x = sum(x_coords) / len(x_coords)
+        avg_x = float(x_coords.mean())
         offset = avg_x - 0.5  # 0 is center, -0.5 is left, 0.5 is right
         
         # Only adjust if beyond threshold
@@ -515,372 +889,154 @@ class PoseDetector:
 
         return result
 
-    def _flip_result_coordinates(self, result: Dict[str, Any], width: int):
-        """
-        Flip x-coordinates of detection results to match the original (unflipped) frame.
-        Used when we flip the input frame for detection to ensure correct L/R identification.
-        """
-        if not result or "keypoints" not in result:
-            return
-
-        for name, kpt in result["keypoints"].items():
-            # Flip absolute X (0..width -> width..0)
-            kpt["x"] = width - kpt["x"]
-            
-            # Flip normalized X (0..1 -> 1..0)
-            if "normalized" in kpt:
-                kpt["normalized"]["x"] = 1.0 - kpt["normalized"]["x"]
-
-    def _detect_yolo(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
-        """YOLOv11-pose detection implementation."""
-        try:
-            # Use the configured confidence threshold
-            results = self.yolo_model(frame, verbose=False, conf=getattr(self, 'min_detection_confidence', 0.25))
-            if not results or len(results[0].keypoints) == 0:
-                return None
-        except AttributeError as e:
-            if "'Conv' object has no attribute 'bn'" in str(e):
-                # Critical fix for YOLOv8/v11 on some CPU envs
-                print("[POSE] Suppression error detected (fusion bug). Disabling YOLO for this session.")
-                self.yolo_failed_permanently = True
-                self.use_yolo = False
-                return None
-            raise e
-        except Exception as e:
-            print(f"[POSE] YOLO detection error: {e}")
-            # If it's a model-internal error, we might want to fallback permanently too
-            if "model" in str(e).lower() or "forward" in str(e).lower():
-                self.yolo_failed_permanently = True
-                self.use_yolo = False
-            return None
-        
-        self.frame_count += 1
-        h, w = frame.shape[:2]
-        keypoints = {}
-        
-        # YOLO keypoints format: [N, 17, 3] (x, y, conf)
-        # Mapping YOLO indices to our POSE_LANDMARKS names
-        # YOLOv8/v11 pose indices: 0:nose, 5:l_shoulder, 6:r_shoulder, 7:l_elbow, 8:r_elbow, 
-        # 9:l_wrist, 10:r_wrist, 11:l_hip, 12:r_hip, 13:l_knee, 14:r_knee, 15:l_ankle, 16:r_ankle
-        yolo_map = {
-            0: "nose", 5: "left_shoulder", 6: "right_shoulder", 7: "left_elbow", 
-            8: "right_elbow", 9: "left_wrist", 10: "right_wrist", 11: "left_hip", 
-            12: "right_hip", 13: "left_knee", 14: "right_knee", 15: "left_ankle", 16: "right_ankle"
-        }
-        
-        kpts = results[0].keypoints.data[0].cpu().numpy() # [17, 3]
-        
-        for idx, name in yolo_map.items():
-            x, y, conf = kpts[idx]
-            keypoints[name] = {
-                "x": float(x),
-                "y": float(y),
-                "z": 0.0,
-                "visibility": float(conf),
-                "normalized": {"x": float(x/w), "y": float(y/h), "z": 0.0}
-            }
-            
-        angles = self._calculate_angles(keypoints)
+    def _build_result(self, pose: PoseFrame, model: str) -> Dict[str, Any]:
+        """Wrap a PoseFrame in the result dict shared by all backends."""
+        if self.mirror:
+            # Same labels as detecting on a horizontally flipped frame and
+            # flipping x back: pixels and coordinates stay put, L/R rows swap
+            pose.swap_sides()
         return {
-            "keypoints": keypoints,
-            "angles": angles,
-            "frame_id": self.frame_count,
+            "pose": pose,
+            "keypoints": pose.keypoints,  # Lazy legacy dict view
+            "angles": self._calculate_angles(pose),
             "fps": round(self.fps, 1),
             "timestamp": time.time(),
-            "model": "yolo"
+            "model": model
         }
 
-    def _detect_mediapipe(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
-        """MediaPipe detection implementation."""
-        if self.landmarker is None:
+    def _detect_mediapipe(self, frame: np.ndarray, timestamp_ms: Optional[int] = None,
+                          worker: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        MediaPipe detection implementation.
+        
+        Args:
+            frame: BGR image
+            timestamp_ms: Capture timestamp (tracking in video mode)
+            worker: Inference worker to run on (pool workers may be any
+                backend); defaults to the primary tracking worker, or the
+                snapshot worker when there is no timestamp
+        """
+        if worker is None:
+            use_tracking = self.running_mode == RUNNING_MODE_VIDEO and timestamp_ms is not None
+            worker = self._tracking_worker if use_tracking else self._get_snapshot_worker()
+        if worker is None:
             return None
+        return self._run_worker(worker, frame, timestamp_ms)
 
+    def _run_worker(self, worker, frame: np.ndarray, timestamp_ms: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Run one inference worker and wrap its pose in a result."""
         h_orig, w_orig = frame.shape[:2]
-        
-        # MediaPipe Tasks API prefers square images to avoid "NORM_RECT" warnings 
-        # and coordinate projection issues on some platforms.
-        size = max(h_orig, w_orig)
-        pad_h = (size - h_orig) // 2
-        pad_w = (size - w_orig) // 2
-        
-        # Pad to square
-        padded_frame = cv2.copyMakeBorder(
-            frame, pad_h, size - h_orig - pad_h, 
-            pad_w, size - w_orig - pad_w, 
-            cv2.BORDER_CONSTANT, value=[0, 0, 0]
-        )
-        
-        rgb_frame = cv2.cvtColor(padded_frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-        
         try:
-            result = self.landmarker.detect(mp_image)
+            data = worker.detect(frame, timestamp_ms)
         except Exception as e:
-            print(f"[POSE] MediaPipe detection error: {e}")
+            print(f"[POSE] {worker.model} detection error: {e}")
             return None
         
-        if not result.pose_landmarks or len(result.pose_landmarks) == 0:
+        if data is None:
             return None
         
-        # Landmarks processing
-        self.frame_count += 1
-        keypoints = {}
-        landmarks = result.pose_landmarks[0]
-        
-        for idx, name in POSE_LANDMARKS.items():
-            if idx < len(landmarks):
-                landmark = landmarks[idx]
-                # Map back to original (non-padded) coordinates
-                # landmark.x/y are 0..1 in the padded (square) image
-                x_px = landmark.x * size
-                y_px = landmark.y * size
-                
-                # Subtract padding
-                x_orig = x_px - pad_w
-                y_orig = y_px - pad_h
-                
-                keypoints[name] = {
-                    "x": x_orig,
-                    "y": y_orig,
-                    "z": landmark.z,
-                    "visibility": landmark.visibility if hasattr(landmark, 'visibility') else 1.0,
-                    "normalized": {
-                        "x": x_orig / w_orig, 
-                        "y": y_orig / h_orig, 
-                        "z": landmark.z
-                    }
-                }
-        
-        angles = self._calculate_angles(keypoints)
-        return {
-            "keypoints": keypoints,
-            "angles": angles,
-            "frame_id": self.frame_count,
-            "fps": round(self.fps, 1),
-            "timestamp": time.time(),
-            "model": "mediapipe"
-        }
+        return self._build_result(PoseFrame(data, w_orig, h_orig), worker.model)
     
-    def _calculate_angles(self, keypoints: Dict) -> Dict[str, float]:
+    def _calculate_angles(self, keypoints) -> Dict[str, float]:
         """
-        Calculate joint angles from keypoints.
+        Calculate joint angles from keypoints (one vectorized pass, pixel space).
         
         Args:
-            keypoints: Dictionary of keypoint positions
+            keypoints: PoseFrame (or legacy dictionary of keypoint positions)
             
         Returns:
             Dictionary of angle names to values in degrees
         """
-        angles = {}
-        
-        try:
-            # Left elbow angle (shoulder-elbow-wrist)
-            angles["left_elbow"] = self._calculate_angle(
-                keypoints["left_shoulder"],
-                keypoints["left_elbow"],
-                keypoints["left_wrist"]
-            )
-            
-            # Right elbow angle
-            angles["right_elbow"] = self._calculate_angle(
-                keypoints["right_shoulder"],
-                keypoints["right_elbow"],
-                keypoints["right_wrist"]
-            )
-            
-            # Left knee angle (hip-knee-ankle)
-            angles["left_knee"] = self._calculate_angle(
-                keypoints["left_hip"],
-                keypoints["left_knee"],
-                keypoints["left_ankle"]
-            )
-            
-            # Right knee angle
-            angles["right_knee"] = self._calculate_angle(
-                keypoints["right_hip"],
-                keypoints["right_knee"],
-                keypoints["right_ankle"]
-            )
-            
-            # Left hip angle (shoulder-hip-knee)
-            angles["left_hip"] = self._calculate_angle(
-                keypoints["left_shoulder"],
-                keypoints["left_hip"],
-                keypoints["left_knee"]
-            )
-            
-            # Right hip angle
-            angles["right_hip"] = self._calculate_angle(
-                keypoints["right_shoulder"],
-                keypoints["right_hip"],
-                keypoints["right_knee"]
-            )
-            
-            # Left shoulder angle (elbow-shoulder-hip)
-            angles["left_shoulder"] = self._calculate_angle(
-                keypoints["left_elbow"],
-                keypoints["left_shoulder"],
-                keypoints["left_hip"]
-            )
-            
-            # Right shoulder angle
-            angles["right_shoulder"] = self._calculate_angle(
-                keypoints["right_elbow"],
-                keypoints["right_shoulder"],
-                keypoints["right_hip"]
-            )
-            
-            # Torso angle (vertical alignment)
-            angles["torso_angle"] = self._calculate_torso_angle(keypoints)
-            
-        except (KeyError, TypeError) as e:
-            print(f"[POSE] Angle calculation error: {e}")
+        pose = as_pose_frame(keypoints)
+        values = detector_angles(pose.data).tolist()
+        present = pose.data[:, PRESENT] > 0
+        if present.all():
+            return dict(zip(DETECTOR_ANGLE_NAMES, values))
         
-        return angles
+        # Partial pose (e.g. YOLO has no heels/feet): keep angles whose joints exist
+        complete = present[DETECTOR_TRIPLES].all(axis=1).tolist()
+        complete.append(bool(present[self._TORSO_ROWS].all()))
+        return {name: v for name, v, ok in zip(DETECTOR_ANGLE_NAMES, values, complete) if ok}
     
-    def _calculate_angle(self, p1: Dict, p2: Dict, p3: Dict) -> float:
-        """
-        Calculate angle between three points.
-        
-        Args:
-            p1: First point (e.g., shoulder)
-            p2: Vertex point (e.g., elbow)
-            p3: Third point (e.g., wrist)
-            
-        Returns:
-            Angle in degrees
-        """
-        # Get coordinates
-        a = np.array([p1["x"], p1["y"]])
-        b = np.array([p2["x"], p2["y"]])
-        c = np.array([p3["x"], p3["y"]])
-        
-        # Calculate vectors
-        ba = a - b
-        bc = c - b
-        
-        # Calculate angle using dot product
-        cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc) + 1e-6)
-        angle = np.arccos(np.clip(cosine_angle, -1.0, 1.0))
-        
-        return math.degrees(angle)
-    
-    def _calculate_torso_angle(self, keypoints: Dict) -> float:
-        """Calculate torso angle from vertical."""
-        try:
-            # Midpoint of shoulders
-            mid_shoulder = (
-                (keypoints["left_shoulder"]["x"] + keypoints["right_shoulder"]["x"]) / 2,
-                (keypoints["left_shoulder"]["y"] + keypoints["right_shoulder"]["y"]) / 2
-            )
-            
-            # Midpoint of hips
-            mid_hip = (
-                (keypoints["left_hip"]["x"] + keypoints["right_hip"]["x"]) / 2,
-                (keypoints["left_hip"]["y"] + keypoints["right_hip"]["y"]) / 2
-            )
-            
-            # Calculate angle from vertical
-            dx = mid_shoulder[0] - mid_hip[0]
-            dy = mid_shoulder[1] - mid_hip[1]
-            
-            angle = math.degrees(math.atan2(abs(dx), abs(dy)))
-            return angle
-            
-        except Exception:
-            return 0.0
+    # Skeleton connections drawn by draw_pose
+    _SKELETON = [
+        ("left_shoulder", "right_shoulder"),
+        ("left_shoulder", "left_elbow"), ("left_elbow", "left_wrist"),
+        ("right_shoulder", "right_elbow"), ("right_elbow", "right_wrist"),
+        ("left_shoulder", "left_hip"), ("right_shoulder", "right_hip"),
+        ("left_hip", "right_hip"),
+        ("left_hip", "left_knee"), ("left_knee", "left_ankle"),
+        ("right_hip", "right_knee"), ("right_knee", "right_ankle")
+    ]
+    _SKELETON_ROWS = [(KEYPOINT_INDEX[a], KEYPOINT_INDEX[b]) for a, b in _SKELETON]
+    _LABELS = [name.split('_')[-1] for name in KEYPOINT_INDEX]
     
-    def draw_pose(self, frame: np.ndarray) -> np.ndarray:
+    def draw_pose(self, frame: np.ndarray, pose: Optional[PoseFrame] = None) -> np.ndarray:
         """
-        Draw pose landmarks on frame using the unified result dictionary.
+        Draw pose landmarks on frame.
         
         Args:
-            frame: BGR image
+            frame: BGR image (may be a read-only frame ring view)
+            pose: Pose to draw (e.g. from get_display_pose); defaults to the latest result
             
         Returns:
-            Frame with pose overlay
+            Annotated copy of the frame (the frame itself if there is no pose)
         """
-        if self.latest_result is None or "keypoints" not in self.latest_result:
-            return frame
+        if pose is None:
+            if self.latest_result is None or "pose" not in self.latest_result:
+                return frame
+            pose = self.latest_result["pose"]
         
         annotated_frame = frame.copy()
-        keypoints = self.latest_result["keypoints"]
-        h, w = frame.shape[:2]
+        points = pose.data[:, :2].astype(np.int32).tolist()
+        drawable = ((pose.data[:, VISIBILITY] > 0.3) & (pose.data[:, PRESENT] > 0)).tolist()
         
         # 1. Draw joints
-        for name, kpt in keypoints.items():
-            if kpt.get("visibility", 0) > 0.3:
-                x = int(kpt["x"])
-                y = int(kpt["y"])
+        for i, (x, y) in enumerate(points):
+            if drawable[i]:
                 cv2.circle(annotated_frame, (x, y), 5, (0, 255, 0), -1)
-                cv2.putText(annotated_frame, name.split('_')[-1], (x+5, y), 
+                cv2.putText(annotated_frame, self._LABELS[i], (x+5, y), 
                             cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
 
         # 2. Draw connections (skeleton)
-        connections = [
-            ("left_shoulder", "right_shoulder"),
-            ("left_shoulder", "left_elbow"), ("left_elbow", "left_wrist"),
-            ("right_shoulder", "right_elbow"), ("right_elbow", "right_wrist"),
-            ("left_shoulder", "left_hip"), ("right_shoulder", "right_hip"),
-            ("left_hip", "right_hip"),
-            ("left_hip", "left_knee"), ("left_knee", "left_ankle"),
-            ("right_hip", "right_knee"), ("right_knee", "right_ankle")
-        ]
-        
-        for start_name, end_name in connections:
-            if start_name in keypoints and end_name in keypoints:
-                start = keypoints[start_name]
-                end = keypoints[end_name]
-                if start.get("visibility", 0) > 0.3 and end.get("visibility", 0) > 0.3:
-                    p1 = (int(start["x"]), int(start["y"]))
-                    p2 = (int(end["x"]), int(end["y"]))
-                    cv2.line(annotated_frame, p1, p2, (0, 255, 0), 2)
+        for start, end in self._SKELETON_ROWS:
+            if drawable[start] and drawable[end]:
+                cv2.line(annotated_frame, tuple(points[start]), tuple(points[end]), (0, 255, 0), 2)
         
         return annotated_frame
     
-    def calculate_body_ratios(self, keypoints: Dict) -> Dict[str, float]:
+    def calculate_body_ratios(self, keypoints) -> Dict[str, float]:
         """
         Calculate body ratios for calibration.
         
         Args:
-            keypoints: Dictionary of keypoint positions
+            keypoints: PoseFrame (or legacy dictionary of keypoint positions)
             
         Returns:
             Dictionary of body ratios
         """
         try:
+            pose = as_pose_frame(keypoints)
+            norm = pose.normalized_xy()
+            
+            def dist(a: str, b: str) -> float:
+                """Euclidean distance between two keypoints (normalized coords)."""
+                d = norm[KEYPOINT_INDEX[a]] - norm[KEYPOINT_INDEX[b]]
+                return math.hypot(float(d[0]), float(d[1]))
+            
             # Shoulder width (normalized by frame width)
-            shoulder_width = abs(
-                keypoints["left_shoulder"]["normalized"]["x"] -
-                keypoints["right_shoulder"]["normalized"]["x"]
-            )
+            shoulder_width = abs(float(
+                norm[KEYPOINT_INDEX["left_shoulder"], 0] - norm[KEYPOINT_INDEX["right_shoulder"], 0]
+            ))
             
             # Arm length (shoulder to wrist)
-            left_arm = self._distance(
-                keypoints["left_shoulder"], keypoints["left_wrist"]
-            )
-            right_arm = self._distance(
-                keypoints["right_shoulder"], keypoints["right_wrist"]
-            )
-            arm_length = (left_arm + right_arm) / 2
+            arm_length = (dist("left_shoulder", "left_wrist") + dist("right_shoulder", "right_wrist")) / 2
             
             # Leg length (hip to ankle)
-            left_leg = self._distance(
-                keypoints["left_hip"], keypoints["left_ankle"]
-            )
-            right_leg = self._distance(
-                keypoints["right_hip"], keypoints["right_ankle"]
-            )
-            leg_length = (left_leg + right_leg) / 2
+            leg_length = (dist("left_hip", "left_ankle") + dist("right_hip", "right_ankle")) / 2
             
             # Torso height (shoulder to hip)
-            left_torso = self._distance(
-                keypoints["left_shoulder"], keypoints["left_hip"]
-            )
-            right_torso = self._distance(
-                keypoints["right_shoulder"], keypoints["right_hip"]
-            )
-            torso_height = (left_torso + right_torso) / 2
+            torso_height = (dist("left_shoulder", "left_hip") + dist("right_shoulder", "right_hip")) / 2
             
             # Leg to torso ratio
             leg_torso_ratio = leg_length / (torso_height + 1e-6)
@@ -897,12 +1053,6 @@ class PoseDetector:
             print(f"[POSE] Error calculating body ratios: {e}")
             return {}
     
-    def _distance(self, p1: Dict, p2: Dict) -> float:
-        """Calculate Euclidean distance between two points (normalized coords)."""
-        dx = p1["normalized"]["x"] - p2["normalized"]["x"]
-        dy = p1["normalized"]["y"] - p2["normalized"]["y"]
-        return math.sqrt(dx**2 + dy**2)
-    
     def is_camera_available(self) -> bool:
         """Check if camera is available without intrusive probing."""
         # If it's already running, it's definitely available
@@ -916,10 +1066,15 @@ class PoseDetector:
     
     def cleanup(self):
         """Clean up resources."""
-        self._detector_active = False # Stop the worker thread
         self.stop_camera()
-        if self.landmarker is not None:
-            self.landmarker.close()
+        self.stop_recording()
+        self._pool.close()  # Stops the worker threads and closes their landmarkers
+        if self._snapshot_worker is not None and self._snapshot_worker.landmarker is not self.landmarker:
+            self._snapshot_worker.close()
+        if self._direct_worker is not None:
+            self._direct_worker.close()
+        if self._tracking_worker is not None:
+            self._tracking_worker.close()  # Primary landmarker (no-op if already closed by the pool)
         print("[POSE] Pose detector cleaned up")
 
 
@@ -931,7 +1086,5 @@ def get_pose_detector() -> PoseDetector:
     """Get or create the global pose detector."""
     global _pose_detector
     if _pose_detector is None:
-        import os
-        use_yolo = os.getenv("USE_YOLO", "true").lower() == "true"
-        _pose_detector = PoseDetector(use_yolo=use_yolo)
+        _pose_detector = PoseDetector()  # Backend from POSE_BACKEND (auto)
     return _pose_detector
@@ -0,0 +1,220 @@
+"""
+Compact array-backed keypoint representation for the pose pipeline.
+One (17, 5) float32 array per frame instead of a dict of 17 nested dicts;
+lazy dict/JSON adapters keep legacy callers working.
+"""
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Iterator
+
+import numpy as np
+
+
+# Keypoints kept by the pipeline, in array row order, with the MediaPipe
+# landmark index each row is taken from (same set as POSE_LANDMARKS).
+KEYPOINT_NAMES = (
+    "nose",
+    "left_shoulder", "right_shoulder",
+    "left_elbow", "right_elbow",
+    "left_wrist", "right_wrist",
+    "left_hip", "right_hip",
+    "left_knee", "right_knee",
+    "left_ankle", "right_ankle",
+    "left_heel", "right_heel",
+    "left_foot_index", "right_foot_index",
+)
+MEDIAPIPE_INDICES = np.array([0, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32])
+# COCO-17 keypoint index (YOLO pose, MoveNet) of the first rows; COCO has no heels/feet
+COCO_INDICES = np.array([0, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16])
+KEYPOINT_INDEX: Dict[str, int] = {name: i for i, name in enumerate(KEYPOINT_NAMES)}
+NUM_KEYPOINTS = len(KEYPOINT_NAMES)
+
+
+def _opposite_side(name: str) -> str:
+    if name.startswith("left_"):
+        return "right_" + name[len("left_"):]
+    if name.startswith("right_"):
+        return "left_" + name[len("right_"):]
+    return name
+
+
+# Row of the opposite-side keypoint (left <-> right), used to mirror a pose
+# without flipping the image
+MIRROR_ROWS = np.array([KEYPOINT_INDEX[_opposite_side(n)] for n in KEYPOINT_NAMES])
+
+# Array columns: pixel x, pixel y, z, visibility, presence flag
+# (1.0 if the backend produced the keypoint, e.g. YOLO has no heels/feet).
+X, Y, Z, VISIBILITY, PRESENT = range(5)
+NUM_COLUMNS = 5
+
+
+class PoseFrame:
+    """
+    Keypoints of one detected pose.
+
+    data is a (17, 5) float32 array (see column constants) in pixel
+    coordinates of a width x height frame; normalized coordinates are
+    derived on demand.
+    """
+
+    __slots__ = ("data", "width", "height", "_keypoints")
+
+    def __init__(self, data: Optional[np.ndarray] = None, width: int = 1, height: int = 1):
+        """
+        Initialize a pose frame.
+
+        Args:
+            data: (17, 5) float32 array, or None for an empty (all absent) pose
+            width: Frame width in pixels (normalization scale)
+            height: Frame height in pixels (normalization scale)
+        """
+        if data is None:
+            data = np.zeros((NUM_KEYPOINTS, NUM_COLUMNS), dtype=np.float32)
+        self.data = data
+        self.width = width
+        self.height = height
+        self._keypoints: Optional["LazyKeypoints"] = None
+
+    @property
+    def present(self) -> np.ndarray:
+        """Boolean mask of keypoints produced by the backend."""
+        return self.data[:, PRESENT] > 0
+
+    @property
+    def visibility(self) -> np.ndarray:
+        """Visibility column (view)."""
+        return self.data[:, VISIBILITY]
+
+    def normalized_xy(self) -> np.ndarray:
+        """(17, 2) coordinates normalized to 0..1 by the frame size."""
+        return self.data[:, :2] / np.array([self.width, self.height], dtype=np.float32)
+
+    def mean_visibility(self) -> float:
+        """Average visibility over present keypoints."""
+        present = self.present
+        if not present.any():
+            return 0.0
+        return float(self.data[present, VISIBILITY].mean())
+
+    def mirror_x(self):
+        """Mirror x coordinates in place (x -> width - x)."""
+        self.data[:, X] = self.width - self.data[:, X]
+        self._keypoints = None
+
+    def rescale(self, width: int, height: int):
+        """Map pixel coordinates in place to a width x height frame (e.g. after a downscaled inference)."""
+        self.data[:, X] *= width / self.width
+        self.data[:, Y] *= height / self.height
+        self.width = width
+        self.height = height
+        self._keypoints = None
+
+    def translate(self, dx: float, dy: float, width: int, height: int):
+        """Move pixel coordinates in place into a larger width x height frame (e.g. from a crop)."""
+        self.data[:, X] += dx
+        self.data[:, Y] += dy
+        self.width = width
+        self.height = height
+        self._keypoints = None
+
+    def swap_sides(self):
+        """Swap left/right keypoint rows in place (mirrored-camera labelling)."""
+        self.data[:] = self.data[MIRROR_ROWS]
+        self._keypoints = None
+
+    @property
+    def keypoints(self) -> "LazyKeypoints":
+        """Legacy dict view: {name: {"x", "y", "z", "visibility", "normalized": {...}}}."""
+        if self._keypoints is None:
+            self._keypoints = LazyKeypoints(self)
+        return self._keypoints
+
+    def to_wire(self) -> Dict[str, Dict[str, float]]:
+        """JSON payload sent to the frontend: normalized x/y and visibility per present keypoint."""
+        norm = self.normalized_xy().tolist()
+        vis = self.data[:, VISIBILITY].tolist()
+        return {
+            KEYPOINT_NAMES[i]: {"x": norm[i][0], "y": norm[i][1], "visibility": vis[i]}
+            for i in np.flatnonzero(self.present)
+        }
+
+    @classmethod
+    def from_keypoints(cls, keypoints: Dict[str, Any], width: int = 1, height: int = 1) -> "PoseFrame":
+        """
+        Build a pose frame from a legacy keypoints dict.
+
+        Points are read from "x"/"y"/"z"/"visibility"; when "normalized" is
+        present the frame size is inferred from it if not given.
+        """
+        if isinstance(keypoints, LazyKeypoints):
+            return keypoints.pose
+        data = np.zeros((NUM_KEYPOINTS, NUM_COLUMNS), dtype=np.float32)
+        for name, kpt in keypoints.items():
+            i = KEYPOINT_INDEX.get(name)
+            if i is None or not isinstance(kpt, dict):
+                continue
+            data[i, X] = kpt.get("x", 0.0)
+            data[i, Y] = kpt.get("y", 0.0)
+            data[i, Z] = kpt.get("z", 0.0)
+            data[i, VISIBILITY] = kpt.get("visibility", 1.0)
+            data[i, PRESENT] = 1.0
+            norm = kpt.get("normalized")
+            if norm and width == 1 and height == 1:
+                if norm.get("x"):
+                    width = max(1, int(round(kpt.get("x", 0.0) / norm["x"])))
+                if norm.get("y"):
+                    height = max(1, int(round(kpt.get("y", 0.0) / norm["y"])))
+        return cls(data, width, height)
+
+
+def as_pose_frame(keypoints: Any) -> PoseFrame:
+    """Accept a PoseFrame or a legacy keypoints dict."""
+    if isinstance(keypoints, PoseFrame):
+        return keypoints
+    return PoseFrame.from_keypoints(keypoints or {})
+
+
+class LazyKeypoints(Mapping):
+    """
+    Read-only legacy dict adapter over a PoseFrame.
+    The per-keypoint dicts are only built on first access.
+    """
+
+    __slots__ = ("pose", "_dict")
+
+    def __init__(self, pose: PoseFrame):
+        self.pose = pose
+        self._dict: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _materialize(self) -> Dict[str, Dict[str, Any]]:
+        if self._dict is None:
+            pose = self.pose
+            rows = pose.data.tolist()
+            norm = pose.normalized_xy().tolist()
+            self._dict = {
+                KEYPOINT_NAMES[i]: {
+                    "x": rows[i][X],
+                    "y": rows[i][Y],
+                    "z": rows[i][Z],
+                    "visibility": rows[i][VISIBILITY],
+                    "normalized": {"x": norm[i][0], "y": norm[i][1], "z": rows[i][Z]},
+                }
+                for i in np.flatnonzero(pose.present)
+            }
+        return self._dict
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._materialize()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return int(self.pose.present.sum())
+
+    def __contains__(self, name: object) -> bool:
+        i = KEYPOINT_INDEX.get(name) if isinstance(name, str) else None
+        return i is not None and bool(self.pose.data[i, PRESENT] > 0)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Plain dict copy (e.g. for JSON serialization)."""
+        return {name: dict(kpt, normalized=dict(kpt["normalized"])) for name, kpt in self._materialize().items()}
@@ -0,0 +1,142 @@
+"""
+Keypoint motion model between inference results.
+Pose results arrive at inference rate (often < 10 Hz on the Pi) while the
+overlay runs at display rate: a per-track filter (One-Euro or constant
+velocity) smooths measured keypoints and extrapolates them to "now".
+Predicted poses are for display only.
+"""
+import math
+import os
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from pose_frame import PoseFrame
+
+
+MOTION_MODEL_ONE_EURO = "one_euro"
+MOTION_MODEL_CONSTANT_VELOCITY = "constant_velocity"
+
+
+def _smoothing_factor(cutoff, dt: float):
+    """Exponential smoothing factor of a first-order low-pass at `cutoff` Hz."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class KeypointPredictor:
+    """
+    Motion model for one tracked pose.
+
+    observe() feeds measured poses (with their capture time); predict()
+    extrapolates the filtered keypoints linearly to any later time, up to
+    max_horizon seconds past the last measurement. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        model: str = MOTION_MODEL_ONE_EURO,
+        min_cutoff: float = 1.0,
+        beta: float = 0.02,
+        d_cutoff: float = 1.0,
+        max_horizon: float = 0.2,
+        max_age: float = 1.0
+    ):
+        """
+        Initialize the predictor.
+
+        Args:
+            model: MOTION_MODEL_ONE_EURO (adaptive smoothing) or
+                MOTION_MODEL_CONSTANT_VELOCITY (raw positions, raw velocity)
+            min_cutoff: One-Euro minimum cutoff (Hz): lower = smoother at rest
+            beta: One-Euro speed coefficient (per px/s): higher = less lag when moving
+            d_cutoff: Cutoff (Hz) of the velocity low-pass
+            max_horizon: Extrapolate at most this many seconds past the last result
+            max_age: No prediction once the last result is older than this (seconds)
+        """
+        self.model = model
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_horizon = max_horizon
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._pose: Optional[PoseFrame] = None  # Last measured pose (template)
+        self._xy: Optional[np.ndarray] = None   # Filtered positions
+        self._velocity: Optional[np.ndarray] = None  # px/s
+        self._t = 0.0
+
+    @classmethod
+    def from_env(cls) -> Optional["KeypointPredictor"]:
+        """Build from POSE_MOTION_MODEL ("one_euro", "constant_velocity" or "off") and POSE_PREDICT_MAX_MS."""
+        model = os.getenv("POSE_MOTION_MODEL", MOTION_MODEL_ONE_EURO).lower()
+        if model == "off":
+            return None
+        if model not in (MOTION_MODEL_ONE_EURO, MOTION_MODEL_CONSTANT_VELOCITY):
+            print(f"[MOTION] Unknown motion model '{model}', using '{MOTION_MODEL_ONE_EURO}'")
+            model = MOTION_MODEL_ONE_EURO
+        return cls(model=model, max_horizon=float(os.getenv("POSE_PREDICT_MAX_MS", "200")) / 1000.0)
+
+    def reset(self):
+        with self._lock:
+            self._pose = None
+            self._xy = None
+            self._velocity = None
+
+    @property
+    def last_time(self) -> float:
+        """Capture time of the last measurement (seconds)."""
+        return self._t
+
+    def observe(self, pose: PoseFrame, t: float):
+        """
+        Feed a measured pose.
+
+        Args:
+            pose: Measured pose
+            t: Capture time in seconds (monotonic clock)
+        """
+        xy = pose.data[:, :2].astype(np.float64)
+        with self._lock:
+            prev = self._pose
+            dt = t - self._t
+            if prev is None or dt <= 0 or (prev.width, prev.height) != (pose.width, pose.height):
+                self._xy = xy
+                self._velocity = np.zeros_like(xy)
+            else:
+                raw_velocity = (xy - self._xy) / dt
+                if self.model == MOTION_MODEL_ONE_EURO:
+                    self._velocity += _smoothing_factor(self.d_cutoff, dt) * (raw_velocity - self._velocity)
+                    cutoff = self.min_cutoff + self.beta * np.abs(self._velocity)
+                    self._xy = self._xy + _smoothing_factor(cutoff, dt) * (xy - self._xy)
+                else:
+                    self._velocity = raw_velocity
+                    self._xy = xy
+
+                # Keypoints that just (re)appeared start from their measurement, at rest
+                new = pose.present & ~prev.present
+                self._xy[new] = xy[new]
+                self._velocity[new] = 0.0
+            self._pose = pose
+            self._t = t
+
+    def predict(self, t: float) -> Tuple[Optional[PoseFrame], bool]:
+        """
+        Keypoints extrapolated to time t.
+
+        Returns:
+            Tuple of (pose, predicted). pose is None when there is no recent
+            measurement; predicted is False when t is the measurement time.
+        """
+        with self._lock:
+            if self._pose is None:
+                return None, False
+            age = t - self._t
+            if age > self.max_age:
+                return None, False
+            horizon = min(max(age, 0.0), self.max_horizon)
+            data = self._pose.data.copy()
+            data[:, :2] = self._xy + self._velocity * horizon
+            return PoseFrame(data, self._pose.width, self._pose.height), horizon > 1e-3
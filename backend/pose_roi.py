@@ -0,0 +1,156 @@
+"""
+Region-of-interest cropping for the pose pipeline.
+With a single user in front of a fixed camera most of the frame is
+background: inference runs on a padded box around the previous pose, with
+periodic full-frame re-detection to pick up a user who moved or changed.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from pose_frame import PoseFrame, X, Y, VISIBILITY, PRESENT
+
+
+Roi = Tuple[int, int, int, int]  # x0, y0, x1, y1 (pixels, exclusive end)
+
+
+class RoiTracker:
+    """
+    Chooses the crop for the next inference from the last pose.
+
+    The crop only moves when the pose leaves its inner margin (or gets much
+    smaller than it), so consecutive frames usually share the same crop:
+    buffers are reused and the landmarker's own tracking stays consistent.
+    Thread-safe (shared by the inference workers).
+    """
+
+    def __init__(
+        self,
+        padding: float = 0.25,
+        redetect_interval: int = 30,
+        min_visibility: float = 0.5,
+        quantum: int = 32,
+        min_size: int = 96
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            padding: Margin added around the pose box, as a fraction of its size
+            redetect_interval: Run a full-frame inference every N frames
+            min_visibility: Mean keypoint visibility below which the next
+                frame is a full-frame re-detection
+            quantum: Crop sizes are rounded up to a multiple of this (pixels)
+            min_size: Minimum crop side (pixels)
+        """
+        self.padding = padding
+        self.redetect_interval = max(1, redetect_interval)
+        self.min_visibility = min_visibility
+        self.quantum = max(1, quantum)
+        self.min_size = min_size
+
+        self._lock = threading.Lock()
+        self._roi: Optional[Roi] = None
+        self._since_full = 0
+        self.full_frame_runs = 0
+        self.roi_runs = 0
+        self.stale_updates = 0  # Results older than one already fed (out-of-order workers)
+        self._last_frame_id = -1
+        self._area_ratio = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RoiTracker":
+        """Build a tracker from POSE_ROI_PADDING / POSE_ROI_REDETECT_FRAMES / POSE_ROI_MIN_VISIBILITY."""
+        return cls(
+            padding=float(os.getenv("POSE_ROI_PADDING", "0.25")),
+            redetect_interval=int(os.getenv("POSE_ROI_REDETECT_FRAMES", "30")),
+            min_visibility=float(os.getenv("POSE_ROI_MIN_VISIBILITY", "0.5")),
+        )
+
+    def next_roi(self) -> Optional[Roi]:
+        """Crop for the next inference, or None for a full-frame re-detection."""
+        with self._lock:
+            if self._roi is None or self._since_full >= self.redetect_interval:
+                return None
+            return self._roi
+
+    def update(self, pose: Optional[PoseFrame], used_roi: Optional[Roi], frame_id: Optional[int] = None):
+        """
+        Feed the outcome of an inference.
+
+        Args:
+            pose: Detected pose in full-frame coordinates (None if nothing was found)
+            used_roi: The crop that was used (None for full frame)
+            frame_id: Capture frame id; with several workers, an outcome for an
+                older frame than one already fed is ignored
+        """
+        with self._lock:
+            if frame_id is not None:
+                if frame_id <= self._last_frame_id:
+                    self.stale_updates += 1
+                    return
+                self._last_frame_id = frame_id
+            if used_roi is None:
+                self.full_frame_runs += 1
+                self._since_full = 0
+            else:
+                self.roi_runs += 1
+                self._since_full += 1
+
+            if pose is None or pose.mean_visibility() < self.min_visibility:
+                # Lost or unsure: look at the whole frame next time
+                self._roi = None
+                return
+
+            box = self._pose_box(pose)
+            if box is None:
+                self._roi = None
+                return
+            if self._roi is None or not self._contains(self._roi, box):
+                self._roi = self._crop_for(box, pose.width, pose.height)
+            x0, y0, x1, y1 = self._roi
+            self._area_ratio = (x1 - x0) * (y1 - y0) / float(pose.width * pose.height)
+
+    def _pose_box(self, pose: PoseFrame) -> Optional[Tuple[float, float, float, float]]:
+        data = pose.data
+        mask = (data[:, PRESENT] > 0) & (data[:, VISIBILITY] >= self.min_visibility * 0.5)
+        if mask.sum() < 2:
+            return None
+        xs, ys = data[mask, X], data[mask, Y]
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+    def _contains(self, roi: Roi, box: Tuple[float, float, float, float]) -> bool:
+        """True if box sits inside roi's inner margin and roi is not oversized for it."""
+        x0, y0, x1, y1 = roi
+        bx0, by0, bx1, by1 = box
+        margin_x = (x1 - x0) * self.padding / (1 + 2 * self.padding) * 0.5
+        margin_y = (y1 - y0) * self.padding / (1 + 2 * self.padding) * 0.5
+        inside = (bx0 >= x0 + margin_x and bx1 <= x1 - margin_x and
+                  by0 >= y0 + margin_y and by1 <= y1 - margin_y)
+        oversized = (bx1 - bx0) * (by1 - by0) * 4 < (x1 - x0) * (y1 - y0)
+        return inside and not oversized
+
+    def _crop_for(self, box: Tuple[float, float, float, float], width: int, height: int) -> Roi:
+        """Padded, quantized crop around box, clamped to the frame."""
+        bx0, by0, bx1, by1 = box
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        q = self.quantum
+        w = int(np.ceil(max(self.min_size, (bx1 - bx0) * (1 + 2 * self.padding)) / q) * q)
+        h = int(np.ceil(max(self.min_size, (by1 - by0) * (1 + 2 * self.padding)) / q) * q)
+        w, h = min(w, width), min(h, height)
+        # Shift (rather than shrink) the crop when it overflows the frame
+        x0 = int(min(max(0, round(cx - w / 2)), width - w))
+        y0 = int(min(max(0, round(cy - h / 2)), height - h))
+        return x0, y0, x0 + w, y0 + h
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "roi": list(self._roi) if self._roi is not None else None,
+                "area_ratio": round(self._area_ratio, 3) if self._roi is not None else 1.0,
+                "full_frame_runs": self.full_frame_runs,
+                "roi_runs": self.roi_runs,
+                "stale_updates": self.stale_updates,
+            }
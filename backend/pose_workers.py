@@ -0,0 +1,261 @@
+"""
+MediaPipe inference workers and the multi-worker inference pool.
+Each worker owns its landmarker, letterbox buffer and video timeline:
+MediaPipe graphs are never shared between concurrent callers. Workers run
+as threads, or as threads that each front one dedicated process.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from frame_preprocess import LetterboxBuffer
+from pose_frame import MEDIAPIPE_INDICES, NUM_KEYPOINTS, NUM_COLUMNS
+
+
+RUNNING_MODE_VIDEO = "video"
+RUNNING_MODE_IMAGE = "image"
+
+POOL_MODE_THREAD = "thread"
+POOL_MODE_PROCESS = "process"
+
+
+def create_landmarker(model_path: str, running_mode: str,
+                      min_detection_confidence: float, min_tracking_confidence: float):
+    """
+    Create a MediaPipe PoseLandmarker.
+
+    Args:
+        model_path: Path to the .task model
+        running_mode: RUNNING_MODE_VIDEO or RUNNING_MODE_IMAGE
+        min_detection_confidence: Minimum confidence for detection
+        min_tracking_confidence: Minimum confidence for tracking
+
+    Returns:
+        PoseLandmarker instance
+    """
+    # MediaPipe is imported on first use (slow import, not needed by every backend)
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
+    base_options = python.BaseOptions(model_asset_path=str(model_path))
+    mode = vision.RunningMode.VIDEO if running_mode == RUNNING_MODE_VIDEO else vision.RunningMode.IMAGE
+    options = vision.PoseLandmarkerOptions(
+        base_options=base_options,
+        running_mode=mode,
+        min_pose_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+        output_segmentation_masks=False
+    )
+    return vision.PoseLandmarker.create_from_options(options)
+
+
+class MediaPipeWorker:
+    """
+    One landmarker plus the per-caller state it needs.
+    Not thread-safe: one caller at a time.
+    """
+
+    model = "mediapipe"
+
+    def __init__(self, landmarker, running_mode: str):
+        self.landmarker = landmarker
+        self.running_mode = running_mode
+        self.letterbox = LetterboxBuffer()
+        self._last_timestamp_ms = -1
+        import mediapipe
+        self._mp = mediapipe  # Already imported by create_landmarker()
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Run the landmarker on a BGR frame.
+
+        Args:
+            frame: BGR image
+            timestamp_ms: Capture timestamp; required for tracking in video mode
+
+        Returns:
+            (17, 5) PoseFrame data in frame pixel coordinates, or None if no pose
+        """
+        # MediaPipe Tasks API prefers square images to avoid "NORM_RECT" warnings
+        # and coordinate projection issues on some platforms: letterbox into a
+        # persistent RGB buffer (one conversion, no per-frame allocations).
+        letterbox = self.letterbox
+        mp = self._mp
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=letterbox.prepare(frame))
+
+        if self.running_mode == RUNNING_MODE_VIDEO and timestamp_ms is not None:
+            # detect_for_video requires strictly increasing timestamps
+            timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            result = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        else:
+            result = self.landmarker.detect(mp_image)
+
+        if not result.pose_landmarks or len(result.pose_landmarks) == 0:
+            return None
+        landmarks = result.pose_landmarks[0]
+
+        # landmark.x/y are 0..1 in the letterboxed (square) image
+        data = np.zeros((NUM_KEYPOINTS, NUM_COLUMNS), dtype=np.float32)
+        rows = [(lm.x, lm.y, lm.z, getattr(lm, 'visibility', 1.0), 1.0)
+                for lm in (landmarks[i] for i in MEDIAPIPE_INDICES if i < len(landmarks))]
+        data[:len(rows)] = rows
+        letterbox.to_frame_coordinates(data[:len(rows), :2])
+        return data
+
+    def close(self):
+        """Close the landmarker (idempotent)."""
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+
+
+# ==================== Process workers ====================
+
+_process_worker: Optional[MediaPipeWorker] = None
+
+
+def _process_init(model_path: str, running_mode: str,
+                  min_detection_confidence: float, min_tracking_confidence: float):
+    """Worker process initializer: build the process-local landmarker."""
+    global _process_worker
+    landmarker = create_landmarker(model_path, running_mode, min_detection_confidence, min_tracking_confidence)
+    _process_worker = MediaPipeWorker(landmarker, running_mode)
+
+
+def _process_detect(frame: np.ndarray, timestamp_ms: Optional[int]) -> Optional[np.ndarray]:
+    return _process_worker.detect(frame, timestamp_ms)
+
+
+class ProcessWorker:
+    """
+    MediaPipeWorker living in a dedicated process (same detect() interface).
+    Sidesteps the GIL for the Python parts of inference at the cost of one
+    frame copy per call.
+    """
+
+    model = "mediapipe"
+
+    def __init__(self, model_path: str, running_mode: str,
+                 min_detection_confidence: float, min_tracking_confidence: float):
+        self.running_mode = running_mode
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_process_init,
+            initargs=(str(model_path), running_mode, min_detection_confidence, min_tracking_confidence)
+        )
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        return self._executor.submit(_process_detect, frame, timestamp_ms).result()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ==================== Pool ====================
+
+class InferencePool:
+    """
+    N inference workers fed round-robin.
+
+    Each worker has a single-slot queue; submit() hands a frame lease to the
+    next worker whose slot is free and never backlogs. handler(worker, lease)
+    runs on that worker's thread; the lease is released afterwards.
+    """
+
+    def __init__(self, workers: List[Any], handler: Callable[[Any, Any], None]):
+        """
+        Initialize and start the pool.
+
+        Args:
+            workers: Per-thread inference state passed to the handler
+                (e.g. MediaPipeWorker / ProcessWorker)
+            handler: Called as handler(worker, lease) for every frame
+        """
+        self.workers = workers
+        self._handler = handler
+        self._queues = [queue.Queue(maxsize=1) for _ in workers]
+        self._next = 0
+        self._active = True
+        self.dispatched = 0
+        self.processed = [0] * len(workers)
+        self._threads = [
+            threading.Thread(target=self._run, args=(i,), daemon=True, name=f"pose-worker-{i}")
+            for i in range(len(workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def size(self) -> int:
+        return len(self.workers)
+
+    def has_capacity(self) -> bool:
+        """True if some worker can take a frame right now."""
+        return any(q.empty() for q in self._queues)
+
+    def submit(self, lease) -> bool:
+        """
+        Queue a frame lease on the next free worker (round-robin).
+
+        Returns:
+            False if every worker slot is taken (the caller keeps the lease)
+        """
+        n = len(self._queues)
+        for k in range(n):
+            i = (self._next + k) % n
+            try:
+                self._queues[i].put_nowait(lease)
+            except queue.Full:
+                continue
+            self._next = (i + 1) % n
+            self.dispatched += 1
+            return True
+        return False
+
+    def _run(self, index: int):
+        print(f"[POSE] Inference worker {index} started")
+        worker = self.workers[index]
+        q = self._queues[index]
+        while self._active:
+            try:
+                lease = q.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                with lease:
+                    self._handler(worker, lease)
+                self.processed[index] += 1
+            except Exception as e:
+                print(f"[POSE] Worker {index} error: {e}")
+                time.sleep(0.1)
+        print(f"[POSE] Inference worker {index} stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.size,
+            "dispatched": self.dispatched,
+            "processed": list(self.processed),
+        }
+
+    def close(self, timeout: float = 2.0):
+        """Stop the worker threads and close the workers."""
+        self._active = False
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
+        for worker in self.workers:
+            if worker is not None:
+                worker.close()
+        # Release leases still waiting in the queues
+        for q in self._queues:
+            try:
+                q.get_nowait().release()
+            except queue.Empty:
+                pass
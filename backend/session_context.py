@@ -0,0 +1,118 @@
+"""
+Per-connection state of the /ws endpoint.
+Each WebSocket client gets its own SessionContext: exercise engine (rep
+counts, phases, LSTM feature window), feedback throttle and hardware workout
+counters, so concurrent trainees do not overwrite each other. Stateless model
+sessions (LSTM runtime, scaler, ONNX models) and the physical hardware stay
+shared module-level components.
+
+The per-frame engine step runs off the event loop, on the session's own
+single-thread lane: steps of one session stay ordered, and a slow step (LSTM
+inference) never stalls the other sockets, /video_feed or REST calls.
+"""
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from exercise_engine import ExerciseEngine
+from hardware_manager import HardwareManager, get_hardware_manager
+
+FEEDBACK_REPEAT_SECONDS = 3.0  # Same message re-sent at most this often
+
+
+class FeedbackThrottle:
+    """Last feedback message sent to one client, and when."""
+
+    def __init__(self, repeat_seconds: float = FEEDBACK_REPEAT_SECONDS):
+        self.repeat_seconds = repeat_seconds
+        self.last_message: Optional[str] = ""
+        self.last_time = 0.0
+
+    def reset(self):
+        """Forget the last message (next one is sent immediately)."""
+        self.last_message = None
+        self.last_time = 0.0
+
+    def should_send(self, message: str, now: float) -> bool:
+        # Immediate on a new message (e.g. clearing a warning), throttled when repeated
+        return message != self.last_message or now - self.last_time > self.repeat_seconds
+
+    def mark_sent(self, message: str, now: float):
+        self.last_message = message
+        self.last_time = now
+
+
+class SessionLane:
+    """One ordered worker thread; run() awaits fn(*args) on it."""
+
+    _ids = itertools.count()
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or f"session-{next(self._ids)}"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+        self.steps = 0
+        self.busy_seconds = 0.0
+
+    def _timed(self, fn: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+            self.steps += 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._timed, fn, *args, **kwargs))
+
+    def close(self):
+        """Finish the queued steps in the background; no new ones accepted."""
+        self._executor.shutdown(wait=False)
+
+
+class SessionContext:
+    """State owned by one WebSocket connection."""
+
+    def __init__(self, client_key: Any, hardware_manager: Optional[HardwareManager] = None):
+        self.client_key = client_key
+        self.engine = ExerciseEngine()
+        self.feedback = FeedbackThrottle()
+        self.hardware = (hardware_manager or get_hardware_manager()).create_session()
+        self.lane = SessionLane()
+        self.created_at = time.time()
+        with _sessions_lock:
+            _sessions[client_key] = self
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run fn (e.g. engine.update) on this session's lane and await its result."""
+        return await self.lane.run(fn, *args, **kwargs)
+
+    def close(self):
+        """Stop the hardware workout and the lane, and unregister (idempotent)."""
+        self.hardware.stop_session()
+        self.lane.close()
+        with _sessions_lock:
+            if _sessions.get(self.client_key) is self:
+                del _sessions[self.client_key]
+
+
+_sessions: Dict[Any, SessionContext] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """Open sessions (for /status)."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+    now = time.time()
+    return {
+        "active": len(sessions),
+        "exercising": sum(1 for s in sessions if s.hardware.counters.is_exercising),
+        "oldest_seconds": int(now - min((s.created_at for s in sessions), default=now)),
+        "engine_steps": sum(s.lane.steps for s in sessions),
+        "engine_busy_seconds": round(sum(s.lane.busy_seconds for s in sessions), 2),
+    }
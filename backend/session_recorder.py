@@ -0,0 +1,265 @@
+"""
+Compact binary recording of the pose pipeline's result stream.
+Every published result (capture timestamp, backend, keypoint array,
+visibility, joint angles) is appended to one file that replays without a
+camera: benchmarks and accuracy checks run on what the pipeline actually saw.
+
+File layout (little endian, memory-mappable):
+    [0:8]     magic b"POSEREC1"
+    [8:16]    committed record count (uint64), updated after the records
+    [16:20]   metadata length (uint32)
+    [20:...]  metadata JSON (capacity, columns, backends, angle names), padded to HEADER_SIZE
+    then one fixed-width column per field, each (capacity, ...) and 64-byte aligned
+
+The file is preallocated (sparse) for `capacity` records, so columns never
+move and readers get zero-copy NumPy views. The producer only copies the
+(17, 5) keypoint array into a queue; a background thread writes the columns.
+"""
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from joint_angles import DETECTOR_ANGLE_NAMES
+from pose_frame import NUM_COLUMNS, NUM_KEYPOINTS, PRESENT, VISIBILITY, PoseFrame
+
+MAGIC = b"POSEREC1"
+HEADER_SIZE = 4096
+COUNT_OFFSET = 8
+META_OFFSET = 20
+COLUMN_ALIGN = 64
+
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+DEFAULT_CAPACITY = 30 * 60 * 60  # One hour at 30 Hz (the file is sparse until written)
+DEFAULT_QUEUE_SIZE = 256
+
+
+def _column_specs(num_angles: int):
+    """(name, dtype, per-record shape) of every column, in file order."""
+    return (
+        ("capture_ts_ms", "<i8", ()),
+        ("backend", "u1", ()),  # Index into metadata "backends"
+        ("width", "<u2", ()),
+        ("height", "<u2", ()),
+        ("keypoints", "<f4", (NUM_KEYPOINTS, NUM_COLUMNS)),
+        ("visibility", "<f4", ()),  # Mean over present keypoints
+        ("angles", "<f4", (num_angles,)),  # NaN when the joints were missing
+    )
+
+
+def _layout(capacity: int, num_angles: int):
+    """Column table for the metadata and the total file size."""
+    columns, offset = [], HEADER_SIZE
+    for name, dtype, shape in _column_specs(num_angles):
+        offset = -(-offset // COLUMN_ALIGN) * COLUMN_ALIGN
+        columns.append({"name": name, "dtype": dtype, "shape": list(shape), "offset": offset})
+        offset += capacity * np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+    return columns, offset
+
+
+def _map_columns(mm: np.memmap, meta: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    capacity = meta["capacity"]
+    views = {}
+    for column in meta["columns"]:
+        dtype = np.dtype(column["dtype"])
+        shape = (capacity,) + tuple(column["shape"])
+        size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        start = column["offset"]
+        views[column["name"]] = mm[start:start + size].view(dtype).reshape(shape)
+    return views
+
+
+class SessionRecorder:
+    """
+    Append-only writer of one recording.
+    record() is safe to call from the pipeline threads; frames are dropped
+    (and counted) rather than blocking when the writer falls behind or the
+    file is full.
+    """
+
+    def __init__(self, path: Union[str, Path], capacity: int = DEFAULT_CAPACITY,
+                 angle_names: Sequence[str] = DETECTOR_ANGLE_NAMES, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.angle_names = tuple(angle_names)
+        self._angle_index = {name: i for i, name in enumerate(self.angle_names)}
+        columns, size = _layout(capacity, len(self.angle_names))
+        self._meta = {
+            "version": 1,
+            "capacity": capacity,
+            "created": time.time(),
+            "angle_names": list(self.angle_names),
+            "backends": [],
+            "columns": columns,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.truncate(size)  # Sparse: disk is used as records are written
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(size,))
+        self._mm[:len(MAGIC)] = np.frombuffer(MAGIC, dtype=np.uint8)
+        self._write_meta()
+        self._count_view = self._mm[COUNT_OFFSET:COUNT_OFFSET + 8].view("<u8")
+        self._columns = _map_columns(self._mm, self._meta)
+
+        self.count = 0
+        self.dropped = 0
+        self.started_at = time.time()
+        self._closed = False
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="pose-recorder", daemon=True)
+        self._thread.start()
+
+    def _write_meta(self):
+        data = json.dumps(self._meta).encode()
+        if META_OFFSET + len(data) > HEADER_SIZE:
+            raise ValueError("Recording metadata does not fit in the header")
+        self._mm[16:20].view("<u4")[0] = len(data)
+        self._mm[META_OFFSET:META_OFFSET + len(data)] = np.frombuffer(data, dtype=np.uint8)
+
+    def record(self, pose: PoseFrame, angles: Mapping[str, float], backend: str, capture_ts_ms: int) -> bool:
+        """Queue one result for writing (False if dropped)."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((capture_ts_ms, backend, pose.data.copy(), pose.width, pose.height, angles))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _backend_id(self, backend: str) -> int:
+        backends = self._meta["backends"]
+        if backend not in backends:
+            backends.append(backend)
+            self._write_meta()
+        return backends.index(backend)
+
+    def _write(self, item):
+        i = self.count
+        if i >= self.capacity:
+            self.dropped += 1
+            return
+        capture_ts_ms, backend, data, width, height, angles = item
+        columns = self._columns
+        columns["capture_ts_ms"][i] = capture_ts_ms
+        columns["backend"][i] = self._backend_id(backend)
+        columns["width"][i] = width
+        columns["height"][i] = height
+        columns["keypoints"][i] = data
+        present = data[:, PRESENT] > 0
+        columns["visibility"][i] = data[present, VISIBILITY].mean() if present.any() else 0.0
+        row = columns["angles"][i]
+        row[:] = np.nan
+        for name, value in angles.items():
+            index = self._angle_index.get(name)
+            if index is not None:
+                row[index] = value
+        self.count = i + 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._write(item)
+            # Publish the count once per drained burst, after the records themselves
+            if self._queue.empty():
+                self._count_view[0] = self.count
+        self._count_view[0] = self.count
+
+    def close(self):
+        """Write the queued frames, flush and close the file (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._mm.flush()
+        self._columns = {}
+        self._count_view = None
+        self._mm = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "frames": self.count,
+            "dropped": self.dropped,
+            "capacity": self.capacity,
+            "seconds": round(time.time() - self.started_at, 1),
+            "recording": not self._closed,
+        }
+
+
+class SessionRecording:
+    """
+    Read-only view of a recording (complete, or still being written).
+    Column properties are zero-copy views of the mapped file, trimmed to the
+    committed record count.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._mm[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path} is not a pose recording")
+        length = int(self._mm[16:20].view("<u4")[0])
+        self.meta = json.loads(bytes(self._mm[META_OFFSET:META_OFFSET + length]))
+        self.angle_names = tuple(self.meta["angle_names"])
+        self.backends = tuple(self.meta["backends"])
+        self._columns = _map_columns(self._mm, self.meta)
+
+    def __len__(self) -> int:
+        return int(self._mm[COUNT_OFFSET:COUNT_OFFSET + 8].view("<u8")[0])
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][:len(self)]
+
+    @property
+    def capture_ts_ms(self) -> np.ndarray:
+        return self.column("capture_ts_ms")
+
+    @property
+    def backend(self) -> np.ndarray:
+        """Backend index per frame (see backends)."""
+        return self.column("backend")
+
+    @property
+    def keypoints(self) -> np.ndarray:
+        """(n, 17, 5) keypoint arrays (PoseFrame columns)."""
+        return self.column("keypoints")
+
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.column("visibility")
+
+    @property
+    def angles(self) -> np.ndarray:
+        """(n, angles) in angle_names order, NaN when missing."""
+        return self.column("angles")
+
+    def angle(self, name: str) -> np.ndarray:
+        """One angle over the recording (strided view)."""
+        return self.angles[:, self.angle_names.index(name)]
+
+    def pose(self, index: int) -> PoseFrame:
+        """Frame `index` as a PoseFrame (a copy: PoseFrame methods work in place)."""
+        return PoseFrame(self._columns["keypoints"][index].copy(),
+                         int(self._columns["width"][index]), int(self._columns["height"][index]))
+
+    def pose_angles(self, index: int) -> Dict[str, float]:
+        """Angles of frame `index` as the detector's dict (missing ones left out)."""
+        row = self._columns["angles"][index]
+        return {name: float(v) for name, v in zip(self.angle_names, row) if not np.isnan(v)}
+
+    def duration_seconds(self) -> float:
+        ts = self.capture_ts_ms
+        return float(ts[-1] - ts[0]) / 1000.0 if len(ts) > 1 else 0.0
+
+
+def default_recording_path() -> Path:
+    return RECORDINGS_DIR / time.strftime("session_%Y%m%d_%H%M%S.poserec")
@@ -0,0 +1,42 @@
+"""
+Tests for the primary / fallback backend circuit breaker.
+Run from backend dir:  python -m pytest tests/test_backend_health.py
+"""
+from backend_health import FallbackController, ROLE_PRIMARY, ROLE_FALLBACK
+
+
+def run(controller, frames, primary_ok, fallback_ok):
+    """Feed frames; returns how many ran on each role."""
+    counts = {ROLE_PRIMARY: 0, ROLE_FALLBACK: 0}
+    for _ in range(frames):
+        role = controller.choose()
+        counts[role] += 1
+        ok = primary_ok if role == ROLE_PRIMARY else fallback_ok
+        controller.record(role, ok, 10.0)
+    return counts
+
+
+def test_probes_without_switching_when_both_fail():
+    controller = FallbackController("yolo", "mediapipe", min_samples=10, probe_interval=5)
+    counts = run(controller, 100, primary_ok=False, fallback_ok=False)
+    # Empty scene: one inference per frame, no flapping
+    assert counts[ROLE_FALLBACK] == 20 and counts[ROLE_PRIMARY] == 80
+    assert controller.switches == 0
+
+
+def test_switches_after_sustained_failure_and_back():
+    controller = FallbackController("yolo", "mediapipe", min_samples=10, probe_interval=5, min_probes=2)
+    run(controller, 60, primary_ok=False, fallback_ok=True)
+    stats = controller.get_stats()
+    assert stats["active"] == "mediapipe" and stats["switches"] == 1
+
+    # Primary recovers: probes bring it back
+    run(controller, 200, primary_ok=True, fallback_ok=True)
+    stats = controller.get_stats()
+    assert stats["active"] == "yolo" and stats["switches"] == 2
+
+
+def test_primary_only():
+    controller = FallbackController("mediapipe_full", None)
+    assert run(controller, 20, primary_ok=False, fallback_ok=True)[ROLE_FALLBACK] == 0
+    assert controller.get_stats()["switches"] == 0
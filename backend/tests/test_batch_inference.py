@@ -0,0 +1,186 @@
+"""
+Tests for cross-session micro-batching of the form classifier (fake classifiers).
+Run from backend dir:  python -m pytest tests/test_batch_inference.py
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from batch_inference import BatchInferenceService, LatencyHistogram
+from form_classifier import TFLiteFormClassifier
+
+
+class BatchClassifier:
+    """Probabilities = first row of the window; records batch sizes."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def predict_batch(self, windows):
+        self.batches.append(len(windows))
+        time.sleep(self.delay)
+        return windows[:, 0, :8].copy()
+
+
+class SingleClassifier:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, window):
+        self.calls += 1
+        return window[0, :8].copy()
+
+
+def window(value):
+    return np.full((20, 15), value, dtype=np.float32)
+
+
+def test_concurrent_submits_are_batched_and_routed():
+    classifier = BatchClassifier()
+    service = BatchInferenceService(classifier, max_batch=4, deadline_ms=50)
+    try:
+        results = {}
+
+        def session(i):
+            results[i] = service.submit(window(i)).result(timeout=2)
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i in range(8):
+            np.testing.assert_array_equal(results[i], np.full(8, i))
+        assert max(classifier.batches) > 1
+        assert sum(classifier.batches) == 8
+        stats = service.get_stats()
+        assert stats["windows"] == 8 and stats["batch_latency"]["samples"] == stats["batches"]
+    finally:
+        service.close()
+
+
+def test_lone_window_runs_after_deadline():
+    service = BatchInferenceService(BatchClassifier(), max_batch=8, deadline_ms=5)
+    try:
+        start = time.perf_counter()
+        result = service.submit(window(3)).result(timeout=1)
+        assert time.perf_counter() - start < 0.5
+        np.testing.assert_array_equal(result, np.full(8, 3))
+    finally:
+        service.close()
+
+
+def test_submit_copies_the_window():
+    service = BatchInferenceService(BatchClassifier(delay=0.01), max_batch=2, deadline_ms=20)
+    try:
+        data = window(1)
+        future = service.submit(data)
+        data[:] = 9  # Ring view overwritten by the next frame
+        np.testing.assert_array_equal(future.result(timeout=1), np.full(8, 1))
+    finally:
+        service.close()
+
+
+def test_classifier_without_batch_support_is_looped():
+    classifier = SingleClassifier()
+    service = BatchInferenceService(classifier, max_batch=4, deadline_ms=20)
+    try:
+        futures = [service.submit(window(i)) for i in range(4)]
+        for i, future in enumerate(futures):
+            np.testing.assert_array_equal(future.result(timeout=1), np.full(8, i))
+        assert classifier.calls == 4
+    finally:
+        service.close()
+
+
+class OverlapInterpreter:
+    """TFLite interpreter stub: output = input row 0; counts overlapping invokes."""
+
+    def __init__(self):
+        self.buffers = {}
+        self.active = 0
+        self.overlaps = 0
+
+    def allocate_tensors(self):
+        self.buffers = {0: np.zeros((1, 20, 15), dtype=np.float32), 1: np.zeros((1, 8), dtype=np.float32)}
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array([1, 20, 15])}]
+
+    def get_output_details(self):
+        return [{"index": 1, "shape": np.array([1, 8])}]
+
+    def tensor(self, index):
+        return lambda: self.buffers[index]
+
+    def invoke(self):
+        self.active += 1
+        if self.active > 1:
+            self.overlaps += 1
+        time.sleep(0.0005)  # Widen the window for a concurrent caller
+        self.buffers[1][0] = self.buffers[0][0, 0, :8]
+        self.active -= 1
+
+
+def test_service_and_direct_predict_share_the_classifier():
+    interpreter = OverlapInterpreter()
+    classifier = TFLiteFormClassifier(interpreter)
+    service = BatchInferenceService(classifier, max_batch=4, deadline_ms=2)
+    errors = []
+
+    def batched(offset):
+        for i in range(20):
+            value = offset + i
+            if not np.array_equal(service.submit(window(value)).result(timeout=2), np.full(8, value)):
+                errors.append(("batched", value))
+
+    def direct(offset):
+        for i in range(20):
+            value = offset + i
+            if not np.array_equal(classifier.predict(window(value)), np.full(8, value)):
+                errors.append(("direct", value))
+
+    threads = [threading.Thread(target=batched, args=(100 * k,)) for k in range(3)]
+    threads += [threading.Thread(target=direct, args=(1000 + 100 * k,)) for k in range(2)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        service.close()
+    assert not errors
+    assert interpreter.overlaps == 0
+
+
+def test_errors_reach_every_caller():
+    class Broken:
+        def predict_batch(self, windows):
+            raise ValueError("boom")
+
+    service = BatchInferenceService(Broken(), max_batch=2, deadline_ms=1)
+    try:
+        with pytest.raises(ValueError):
+            service.submit(window(0)).result(timeout=1)
+        assert service.get_stats()["errors"] == 1
+    finally:
+        service.close()
+
+
+def test_closed_service_rejects_submits():
+    service = BatchInferenceService(BatchClassifier(), max_batch=2, deadline_ms=1)
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.submit(window(0)).result(timeout=1)
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram((1, 5))
+    for latency in (0.5, 1.0, 3.0, 7.0):
+        histogram.record(latency)
+    stats = histogram.to_dict()
+    assert stats["buckets_ms"] == {"<=1": 2, "<=5": 1, ">5": 1}
+    assert stats["samples"] == 4 and stats["mean_ms"] == pytest.approx(2.875)
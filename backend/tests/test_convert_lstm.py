@@ -0,0 +1,58 @@
+"""
+Tests for the conversion report helpers (no TensorFlow needed).
+Run from backend dir:  python -m pytest tests/test_convert_lstm.py
+"""
+import numpy as np
+import pytest
+
+from convert_lstm import load_windows, parity_stats, pick_smallest, split_calibration
+
+
+def test_load_windows_npy_and_npz(tmp_path):
+    windows = np.random.default_rng(0).normal(size=(6, 20, 15))
+    np.save(tmp_path / "w.npy", windows)
+    loaded, labels = load_windows(tmp_path / "w.npy")
+    assert loaded.dtype == np.float32 and labels is None
+    np.savez(tmp_path / "w.npz", windows=windows, labels=np.arange(6))
+    loaded, labels = load_windows(tmp_path / "w.npz")
+    np.testing.assert_allclose(loaded, windows, rtol=1e-6)
+    np.testing.assert_array_equal(labels, np.arange(6))
+    np.save(tmp_path / "bad.npy", windows[:, :10])
+    with pytest.raises(ValueError):
+        load_windows(tmp_path / "bad.npy")
+
+
+def test_load_windows_rejects_empty_dataset(tmp_path):
+    np.save(tmp_path / "empty.npy", np.zeros((0, 20, 15)))
+    with pytest.raises(ValueError, match="no windows"):
+        load_windows(tmp_path / "empty.npy")
+
+
+def test_split_keeps_calibration_out_of_evaluation():
+    calibration, held_out = split_calibration(np.zeros((100, 20, 15)), 20)
+    assert len(calibration) == 20 and len(held_out) == 80
+    assert not set(calibration) & set(held_out)
+    # Too few windows: evaluate on everything
+    _, held_out = split_calibration(np.zeros((30, 20, 15)), 20)
+    assert len(held_out) == 30
+
+
+def test_parity_stats():
+    reference = np.array([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4]])
+    actual = np.array([[0.8, 0.2], [0.3, 0.7], [0.4, 0.6]])
+    stats = parity_stats(reference, actual, labels=np.array([0, 1, 0]))
+    assert stats["max_abs_diff"] == pytest.approx(0.2)
+    assert stats["top1_agreement"] == pytest.approx(2 / 3)
+    assert stats["accuracy"] == pytest.approx(2 / 3)
+
+
+def test_pick_smallest_respects_agreement():
+    report = {
+        "keras": {"size_kb": 10.0},
+        "fp32": {"size_kb": 400.0, "top1_agreement": 1.0},
+        "fp16": {"size_kb": 200.0, "top1_agreement": 0.998},
+        "full_int8": {"size_kb": 110.0, "top1_agreement": 0.95},
+    }
+    assert pick_smallest(report, 0.99) == "fp16"
+    assert pick_smallest(report, 0.9) == "full_int8"
+    assert pick_smallest(report, 1.01) is None
@@ -0,0 +1,63 @@
+"""
+Tests for the exercise engine's form classifier plumbing (fake classifier, no model files).
+Run from backend dir:  python -m pytest tests/test_exercise_engine.py
+"""
+import numpy as np
+
+import exercise_engine
+from exercise_engine import ExerciseType
+from feature_window import FeatureScaler
+from lazy_loader import LazyComponent
+
+
+def test_lstm_available_before_loading(tmp_path, monkeypatch):
+    monkeypatch.setattr(exercise_engine, "form_classifier_component", LazyComponent("form_classifier", lambda: None))
+    monkeypatch.setattr(exercise_engine, "ONNX_MODEL_PATH", tmp_path / "model.onnx")
+    monkeypatch.setattr(exercise_engine, "TFLITE_MODEL_PATHS", [tmp_path / "model.tflite"])
+    monkeypatch.setattr(exercise_engine, "lstm_path", tmp_path / "model.h5")
+    assert not exercise_engine.lstm_available()  # Nothing to load
+    (tmp_path / "model.tflite").write_bytes(b"")
+    assert exercise_engine.lstm_available()  # Still loading
+    exercise_engine.form_classifier_component.get()
+    assert not exercise_engine.lstm_available()  # Loaded, but no classifier came out
+
+
+class RecordingClassifier:
+    """Always "Squat Shallow"; keeps the windows it was called with."""
+
+    def __init__(self):
+        self.windows = []
+
+    def predict(self, window):
+        self.windows.append(window.copy())
+        probs = np.zeros(8, dtype=np.float32)
+        probs[3] = 1.0
+        return probs
+
+
+def test_process_keypoints_classifies_once_per_rep(monkeypatch):
+    classifier = RecordingClassifier()
+    classifier_component = LazyComponent("form_classifier", lambda: classifier)
+    scaler_component = LazyComponent("scaler", lambda: FeatureScaler(np.zeros(15), np.ones(15)))
+    classifier_component.get()
+    scaler_component.get()
+    monkeypatch.setattr(exercise_engine, "form_classifier_component", classifier_component)
+    monkeypatch.setattr(exercise_engine, "scaler_component", scaler_component)
+    monkeypatch.setattr(exercise_engine, "CLASSIFIER_MODE", "rep")
+
+    engine = exercise_engine.ExerciseEngine()
+    engine.state.current_type = ExerciseType.SQUAT
+    engine.thresholds.min_rep_duration = 0.0
+    knee = {"value": 170.0}
+    monkeypatch.setattr(engine, "_calculate_angles", lambda keypoints: {"left_knee": knee["value"], "right_knee": knee["value"]})
+    monkeypatch.setattr(engine, "_calculate_features", lambda keypoints: np.full(15, knee["value"], dtype=np.float32))
+
+    # UP, down into the squat and back up: one rep
+    for value in [170.0] * 3 + [120.0] * 2 + [70.0] * 3 + [120.0] * 2 + [170.0]:
+        knee["value"] = value
+        result = engine.process_keypoints({})
+    assert result["rep_count"] == 1
+    assert len(classifier.windows) == 1  # The rep, not the sliding window
+    trajectory = classifier.windows[0][:, 0]
+    assert trajectory[0] == 170.0 and trajectory.min() == 70.0 and trajectory[-1] == 170.0
+    assert result["ml_label"] == "Squat Shallow" and "squat_shallow" in result["feedback_codes"]
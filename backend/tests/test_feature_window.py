@@ -0,0 +1,122 @@
+"""
+Tests for the preallocated LSTM feature window and the numpy feature scaler.
+Run from backend dir:  python -m pytest tests/test_feature_window.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+from feature_window import FeatureScaler, FeatureWindow, RepTrajectory, load_feature_scaler
+
+
+def make_scaler(features=15, seed=0):
+    rng = np.random.default_rng(seed)
+    return FeatureScaler(rng.normal(size=features), rng.uniform(0.5, 2.0, size=features))
+
+
+def test_window_keeps_last_rows_oldest_first():
+    window = FeatureWindow(4, 3)
+    rows = [np.full(3, i, dtype=np.float32) for i in range(10)]
+    for i, row in enumerate(rows):
+        window.push(row)
+        expected = np.array(rows[max(0, i - 3):i + 1])
+        np.testing.assert_array_equal(window.view(), expected)
+        np.testing.assert_array_equal(window.latest(), row)
+    assert window.full and len(window) == 4
+
+
+def test_view_is_contiguous_and_reuses_the_buffer():
+    window = FeatureWindow(20, 15)
+    rng = np.random.default_rng(1)
+    base = None
+    for _ in range(47):
+        window.push(rng.normal(size=15))
+        view = window.view()
+        assert view.flags["C_CONTIGUOUS"]
+        base = base if base is not None else view.base
+        assert view.base is base  # No new array per frame
+
+
+def test_clear():
+    window = FeatureWindow(3, 2)
+    for i in range(5):
+        window.push(np.full(2, i))
+    window.clear()
+    assert len(window) == 0 and not window.full
+    window.push(np.ones(2))
+    np.testing.assert_array_equal(window.view(), [[1.0, 1.0]])
+
+
+def test_push_scales_on_insert():
+    scaler = make_scaler()
+    window = FeatureWindow(20, 15)
+    raw = np.random.default_rng(2).normal(size=(30, 15))
+    for row in raw:
+        window.push(row, scaler)
+    expected = (raw[-20:] - scaler.mean) / scaler.scale
+    np.testing.assert_allclose(window.view(), expected, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(scaler.transform(raw[-20:]), expected, rtol=1e-5, atol=1e-6)
+
+
+def test_from_sklearn_matches_transform():
+    preprocessing = pytest.importorskip("sklearn.preprocessing")
+    data = np.random.default_rng(3).normal(loc=5.0, scale=3.0, size=(200, 15))
+    for fitted in (preprocessing.StandardScaler().fit(data), preprocessing.MinMaxScaler().fit(data)):
+        scaler = FeatureScaler.from_sklearn(fitted)
+        np.testing.assert_allclose(scaler.transform(data[:20]), fitted.transform(data[:20]), rtol=1e-4, atol=1e-5)
+
+
+def test_load_prefers_npz(tmp_path):
+    scaler = make_scaler()
+    npz = tmp_path / "scaler.npz"
+    scaler.save(npz)
+    loaded = load_feature_scaler(npz, tmp_path / "missing.pkl")
+    np.testing.assert_array_equal(loaded.mean, scaler.mean)
+    np.testing.assert_array_equal(loaded.scale, scaler.scale)
+
+
+def test_load_reconverts_newer_pickle(tmp_path):
+    preprocessing = pytest.importorskip("sklearn.preprocessing")
+    joblib = pytest.importorskip("joblib")
+    npz, pkl = tmp_path / "scaler.npz", tmp_path / "scaler.pkl"
+    make_scaler().save(npz)
+    fitted = preprocessing.StandardScaler().fit(np.random.default_rng(1).normal(size=(50, 15)))
+    joblib.dump(fitted, pkl)
+    stale = npz.stat().st_mtime - 10
+    os.utime(npz, (stale, stale))  # Scaler retrained after the conversion
+    loaded = load_feature_scaler(npz, pkl)
+    np.testing.assert_allclose(loaded.mean, fitted.mean_, rtol=1e-6)
+    np.testing.assert_allclose(FeatureScaler.from_npz(npz).mean, fitted.mean_, rtol=1e-6)
+
+
+def test_rep_trajectory_resamples_linearly():
+    trajectory = RepTrajectory(2)
+    for t in range(11):
+        trajectory.append(np.array([t, 2 * t], dtype=np.float32))
+    out = trajectory.resample(21)
+    np.testing.assert_allclose(out[:, 0], np.linspace(0, 10, 21), atol=1e-5)
+    np.testing.assert_allclose(out[:, 1], np.linspace(0, 20, 21), atol=1e-5)
+    # Shorter target: endpoints kept
+    out = trajectory.resample(3)
+    np.testing.assert_allclose(out[:, 0], [0, 5, 10], atol=1e-5)
+
+
+def test_rep_trajectory_decimates_long_reps():
+    trajectory = RepTrajectory(1, max_frames=8)
+    for t in range(40):
+        trajectory.append(np.array([t], dtype=np.float32))
+    assert len(trajectory) <= 8
+    out = trajectory.resample(5)[:, 0]
+    assert out[0] == 0.0 and out[-1] >= 32  # Still spans the whole rep
+    assert np.all(np.diff(out) > 0)
+
+
+def test_rep_trajectory_keep_last():
+    trajectory = RepTrajectory(1)
+    for t in range(5):
+        trajectory.append(np.array([t], dtype=np.float32))
+    trajectory.keep_last()
+    assert len(trajectory) == 1
+    trajectory.append(np.array([9.0], dtype=np.float32))
+    np.testing.assert_allclose(trajectory.resample(3)[:, 0], [4.0, 6.5, 9.0])
@@ -0,0 +1,80 @@
+"""
+Tests for the TFLite form classifier wrapper (fake interpreter, no runtime needed).
+Run from backend dir:  python -m pytest tests/test_form_classifier.py
+"""
+import numpy as np
+
+from form_classifier import TFLiteFormClassifier
+
+
+class FakeInterpreter:
+    """Input (1, 20, 15) float32 -> output (1, 8): softmax of per-class sums."""
+
+    def __init__(self):
+        self.buffers = {0: None, 1: None}
+        self.invokes = 0
+
+    def allocate_tensors(self):
+        self.buffers = {0: np.zeros((1, 20, 15), dtype=np.float32), 1: np.zeros((1, 8), dtype=np.float32)}
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array([1, 20, 15]), "dtype": np.float32}]
+
+    def get_output_details(self):
+        return [{"index": 1, "shape": np.array([1, 8]), "dtype": np.float32}]
+
+    def tensor(self, index):
+        return lambda: self.buffers[index]
+
+    def invoke(self):
+        self.invokes += 1
+        logits = self.buffers[0][0, :, :8].sum(axis=0)
+        e = np.exp(logits - logits.max())
+        self.buffers[1][0] = e / e.sum()
+
+
+def test_predict_writes_input_in_place():
+    interpreter = FakeInterpreter()
+    classifier = TFLiteFormClassifier(interpreter)
+    input_buffer = interpreter.buffers[0]
+
+    window = np.zeros((20, 15))
+    window[:, 3] = 1.0
+    probs = classifier.predict(window)
+    assert interpreter.buffers[0] is input_buffer  # Same tensor, no reallocation
+    assert input_buffer.dtype == np.float32 and np.allclose(input_buffer[0], window)
+    assert int(np.argmax(probs)) == 3 and np.isclose(probs.sum(), 1.0)
+
+    # The result is a copy: the next invoke does not change it
+    window[:, 3], window[:, 5] = 0.0, 1.0
+    probs2 = classifier.predict(window)
+    assert int(np.argmax(probs)) == 3 and int(np.argmax(probs2)) == 5
+    assert interpreter.invokes == 2
+
+
+def test_onnx_classifier_iobinding(tmp_path):
+    from onnxruntime.datasets import get_example
+    from form_classifier import OnnxFormClassifier
+    from onnx_sessions import create_session, optimized_cache_path
+
+    model = get_example("sigmoid.onnx")  # x (3, 4, 5) -> sigmoid(x)
+    classifier = OnnxFormClassifier(create_session(model, cache_dir=tmp_path))
+    assert optimized_cache_path(model, tmp_path).exists()
+
+    window = np.full((4, 5), 2.0)
+    assert np.allclose(classifier.predict(window), 1 / (1 + np.exp(-2.0)))
+    assert np.allclose(classifier.predict(np.zeros((4, 5))), 0.5)
+
+    # Second session loads the cached optimized graph
+    cached = OnnxFormClassifier(create_session(model, cache_dir=tmp_path))
+    assert np.allclose(cached.predict(window), 1 / (1 + np.exp(-2.0)))
+
+
+def test_optimized_cache_is_per_host(tmp_path, monkeypatch):
+    import platform
+    from onnx_sessions import optimized_cache_path
+
+    path = optimized_cache_path("models/model.onnx", tmp_path)
+    assert platform.machine() in path.name
+    monkeypatch.setattr(platform, "node", lambda: "another-host")
+    assert optimized_cache_path("models/model.onnx", tmp_path) != path
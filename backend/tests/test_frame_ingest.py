@@ -0,0 +1,43 @@
+"""
+Tests for PC-mode frame ingest (rate limiting, reduced decode, counters).
+Run from backend dir:  python -m pytest tests/test_frame_ingest.py
+"""
+import cv2
+import numpy as np
+
+from frame_ingest import FrameIngest, TokenBucket
+
+
+def encode_jpeg(width: int = 640, height: int = 480) -> bytes:
+    frame = np.full((height, width, 3), 128, dtype=np.uint8)
+    ok, buf = cv2.imencode(".jpg", frame)
+    assert ok
+    return buf.tobytes()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.last = 0.0
+    assert bucket.allow(now=0.0) and bucket.allow(now=0.0)
+    assert not bucket.allow(now=0.05)
+    assert bucket.allow(now=0.15)
+
+
+def test_rate_limit_is_per_client():
+    ingest = FrameIngest(max_fps=10, burst=1)
+    assert ingest.admit("a")
+    assert not ingest.admit("a")
+    assert ingest.admit("b")
+    assert ingest.get_stats()["rate_limited"] == 1
+
+
+def test_decode_at_reduced_size_and_counts_errors():
+    ingest = FrameIngest(reduction=2)
+    frame = ingest.decode(encode_jpeg())
+    assert frame.shape == (240, 320, 3)
+    assert ingest.decode(b"not a jpeg") is None
+
+    stats = ingest.get_stats()
+    assert stats["frames_decoded"] == 1
+    assert stats["decode_errors"] == 1
+    assert stats["decode_ms_avg"] > 0
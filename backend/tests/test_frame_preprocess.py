@@ -0,0 +1,43 @@
+"""
+Tests for the persistent letterbox buffer used by MediaPipe preprocessing.
+Run from backend dir:  python -m pytest tests/test_frame_preprocess.py
+"""
+import cv2
+import numpy as np
+
+from frame_preprocess import LetterboxBuffer, ResizeBuffer
+
+
+def test_prepare_matches_pad_and_convert():
+    frame = np.random.default_rng(0).integers(0, 255, size=(48, 64, 3), dtype=np.uint8)
+    expected = cv2.cvtColor(cv2.copyMakeBorder(frame, 8, 8, 0, 0, cv2.BORDER_CONSTANT, value=[0, 0, 0]),
+                            cv2.COLOR_BGR2RGB)
+
+    letterbox = LetterboxBuffer()
+    first = letterbox.prepare(frame)
+    assert np.array_equal(first, expected)
+
+    # Read-only inputs (ring views) are fine and the buffer is reused
+    frame.flags.writeable = False
+    assert letterbox.prepare(frame) is first
+    assert (letterbox.size, letterbox.pad_w, letterbox.pad_h) == (64, 0, 8)
+
+
+def test_to_frame_coordinates():
+    letterbox = LetterboxBuffer()
+    letterbox.prepare(np.zeros((48, 64, 3), dtype=np.uint8))
+    xy = np.array([[0.5, 0.5], [0.0, 0.125]], dtype=np.float32)
+    assert np.allclose(letterbox.to_frame_coordinates(xy), [[32.0, 24.0], [0.0, 0.0]])
+
+
+def test_resize_buffer_reuses_destination_per_size():
+    frame = np.random.default_rng(1).integers(0, 255, size=(48, 64, 3), dtype=np.uint8)
+    resizer = ResizeBuffer(max_sizes=2)
+    small = resizer.resize(frame, 32, 24)
+    assert np.array_equal(small, cv2.resize(frame, (32, 24), interpolation=cv2.INTER_AREA))
+    assert resizer.resize(frame, 32, 24) is small  # Same size: same buffer
+    other = resizer.resize(frame, 16, 12)
+    assert other.shape == (12, 16, 3) and other is not small
+    assert resizer.resize(frame, 32, 24) is small  # Alternating sizes keep their buffers
+    resizer.resize(frame, 8, 6)  # Third size evicts the oldest
+    assert len(resizer._buffers) == 2
@@ -0,0 +1,71 @@
+"""
+Tests for the zero-copy frame ring used between capture and consumers.
+Run from backend dir:  python -m pytest tests/test_frame_ring.py
+"""
+import numpy as np
+import pytest
+
+from frame_ring import FrameRing
+
+
+def make_frame(value: int) -> np.ndarray:
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+def test_latest_is_read_only_view():
+    ring = FrameRing(num_slots=3)
+    assert ring.latest() == (-1, None)
+
+    frame_id = ring.write(make_frame(7), capture_ts_ms=100)
+    latest_id, view = ring.latest()
+    assert latest_id == frame_id == 1
+    assert view[0, 0, 0] == 7
+    with pytest.raises(ValueError):
+        view[0, 0, 0] = 1
+
+
+def test_in_place_write_reuses_slot_buffers():
+    ring = FrameRing(num_slots=2)
+    ring.write(make_frame(1))
+    ring.write(make_frame(2))
+
+    slot, buf = ring.reserve()
+    assert buf is not None
+    buf[:] = 3  # e.g. cap.read(buf)
+    ring.commit(slot, buf)
+    _, view = ring.latest()
+    assert view.base is buf or np.shares_memory(view, buf)
+    assert view[0, 0, 0] == 3
+
+
+def test_lease_pins_slot_until_released():
+    ring = FrameRing(num_slots=2)
+    ring.write(make_frame(1), capture_ts_ms=10)
+    lease = ring.lease()
+    assert lease.capture_ts_ms == 10
+
+    # One slot pinned, the other becomes latest: no free slot left
+    assert ring.write(make_frame(2)) is not None
+    assert ring.write(make_frame(3)) is None
+    assert ring.dropped_frames == 1
+    assert lease.frame[0, 0, 0] == 1
+
+    lease.release()
+    assert ring.write(make_frame(4)) is not None
+    assert ring.latest()[1][0, 0, 0] == 4
+
+
+def test_detector_get_frame_is_not_overwritten_by_the_ring():
+    from pose_detector import PoseDetector
+
+    detector = PoseDetector.__new__(PoseDetector)
+    detector._frame_ring = FrameRing(num_slots=2)
+    detector.is_running = True
+    detector._frame_ring.write(np.full((2, 2, 3), 1, dtype=np.uint8))
+    frame_id, frame = detector.get_latest_frame()
+    for value in range(2, 6):  # Wraps the ring several times
+        detector._frame_ring.write(np.full((2, 2, 3), value, dtype=np.uint8))
+    assert frame_id == 1 and (frame == 1).all() and frame.flags.writeable
+    assert detector.latest_frame_id == 5 and detector.has_frame()
+    success, frame = detector.get_frame()
+    assert success and (frame == 5).all()
@@ -0,0 +1,50 @@
+"""
+Tests for the adaptive inference-rate governor.
+Run from backend dir:  python -m pytest tests/test_inference_governor.py
+"""
+from inference_governor import InferenceGovernor
+
+
+def make_governor(eco=None, **kwargs) -> InferenceGovernor:
+    return InferenceGovernor(min_fps=5, max_fps=30, eco_source=(lambda: eco) if eco else None, **kwargs)
+
+
+def test_eco_mode_caps_rate():
+    governor = make_governor(eco={"active": True, "fps_target": 15})
+    governor.update(now=1.0, cpu_percent=10.0)
+    status = governor.get_status()
+    assert status["target_fps"] == 15
+    assert status["eco_active"] and status["reason"] == "eco"
+
+
+def test_latency_caps_rate_and_scales_down_below_floor():
+    governor = make_governor(workers=2)
+    governor.record_latency(0.1)  # 2 workers x 10 inferences/s
+    governor.update(now=1.0, cpu_percent=10.0)
+    assert governor.target_fps == 20
+    assert governor.scale == 1.0
+
+    for _ in range(20):
+        governor.record_latency(1.0)
+    governor.update(now=2.0, cpu_percent=10.0)
+    assert governor.target_fps == 5  # Floor
+    assert governor.scale < 1.0
+
+
+def test_cpu_load_steps_rate_down_then_up():
+    governor = make_governor()
+    governor.update(now=1.0, cpu_percent=95.0)
+    assert governor.target_fps == 24
+    governor.update(now=2.0, cpu_percent=70.0)  # Between thresholds: hold
+    assert governor.target_fps == 24
+    governor.update(now=3.0, cpu_percent=20.0)
+    assert governor.target_fps == 30
+
+
+def test_dispatch_is_paced_to_target():
+    governor = make_governor(eco={"active": True, "fps_target": 10}, update_interval=100.0)
+    governor.update(now=0.0, cpu_percent=10.0)
+    assert governor.should_dispatch(now=1.0)
+    governor.mark_dispatched(now=1.0)
+    assert not governor.should_dispatch(now=1.05)
+    assert governor.should_dispatch(now=1.1)
@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized joint-angle kernel shared by detector and engine.
+Run from backend dir:  python -m pytest tests/test_joint_angles.py
+"""
+import numpy as np
+
+from joint_angles import (
+    joint_angles, detector_angles, pose_features,
+    DETECTOR_ANGLES, DETECTOR_ANGLE_NAMES, FEATURE_NAMES, NUM_FEATURES,
+)
+from pose_frame import KEYPOINT_INDEX, NUM_KEYPOINTS
+
+
+def naive_angle(a, b, c):
+    ba, bc = np.asarray(a) - b, np.asarray(c) - b
+    cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def random_points(*batch):
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 1, size=batch + (NUM_KEYPOINTS, 3))
+
+
+def test_joint_angles_right_angle():
+    points = np.array([[1.0, 0.0], [0.0, 0.0], [0.0, 1.0]])
+    assert np.allclose(joint_angles(points, np.array([[0, 1, 2]])), [90.0])
+
+
+def test_detector_angles_match_per_triple_loop():
+    points = random_points() * 640  # Detector angles are computed in pixel space
+    values = dict(zip(DETECTOR_ANGLE_NAMES, detector_angles(points)))
+    p = lambda name: points[KEYPOINT_INDEX[name], :2]
+    for name, (a, b, c) in DETECTOR_ANGLES.items():
+        assert np.isclose(values[name], naive_angle(p(a), p(b), p(c)), atol=1e-4)
+
+
+def test_pose_features_match_per_triple_loop():
+    points = random_points()
+    features = dict(zip(FEATURE_NAMES, pose_features(points)))
+    p = lambda name: points[KEYPOINT_INDEX[name]]
+    mid_shoulder = (p("left_shoulder") + p("right_shoulder")) / 2
+
+    assert np.isclose(features["left_knee"], naive_angle(p("left_hip"), p("left_knee"), p("left_ankle")), atol=1e-4)
+    assert np.isclose(features["back"], naive_angle(p("left_shoulder"), mid_shoulder, p("left_hip")), atol=1e-4)
+    assert np.isclose(features["knee_dist"], np.linalg.norm(p("left_knee") - p("right_knee")))
+    assert np.isclose(features["right_heel"], abs(p("right_ankle")[2] - p("right_foot_index")[2]))
+    asymmetry = (abs(features["left_knee"] - features["right_knee"]) +
+                 abs(features["left_hip"] - features["right_hip"]))
+    assert np.isclose(features["asymmetry"], asymmetry)
+
+
+def test_batch_axes_are_preserved():
+    points = random_points(4, 3)
+    features = pose_features(points)
+    assert features.shape == (4, 3, NUM_FEATURES)
+    assert np.allclose(features[2, 1], pose_features(points[2, 1]))
+    assert detector_angles(points).shape == (4, 3, len(DETECTOR_ANGLE_NAMES))
@@ -0,0 +1,67 @@
+"""
+Tests for the lazy component loader.
+Run from backend dir:  python -m pytest tests/test_lazy_loader.py
+"""
+import asyncio
+import threading
+import time
+
+from lazy_loader import LazyComponent, register, start_warmup, get_load_report
+
+
+def test_loads_once_under_concurrency():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    component = LazyComponent("slow", loader)
+    assert component.peek() is None and not component.ready
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(component.get())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert component.peek() is results[0] and component.get_stats()["loaded"]
+
+
+def test_failed_load_is_remembered():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        raise RuntimeError("missing model")
+
+    component = LazyComponent("broken", loader)
+    assert component.get() is None and component.get() is None
+    assert len(calls) == 1
+    assert component.ready and component.get_stats()["error"] == "missing model"
+
+
+def test_background_warmup():
+    component = register("test_warm", lambda: "value")
+    done = threading.Event()
+    start_warmup(["test_warm", "not_registered"], on_done=done.set)
+    assert done.wait(2.0)
+    assert component.peek() == "value"
+    assert get_load_report()["test_warm"]["loaded_by"] == "warmup"
+
+
+def test_get_async_does_not_block_the_loop():
+    component = LazyComponent("slow_async", lambda: time.sleep(0.2) or "value")
+
+    async def main():
+        load = asyncio.ensure_future(component.get_async())
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        ticked = time.perf_counter() - start
+        return ticked, await load
+
+    ticked, value = asyncio.run(main())
+    assert ticked < 0.1 and value == "value"
+    assert component.loaded_by != threading.current_thread().name
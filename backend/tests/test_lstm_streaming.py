@@ -0,0 +1,123 @@
+"""
+Tests for the streaming NumPy LSTM form classifier and its weight export checks
+(random weights, no TensorFlow).
+Run from backend dir:  python -m pytest tests/test_lstm_streaming.py
+"""
+import numpy as np
+
+from export_lstm_weights import check_architecture
+from lstm_streaming import StreamingLSTMClassifier
+
+
+def random_weights(features=15, units1=64, units2=32, hidden=32, classes=8, seed=0):
+    rng = np.random.default_rng(seed)
+    w = lambda *shape: rng.normal(scale=0.3, size=shape).astype(np.float32)
+    return {
+        "lstm1_kernel": w(features, 4 * units1), "lstm1_recurrent": w(units1, 4 * units1), "lstm1_bias": w(4 * units1),
+        "lstm2_kernel": w(units1, 4 * units2), "lstm2_recurrent": w(units2, 4 * units2), "lstm2_bias": w(4 * units2),
+        "dense1_kernel": w(units2, hidden), "dense1_bias": w(hidden),
+        "dense2_kernel": w(hidden, classes), "dense2_bias": w(classes),
+    }
+
+
+def reference_window(weights, window):
+    """Plain per-gate Keras LSTM semantics (i, f, c, o) over one window."""
+    sigmoid = lambda x: 1.0 / (1.0 + np.exp(-x))
+
+    def layer(xs, name):
+        kernel, recurrent, bias = (weights[f"{name}_{k}"] for k in ("kernel", "recurrent", "bias"))
+        units = recurrent.shape[0]
+        h, c, out = np.zeros(units), np.zeros(units), []
+        for x in xs:
+            z = x @ kernel + h @ recurrent + bias
+            i, f, g, o = (z[k * units:(k + 1) * units] for k in range(4))
+            c = sigmoid(f) * c + sigmoid(i) * np.tanh(g)
+            h = sigmoid(o) * np.tanh(c)
+            out.append(h)
+        return np.array(out)
+
+    h = layer(layer(window, "lstm1"), "lstm2")[-1]
+    hidden = np.maximum(h @ weights["dense1_kernel"] + weights["dense1_bias"], 0.0)
+    logits = hidden @ weights["dense2_kernel"] + weights["dense2_bias"]
+    e = np.exp(logits - logits.max())
+    return e / e.sum()
+
+
+def test_predict_matches_reference():
+    weights = random_weights()
+    window = np.random.default_rng(1).normal(size=(20, 15))
+    probs = StreamingLSTMClassifier(weights).predict(window)
+    assert probs.shape == (8,)
+    np.testing.assert_allclose(probs, reference_window(weights, window), atol=1e-5)
+
+
+def test_single_phase_equals_window_at_reset_boundary():
+    weights = random_weights()
+    classifier = StreamingLSTMClassifier(weights, window=20, phases=1, min_history=1)
+    frames = np.random.default_rng(2).normal(size=(45, 15))
+    state = classifier.new_state()
+    outputs = [classifier.step(state, f) for f in frames]
+    # Frame 20 and 40 close a full window since the last reset
+    np.testing.assert_allclose(outputs[19], classifier.predict(frames[:20]), atol=1e-5)
+    np.testing.assert_allclose(outputs[39], classifier.predict(frames[20:40]), atol=1e-5)
+    # Right after a reset the state only covers the new frames
+    np.testing.assert_allclose(outputs[42], classifier.predict(frames[40:43]), atol=1e-5)
+
+
+def test_staggered_phases_always_cover_half_a_window():
+    weights = random_weights()
+    classifier = StreamingLSTMClassifier(weights, window=20, phases=2)
+    frames = np.random.default_rng(3).normal(size=(80, 15))
+    state = classifier.new_state()
+    for t, f in enumerate(frames):
+        probs = classifier.step(state, f)
+        if t < 9:
+            assert probs is None
+            continue
+        history = int(state.steps.max())
+        assert 10 <= history <= 20
+        np.testing.assert_allclose(probs, classifier.predict(frames[t + 1 - history:t + 1]), atol=1e-5)
+
+
+def test_from_npz_roundtrip(tmp_path):
+    weights = random_weights()
+    path = tmp_path / "weights.npz"
+    np.savez(path, **weights)
+    window = np.random.default_rng(4).normal(size=(20, 15))
+    np.testing.assert_allclose(StreamingLSTMClassifier.from_npz(path).predict(window),
+                               StreamingLSTMClassifier(weights).predict(window))
+
+
+def test_predict_batch_matches_single_windows():
+    classifier = StreamingLSTMClassifier(random_weights())
+    windows = np.random.default_rng(5).normal(size=(3, 20, 15))
+    batched = classifier.predict_batch(windows)
+    assert batched.shape == (3, 8)
+    for window, probs in zip(windows, batched):
+        np.testing.assert_allclose(probs, classifier.predict(window), atol=1e-6)
+
+
+def keras_layers(**overrides):
+    """(class name, config) of the supported architecture, with per-layer config overrides."""
+    layers = [
+        ("InputLayer", {"name": "input"}),
+        ("LSTM", {"name": "lstm", "activation": "tanh", "recurrent_activation": "sigmoid", "return_sequences": True}),
+        ("Dropout", {"name": "dropout"}),
+        ("LSTM", {"name": "lstm_1", "activation": "tanh", "recurrent_activation": "sigmoid", "return_sequences": False}),
+        ("Dense", {"name": "dense", "activation": "relu"}),
+        ("Dense", {"name": "dense_1", "activation": "softmax"}),
+    ]
+    return [(cls, {**config, **overrides.get(config["name"], {})}) for cls, config in layers]
+
+
+def test_export_accepts_the_supported_architecture():
+    assert check_architecture(keras_layers()) == []
+
+
+def test_export_rejects_a_different_head_or_extra_layers():
+    assert check_architecture(keras_layers(dense={"activation": "tanh"}))
+    assert check_architecture(keras_layers(dense_1={"activation": "sigmoid"}))
+    assert check_architecture(keras_layers(lstm={"return_sequences": False}))
+    layers = keras_layers()
+    layers.insert(4, ("BatchNormalization", {"name": "bn"}))
+    assert "BatchNormalization" in check_architecture(layers)[0]
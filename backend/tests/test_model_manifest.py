@@ -0,0 +1,76 @@
+"""
+Tests for the model integrity manifest.
+Run from backend dir:  python -m pytest tests/test_model_manifest.py
+"""
+import os
+import zipfile
+
+from model_manifest import ModelManifest
+
+
+def make_task(path, payload=b"weights"):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("model.tflite", payload)
+
+
+def counting(validator_calls):
+    def validator(path):
+        validator_calls.append(path)
+        with zipfile.ZipFile(path) as z:
+            return z.testzip() is None
+    return validator
+
+
+def test_validates_once_then_trusts_size_and_mtime(tmp_path):
+    model = tmp_path / "pose.task"
+    make_task(model)
+    calls = []
+    manifest = ModelManifest(tmp_path)
+    assert manifest.check(model, counting(calls))
+    assert len(calls) == 1
+
+    # New process: manifest reloaded from disk, no re-validation
+    manifest = ModelManifest(tmp_path)
+    assert manifest.check(model, counting(calls))
+    assert len(calls) == 1
+
+    # Touched but identical: re-hashed, not re-validated
+    os.utime(model, ns=(0, 10 ** 9))
+    assert manifest.check(model, counting(calls))
+    assert len(calls) == 1
+
+    # Replaced with different content: validated again
+    make_task(model, b"other weights, longer")
+    assert manifest.check(model, counting(calls))
+    assert len(calls) == 2
+
+
+def test_detects_corruption(tmp_path):
+    model = tmp_path / "pose.task"
+    make_task(model)
+    manifest = ModelManifest(tmp_path)
+    assert manifest.check(model)
+
+    # Same size and mtime, different bytes: only a forced check sees it
+    stat = model.stat()
+    data = bytearray(model.read_bytes())
+    data[-30] ^= 0xFF
+    model.write_bytes(bytes(data))
+    os.utime(model, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert manifest.check(model)
+    assert manifest.verify_all() == {"pose.task": False}
+
+    # Broken archive with a new size: caught by the format check
+    model.write_bytes(b"not a zip")
+    assert not manifest.check(model)
+    assert not ModelManifest(tmp_path).entry(model)["valid"]
+
+
+def test_missing_and_forget(tmp_path):
+    manifest = ModelManifest(tmp_path)
+    assert not manifest.check(tmp_path / "missing.task")
+    model = tmp_path / "m.onnx"
+    model.write_bytes(b"onnx")
+    assert manifest.check(model)
+    manifest.forget(model)
+    assert manifest.entry(model) is None
@@ -0,0 +1,132 @@
+"""
+Tests for the pose backend registry and startup selection.
+Run from backend dir:  python -m pytest tests/test_pose_backends.py
+"""
+import os
+
+import numpy as np
+
+import pose_backends
+from backend_health import FallbackController
+from pose_backends import (
+    PoseBackend, FallbackWorker, coco_to_pose_data, discover_backends, select_backend,
+    TIER_LITE, TIER_FULL, TIER_HEAVY
+)
+from pose_frame import KEYPOINT_INDEX, PRESENT, VISIBILITY
+
+
+class FakeBackend(PoseBackend):
+    def create_worker(self, running_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5, num_threads=0):
+        raise NotImplementedError
+
+
+class FakeWorker:
+    def __init__(self, model, data):
+        self.model = model
+        self.data = data
+
+    def detect(self, frame, timestamp_ms=None):
+        if isinstance(self.data, Exception):
+            raise self.data
+        return self.data
+
+    def close(self):
+        pass
+
+
+def test_coco_mapping():
+    kpts = np.zeros((17, 3), dtype=np.float32)
+    kpts[5] = (10, 20, 0.9)   # COCO left shoulder
+    kpts[16] = (30, 40, 0.8)  # COCO right ankle
+    data = coco_to_pose_data(kpts)
+    assert np.allclose(data[KEYPOINT_INDEX["left_shoulder"], [0, 1, VISIBILITY]], (10, 20, 0.9))
+    assert np.allclose(data[KEYPOINT_INDEX["right_ankle"], [0, 1, VISIBILITY]], (30, 40, 0.8))
+    assert data[KEYPOINT_INDEX["left_heel"], PRESENT] == 0
+
+
+def test_discovery_finds_dropped_in_models(tmp_path):
+    assert discover_backends(tmp_path) == []
+    (tmp_path / "pose_landmarker_lite.task").write_bytes(b"")
+    names = [b.name for b in discover_backends(tmp_path)]
+    assert "mediapipe_lite" in names
+
+
+def test_tflite_discovery_skips_classifiers_and_caches_signatures(tmp_path, monkeypatch):
+    opened = []
+
+    def signature(path):
+        opened.append(path.name)
+        return 192 if path.name.startswith("movenet") else None
+
+    monkeypatch.setattr(pose_backends, "_is_single_pose_tflite", signature)
+    for name in ("model_lstm_tache2.tflite", "movenet_lightning.tflite", "other.tflite"):
+        (tmp_path / name).write_bytes(b"x")
+
+    names = [b.name for b in discover_backends(tmp_path)]
+    assert names == ["tflite_movenet_lightning"]
+    assert sorted(opened) == ["movenet_lightning.tflite", "other.tflite"]  # LSTM never opened
+
+    opened.clear()
+    assert [b.name for b in discover_backends(tmp_path)] == names
+    assert opened == []  # Cached signatures
+    (tmp_path / "other.tflite").write_bytes(b"changed")
+    os.utime(tmp_path / "other.tflite", ns=(0, 1))
+    discover_backends(tmp_path)
+    assert opened == ["other.tflite"]
+
+
+def test_select_fastest_meeting_tier_and_cache(tmp_path):
+    backends = [FakeBackend("lite", TIER_LITE, "a"), FakeBackend("full", TIER_FULL, "b"),
+                FakeBackend("heavy", TIER_HEAVY, "c")]
+    latency = {"lite": 5.0, "full": 20.0, "heavy": 15.0}
+    runs = []
+
+    def bench(backend):
+        runs.append(backend.name)
+        return latency[backend.name]
+
+    cache = tmp_path / "choice.json"
+    assert select_backend(backends, TIER_FULL, cache, bench).name == "heavy"
+    assert sorted(runs) == ["full", "heavy"]
+
+    # Cached for this host: no benchmark on the next startup
+    runs.clear()
+    assert select_backend(backends, TIER_FULL, cache, bench).name == "heavy"
+    assert runs == []
+
+    # Refresh, or a different candidate set, benchmarks again
+    assert select_backend(backends, TIER_FULL, cache, bench, refresh=True).name == "heavy"
+    assert runs
+    runs.clear()
+    assert select_backend(backends[:2], TIER_FULL, cache, bench).name == "full"
+    assert runs == ["full"]
+
+
+def test_select_skips_failing_and_falls_back_to_best_tier(tmp_path):
+    backends = [FakeBackend("lite_a", TIER_LITE, "a"), FakeBackend("lite_b", TIER_LITE, "b")]
+    latency = {"lite_a": None, "lite_b": 30.0}
+    chosen = select_backend(backends, TIER_HEAVY, None, lambda b: latency[b.name])
+    assert chosen.name == "lite_b"
+    assert select_backend([], TIER_LITE, None, lambda b: 1.0) is None
+
+
+def test_fallback_worker_single_inference_by_default():
+    pose = np.ones((17, 5), dtype=np.float32)
+    primary, fallback = FakeWorker("yolo", None), FakeWorker("mediapipe", pose)
+    worker = FallbackWorker(primary, fallback, FallbackController("yolo", "mediapipe", probe_interval=100))
+    assert worker.detect(None) is None and worker.model == "yolo"
+
+
+def test_fallback_worker_double_infer():
+    pose = np.ones((17, 5), dtype=np.float32)
+    controller = FallbackController("yolo", "mediapipe", probe_interval=100, double_infer=True)
+    worker = FallbackWorker(FakeWorker("yolo", None), FakeWorker("mediapipe", pose), controller)
+    assert worker.detect(None) is pose and worker.model == "mediapipe"
+
+    worker = FallbackWorker(FakeWorker("yolo", pose), FakeWorker("mediapipe", None), controller)
+    assert worker.detect(None) is pose and worker.model == "yolo"
+
+    worker = FallbackWorker(FakeWorker("yolo", RuntimeError("boom")), FakeWorker("mediapipe", pose), controller)
+    assert worker.detect(None) is pose and worker.model == "mediapipe"
+    assert controller.double_inferences == 2
+    assert controller.get_stats()["backends"]["primary"]["errors"] == 1
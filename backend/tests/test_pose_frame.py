@@ -0,0 +1,87 @@
+"""
+Tests for the array-backed PoseFrame and its legacy dict/JSON adapters.
+Run from backend dir:  python -m pytest tests/test_pose_frame.py
+"""
+import numpy as np
+
+from pose_frame import PoseFrame, LazyKeypoints, KEYPOINT_NAMES, KEYPOINT_INDEX, X
+
+
+def make_pose() -> PoseFrame:
+    pose = PoseFrame(width=640, height=480)
+    i = KEYPOINT_INDEX["left_shoulder"]
+    pose.data[i] = (320.0, 240.0, -0.1, 0.9, 1.0)
+    j = KEYPOINT_INDEX["right_knee"]
+    pose.data[j] = (160.0, 120.0, 0.2, 0.5, 1.0)
+    return pose
+
+
+def test_layout():
+    pose = PoseFrame()
+    assert pose.data.shape == (17, 5)
+    assert pose.data.dtype == np.float32
+    assert len(KEYPOINT_NAMES) == 17
+    assert KEYPOINT_NAMES[KEYPOINT_INDEX["nose"]] == "nose"
+
+
+def test_lazy_keypoints_matches_legacy_format():
+    pose = make_pose()
+    kpts = pose.keypoints
+    assert isinstance(kpts, LazyKeypoints)
+    assert kpts._dict is None  # Nothing built until accessed
+    assert len(kpts) == 2
+    assert "left_shoulder" in kpts and "nose" not in kpts
+
+    ls = kpts["left_shoulder"]
+    assert ls["x"] == 320.0 and ls["y"] == 240.0
+    assert abs(ls["visibility"] - 0.9) < 1e-6
+    assert ls["normalized"]["x"] == 0.5 and ls["normalized"]["y"] == 0.5
+    assert set(kpts) == {"left_shoulder", "right_knee"}
+
+
+def test_to_wire_and_visibility():
+    pose = make_pose()
+    wire = pose.to_wire()
+    assert set(wire) == {"left_shoulder", "right_knee"}
+    assert wire["right_knee"]["x"] == 0.25
+    assert abs(pose.mean_visibility() - 0.7) < 1e-6
+
+
+def test_mirror_x_updates_adapters():
+    pose = make_pose()
+    _ = pose.keypoints["right_knee"]
+    pose.mirror_x()
+    assert pose.data[KEYPOINT_INDEX["right_knee"], X] == 480.0
+    assert pose.keypoints["right_knee"]["normalized"]["x"] == 0.75
+
+
+def test_round_trip_from_legacy_dict():
+    pose = make_pose()
+    legacy = pose.keypoints.to_dict()
+    back = PoseFrame.from_keypoints(legacy)
+    assert (back.width, back.height) == (640, 480)
+    np.testing.assert_allclose(back.data, pose.data)
+    assert PoseFrame.from_keypoints(pose.keypoints) is pose
+
+
+def test_swap_sides_keeps_coordinates():
+    pose = make_pose()
+    pose.swap_sides()
+    assert "left_shoulder" not in pose.keypoints
+    assert pose.keypoints["right_shoulder"]["x"] == 320.0
+    assert pose.keypoints["left_knee"]["y"] == 120.0
+
+
+def test_rescale_maps_coordinates():
+    pose = make_pose()
+    pose.rescale(1280, 960)
+    assert pose.keypoints["left_shoulder"]["x"] == 640.0
+    assert pose.keypoints["left_shoulder"]["normalized"]["x"] == 0.5
+
+
+def test_translate_from_crop():
+    pose = PoseFrame(width=100, height=50)
+    pose.data[KEYPOINT_INDEX["nose"]] = (10.0, 20.0, 0.0, 1.0, 1.0)
+    pose.translate(200, 100, 640, 480)
+    assert pose.keypoints["nose"]["x"] == 210.0
+    assert pose.keypoints["nose"]["normalized"]["y"] == 120.0 / 480
@@ -0,0 +1,49 @@
+"""
+Tests for the keypoint motion model used between inference results.
+Run from backend dir:  python -m pytest tests/test_pose_motion.py
+"""
+import numpy as np
+
+from pose_frame import PoseFrame, KEYPOINT_INDEX
+from pose_motion import KeypointPredictor, MOTION_MODEL_CONSTANT_VELOCITY, MOTION_MODEL_ONE_EURO
+
+
+def pose_at(x: float) -> PoseFrame:
+    pose = PoseFrame(width=640, height=480)
+    pose.data[KEYPOINT_INDEX["nose"]] = (x, 100.0, 0.0, 0.9, 1.0)
+    return pose
+
+
+def nose_x(pose: PoseFrame) -> float:
+    return float(pose.data[KEYPOINT_INDEX["nose"], 0])
+
+
+def test_constant_velocity_extrapolates_and_flags():
+    predictor = KeypointPredictor(model=MOTION_MODEL_CONSTANT_VELOCITY, max_horizon=0.2)
+    predictor.observe(pose_at(100.0), t=1.0)
+    predictor.observe(pose_at(110.0), t=1.1)  # 100 px/s
+
+    pose, predicted = predictor.predict(1.1)
+    assert not predicted and np.isclose(nose_x(pose), 110.0)
+    pose, predicted = predictor.predict(1.15)
+    assert predicted and np.isclose(nose_x(pose), 115.0)
+    pose, _ = predictor.predict(1.6)  # Capped at max_horizon
+    assert np.isclose(nose_x(pose), 130.0)
+    assert predictor.predict(3.0) == (None, False)  # Too old
+
+
+def test_one_euro_smooths_jitter_at_rest():
+    predictor = KeypointPredictor(model=MOTION_MODEL_ONE_EURO)
+    for i, x in enumerate([100.0, 104.0, 96.0, 104.0, 96.0]):
+        predictor.observe(pose_at(x), t=i * 0.1)
+    pose, _ = predictor.predict(0.4)
+    assert abs(nose_x(pose) - 100.0) < 4.0
+
+
+def test_measured_pose_is_not_modified():
+    predictor = KeypointPredictor(model=MOTION_MODEL_CONSTANT_VELOCITY)
+    measured = pose_at(100.0)
+    predictor.observe(measured, t=0.0)
+    predictor.observe(pose_at(120.0), t=0.1)
+    predictor.predict(0.15)
+    assert nose_x(measured) == 100.0
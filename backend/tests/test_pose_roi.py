@@ -0,0 +1,97 @@
+"""
+Tests for ROI cropping around the previous pose.
+Run from backend dir:  python -m pytest tests/test_pose_roi.py
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from pose_detector import PoseDetector
+from pose_frame import PoseFrame, KEYPOINT_INDEX
+from pose_roi import RoiTracker
+from pose_workers import RUNNING_MODE_IMAGE, RUNNING_MODE_VIDEO
+
+
+def make_pose(cx: float, cy: float, visibility: float = 0.9) -> PoseFrame:
+    """Pose with a 100x200 box centred on (cx, cy) in a 640x480 frame."""
+    pose = PoseFrame(width=640, height=480)
+    pose.data[KEYPOINT_INDEX["left_shoulder"]] = (cx - 50, cy - 100, 0.0, visibility, 1.0)
+    pose.data[KEYPOINT_INDEX["right_ankle"]] = (cx + 50, cy + 100, 0.0, visibility, 1.0)
+    return pose
+
+
+def test_crop_follows_pose_with_hysteresis():
+    tracker = RoiTracker(padding=0.25, redetect_interval=30)
+    assert tracker.next_roi() is None  # Nothing tracked yet: full frame
+
+    tracker.update(make_pose(320, 240), None)
+    roi = tracker.next_roi()
+    x0, y0, x1, y1 = roi
+    assert x0 <= 270 and x1 >= 370 and y0 <= 140 and y1 >= 340
+    assert (x1 - x0) * (y1 - y0) < 640 * 480 / 2
+
+    # Small movement: same crop; large movement: new crop
+    tracker.update(make_pose(325, 242), roi)
+    assert tracker.next_roi() == roi
+    tracker.update(make_pose(500, 240), roi)
+    assert tracker.next_roi() != roi
+    assert tracker.next_roi()[2] <= 640  # Clamped to the frame
+
+
+def test_full_frame_redetect_on_cadence_and_low_confidence():
+    tracker = RoiTracker(redetect_interval=2)
+    tracker.update(make_pose(320, 240), None)
+    roi = tracker.next_roi()
+    tracker.update(make_pose(320, 240), roi)
+    tracker.update(make_pose(320, 240), roi)
+    assert tracker.next_roi() is None  # Cadence reached
+
+    tracker.update(make_pose(320, 240), None)
+    assert tracker.next_roi() is not None
+    tracker.update(make_pose(320, 240, visibility=0.2), tracker.next_roi())
+    assert tracker.next_roi() is None  # Confidence dropped
+    assert tracker.get_stats()["full_frame_runs"] == 2
+
+
+def test_stale_updates_are_ignored():
+    tracker = RoiTracker()
+    tracker.update(make_pose(500, 240), None, frame_id=5)
+    roi = tracker.next_roi()
+    tracker.update(make_pose(100, 240), None, frame_id=4)  # Older frame finishing late
+    assert tracker.next_roi() == roi
+    assert tracker.get_stats()["stale_updates"] == 1
+
+
+class RecordingWorker:
+    """Worker stub recording the geometry of every input it gets."""
+
+    def __init__(self, running_mode):
+        self.running_mode = running_mode
+        self.model = "mediapipe"
+        self.shapes = []
+
+
+def run_leases(worker, frames=6):
+    detector = PoseDetector.__new__(PoseDetector)
+    detector.roi_tracker = RoiTracker(redetect_interval=2)
+    detector.governor = SimpleNamespace(scale=1.0, record_latency=lambda seconds: None)
+    detector._publish_result = lambda frame_id, result, capture_ts_ms=0: None
+
+    def detect(frame, timestamp_ms=None, worker=None, scale=1.0):
+        worker.shapes.append(frame.shape[:2])
+        return {"pose": make_pose(320, 240)}
+
+    detector._detect = detect
+    for i in range(frames):
+        lease = SimpleNamespace(frame=np.zeros((480, 640, 3), dtype=np.uint8), frame_id=i, capture_ts_ms=33 * i)
+        detector._process_lease(worker, lease)
+    return worker.shapes
+
+
+def test_video_mode_landmarker_always_gets_the_full_frame():
+    # Image mode: crop, then the periodic full-frame re-detection
+    shapes = run_leases(RecordingWorker(RUNNING_MODE_IMAGE))
+    assert shapes[0] == (480, 640) and shapes[1] != (480, 640)
+    assert (480, 640) in shapes[2:]
+    # Video mode: the tracker's input geometry never changes
+    assert run_leases(RecordingWorker(RUNNING_MODE_VIDEO)) == [(480, 640)] * 6
@@ -0,0 +1,94 @@
+"""
+Tests for the round-robin inference pool and result publishing.
+Run from backend dir:  python -m pytest tests/test_pose_workers.py
+"""
+import threading
+import time
+
+import numpy as np
+
+from frame_ring import FrameRing
+from pose_detector import PoseDetector
+from pose_frame import PoseFrame
+from pose_workers import InferencePool
+
+
+class FakeWorker:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_round_robin_dispatch_without_backlog():
+    ring = FrameRing(num_slots=8)
+    release = threading.Event()
+    seen = []
+
+    def handler(worker, lease):
+        seen.append((worker.name, lease.frame_id))
+        release.wait(timeout=2.0)
+
+    def next_lease(value):
+        ring.write(np.full((2, 2, 3), value, dtype=np.uint8))
+        return ring.lease()
+
+    workers = [FakeWorker("a"), FakeWorker("b")]
+    pool = InferencePool(workers, handler)
+    try:
+        assert pool.submit(next_lease(1)) and pool.submit(next_lease(2))
+        assert wait_for(lambda: len(seen) == 2)
+        assert sorted(seen) == [("a", 1), ("b", 2)]
+
+        # Both busy: one queued frame per worker, then submit refuses (no backlog)
+        assert pool.submit(next_lease(3)) and pool.submit(next_lease(4))
+        assert not pool.has_capacity()
+        lease = next_lease(5)
+        assert not pool.submit(lease)
+        lease.release()
+
+        release.set()
+        assert wait_for(lambda: len(seen) == 4)
+        assert sorted(seen) == [("a", 1), ("a", 3), ("b", 2), ("b", 4)]
+    finally:
+        release.set()
+        pool.close()
+
+    assert pool.dispatched == 4
+    assert all(w.closed for w in workers)
+    # Every lease was released: all slots writable again
+    assert all(ring.write(np.zeros((2, 2, 3), dtype=np.uint8)) is not None for _ in range(8))
+
+
+def test_direct_and_pool_results_share_one_publish_path():
+    detector = PoseDetector.__new__(PoseDetector)
+    detector._frame_lock = threading.Lock()
+    detector._result_frame_id = -1
+    detector._result_id = 0
+    detector.frame_count = 0
+    detector.stale_results = 0
+    detector.latest_result = None
+    detector.motion = None
+    recorded = []
+    detector.recorder = type("Recorder", (), {"record": lambda self, *args: recorded.append(args[3])})()
+
+    def make_result():
+        return {"pose": PoseFrame(np.zeros((17, 5), dtype=np.float32), 640, 480), "angles": {}, "model": "yolo_onnx"}
+
+    detector._detect = lambda frame, timestamp_ms=None: make_result()
+    detector._publish_result(5, make_result(), 100)
+    direct = detector.detect_pose(np.zeros((480, 640, 3), dtype=np.uint8), timestamp_ms=120)
+    assert detector.latest_result is direct
+    assert (direct["result_id"], direct["frame_id"]) == (2, 2)
+    detector._publish_result(4, make_result(), 90)  # Older pool frame: dropped
+    assert detector.latest_result is direct and detector.stale_results == 1
+    assert detector.frame_count == 2 and recorded == [100, 120]
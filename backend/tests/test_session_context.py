@@ -0,0 +1,139 @@
+"""
+Tests for per-connection session isolation (engine state, LSTM window,
+feedback throttle, workout counters).
+Run from backend dir:  python -m pytest tests/test_session_context.py
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+import hardware_manager
+from hardware_manager import HardwareManager
+from session_context import FeedbackThrottle, SessionContext, SessionLane, get_session_stats
+
+
+def test_sessions_do_not_share_engine_state():
+    manager = HardwareManager()
+    a = SessionContext("a", manager)
+    b = SessionContext("b", manager)
+    try:
+        assert a.engine is not b.engine
+        assert a.engine.feature_window is not b.engine.feature_window
+        a.engine.state.rep_count = 7
+        a.engine.feature_window.push(np.ones(15))
+        assert b.engine.state.rep_count == 0
+        assert len(b.engine.feature_window) == 0
+        # Stateless model sessions are shared
+        assert a.engine.correction_model is b.engine.correction_model
+        assert get_session_stats()["active"] >= 2
+    finally:
+        a.close()
+        b.close()
+
+
+def test_starting_a_session_does_not_reset_another_ones_calories():
+    manager = HardwareManager()
+    a = SessionContext("hw-a", manager)
+    b = SessionContext("hw-b", manager)
+    try:
+        a.hardware.start_session()
+        a.hardware.counters.calories_burned = 42.0
+        b.hardware.start_session()
+        assert a.hardware.get_status()["calories_burned"] == 42.0
+        assert b.hardware.get_status()["calories_burned"] == 0.0
+        assert manager.sim._is_exercising
+
+        a.hardware.stop_session()
+        a.hardware.stop_session()  # Idempotent
+        assert manager.sim._is_exercising  # b still exercising
+        b.hardware.stop_session()
+        assert not manager.sim._is_exercising
+    finally:
+        a.close()
+        b.close()
+
+
+def test_sessions_share_one_sensor_tick(monkeypatch):
+    monkeypatch.setattr(hardware_manager, "SENSOR_TICK_SECONDS", 60.0)
+    manager = HardwareManager()
+    a = SessionContext("tick-a", manager)
+    b = SessionContext("tick-b", manager)
+    updates = []
+    monkeypatch.setattr(manager.sim, "update", lambda: updates.append(1) or manager.sim.get_status())
+    try:
+        a.hardware.start_session()
+        b.hardware.start_session()
+        a.hardware.set_exercise_intensity(0.9)
+        b.hardware.set_exercise_intensity(0.2)
+        for _ in range(5):
+            a.hardware.update()
+            b.hardware.update()
+        assert len(updates) == 1  # One sensor step for ten session frames
+        assert manager.sim._exercise_intensity == 0.9  # Highest intensity, not the last writer
+        assert a.hardware._intensity == 0.9 and b.hardware._intensity == 0.2
+        a.hardware.stop_session()
+        assert manager._session_intensities == {b.hardware: 0.2}
+    finally:
+        a.close()
+        b.close()
+
+
+def test_close_unregisters():
+    session = SessionContext("closing", HardwareManager())
+    before = get_session_stats()["active"]
+    session.close()
+    session.close()
+    assert get_session_stats()["active"] == before - 1
+
+
+def test_feedback_throttle():
+    throttle = FeedbackThrottle(repeat_seconds=3.0)
+    assert throttle.should_send("Posture OK", 100.0)
+    throttle.mark_sent("Posture OK", 100.0)
+    assert not throttle.should_send("Posture OK", 102.0)
+    assert throttle.should_send("Posture OK", 103.5)
+    assert throttle.should_send("Dos droit", 100.5)
+    throttle.reset()
+    assert throttle.should_send("Posture OK", 100.1)
+
+
+def test_lane_runs_steps_in_order_off_the_event_loop():
+    lane = SessionLane()
+    order = []
+
+    def step(i):
+        time.sleep(0.002 * (5 - i))  # Earlier steps are slower
+        order.append(i)
+        return threading.current_thread().name
+
+    async def main():
+        loop_thread = threading.current_thread().name
+        names = await asyncio.gather(*(lane.run(step, i) for i in range(5)))
+        return loop_thread, names
+
+    try:
+        loop_thread, names = asyncio.run(main())
+        assert order == list(range(5))
+        assert len(set(names)) == 1 and names[0] != loop_thread
+        assert lane.steps == 5
+    finally:
+        lane.close()
+
+
+def test_slow_step_does_not_block_the_loop():
+    lane = SessionLane()
+
+    async def main():
+        slow = asyncio.ensure_future(lane.run(time.sleep, 0.2))
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        ticked = time.perf_counter() - start
+        await slow
+        return ticked
+
+    try:
+        assert asyncio.run(main()) < 0.1
+    finally:
+        lane.close()
@@ -0,0 +1,85 @@
+"""
+Tests for the binary pose session recording (writer thread, zero-copy reader).
+Run from backend dir:  python -m pytest tests/test_session_recorder.py
+"""
+import numpy as np
+import pytest
+
+from pose_frame import PRESENT, VISIBILITY, PoseFrame
+from session_recorder import SessionRecorder, SessionRecording
+
+
+def make_pose(seed):
+    data = np.random.default_rng(seed).random((17, 5), dtype=np.float32)
+    data[:, PRESENT] = 1.0
+    data[13:, PRESENT] = 0.0  # No heels / feet (YOLO)
+    return PoseFrame(data, 640, 480)
+
+
+def test_roundtrip(tmp_path):
+    path = tmp_path / "s.poserec"
+    recorder = SessionRecorder(path, capacity=100, angle_names=("left_knee", "right_knee", "torso_angle"))
+    poses = [make_pose(i) for i in range(10)]
+    for i, pose in enumerate(poses):
+        angles = {"left_knee": 90.0 + i, "torso_angle": 5.0}
+        backend = "mediapipe" if i < 5 else "yolo_onnx"
+        assert recorder.record(pose, angles, backend, 1000 + 33 * i)
+    recorder.close()
+    recorder.close()
+
+    recording = SessionRecording(path)
+    assert len(recording) == 10
+    assert recording.backends == ("mediapipe", "yolo_onnx")
+    np.testing.assert_array_equal(recording.backend, [0] * 5 + [1] * 5)
+    np.testing.assert_array_equal(recording.capture_ts_ms, 1000 + 33 * np.arange(10))
+    np.testing.assert_array_equal(recording.keypoints, np.stack([p.data for p in poses]))
+    expected_visibility = [p.data[:13, VISIBILITY].mean() for p in poses]
+    np.testing.assert_allclose(recording.visibility, expected_visibility, rtol=1e-6)
+    np.testing.assert_array_equal(recording.angle("left_knee"), 90.0 + np.arange(10))
+    assert np.isnan(recording.angle("right_knee")).all()
+    assert recording.pose_angles(3) == {"left_knee": 93.0, "torso_angle": 5.0}
+    assert recording.duration_seconds() == pytest.approx(0.297)
+
+    pose = recording.pose(2)
+    assert (pose.width, pose.height) == (640, 480)
+    np.testing.assert_array_equal(pose.data, poses[2].data)
+
+
+def test_reader_views_are_zero_copy(tmp_path):
+    path = tmp_path / "s.poserec"
+    recorder = SessionRecorder(path, capacity=8)
+    recorder.record(make_pose(0), {}, "mediapipe", 0)
+    recorder.close()
+    recording = SessionRecording(path)
+    keypoints = recording.keypoints
+    assert isinstance(keypoints.base, np.ndarray) and not keypoints.flags.owndata
+    assert np.shares_memory(keypoints, recording.column("keypoints"))
+    assert not keypoints.flags.writeable
+
+
+def test_full_recording_drops_frames(tmp_path):
+    recorder = SessionRecorder(tmp_path / "s.poserec", capacity=3)
+    for i in range(5):
+        recorder.record(make_pose(i), {}, "mediapipe", i)
+    recorder.close()
+    assert recorder.count == 3 and recorder.dropped == 2
+    assert not recorder.record(make_pose(0), {}, "mediapipe", 9)  # Closed
+    assert len(SessionRecording(tmp_path / "s.poserec")) == 3
+
+
+def test_recorded_pose_is_a_snapshot(tmp_path):
+    path = tmp_path / "s.poserec"
+    recorder = SessionRecorder(path, capacity=4)
+    pose = make_pose(0)
+    expected = pose.data.copy()
+    recorder.record(pose, {}, "mediapipe", 0)
+    pose.data[:] = -1.0  # Later in-place changes (e.g. smoothing) are not recorded
+    recorder.close()
+    np.testing.assert_array_equal(SessionRecording(path).keypoints[0], expected)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.poserec"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        SessionRecording(path)
@@ -0,0 +1,35 @@
+"""
+Tests for the NumPy decoding / NMS of the ONNX Runtime YOLO pose backend.
+Run from backend dir:  python -m pytest tests/test_yolo_onnx.py
+"""
+import numpy as np
+
+from yolo_onnx import nms, decode_predictions, NUM_YOLO_KEYPOINTS
+
+
+def test_nms_keeps_best_of_overlapping_boxes():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30]], dtype=np.float32)
+    scores = np.array([0.6, 0.9, 0.5], dtype=np.float32)
+    assert nms(boxes, scores, 0.5).tolist() == [1, 2]
+
+
+def test_decode_maps_back_through_letterbox():
+    preds = np.zeros((5 + NUM_YOLO_KEYPOINTS * 3, 4), dtype=np.float32)
+    # Anchor 1: person centred at (320, 320) in the 640 input, keypoint 0 at (300, 200)
+    preds[:5, 1] = (320, 320, 100, 200, 0.9)
+    preds[5:8, 1] = (300, 200, 0.8)
+    # Anchor 2: duplicate with a lower score; anchor 3: below threshold
+    preds[:5, 2] = (322, 321, 100, 200, 0.7)
+    preds[:5, 3] = (100, 100, 50, 50, 0.1)
+
+    # 640x480 frame letterboxed into 640x640: scale 1, 80 px vertical padding
+    kpts, boxes, scores = decode_predictions(preds, conf=0.25, iou=0.45, scale=1.0, pad=(0, 80))
+    assert kpts.shape == (1, NUM_YOLO_KEYPOINTS, 3)
+    assert np.allclose(kpts[0, 0], (300, 120, 0.8))
+    assert np.allclose(boxes[0], (270, 140, 370, 340))
+    assert np.allclose(scores, [0.9])
+
+
+def test_decode_empty():
+    kpts, boxes, scores = decode_predictions(np.zeros((56, 8), dtype=np.float32), 0.25, 0.45, 1.0, (0, 0))
+    assert kpts.shape == (0, NUM_YOLO_KEYPOINTS, 3) and len(boxes) == 0 and len(scores) == 0
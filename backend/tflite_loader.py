@@ -0,0 +1,25 @@
+"""
+TFLite interpreter from whichever runtime is installed.
+Edge devices only need the standalone LiteRT (ai-edge-litert) or
+tflite-runtime wheel; full TensorFlow is the last resort.
+"""
+from pathlib import Path
+
+
+def load_tflite_interpreter(model_path: Path, num_threads: int = 0):
+    """
+    Create a TFLite interpreter (ai-edge-litert, tflite-runtime, then TensorFlow).
+
+    Args:
+        model_path: Path to the .tflite file
+        num_threads: Interpreter threads (0 = runtime default)
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=str(model_path), num_threads=num_threads or None)
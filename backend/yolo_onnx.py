@@ -0,0 +1,152 @@
+"""
+YOLOv8/v11-pose inference with ONNX Runtime (no torch / ultralytics at runtime).
+The model is exported once with export_yolo_onnx.py. Preprocessing letterboxes
+into a reused buffer and fills a preallocated input tensor; box/keypoint
+decoding and NMS are vectorized NumPy.
+"""
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+
+NUM_YOLO_KEYPOINTS = 17
+PAD_VALUE = 114  # Letterbox grey used by ultralytics at training time
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Args:
+        boxes: (N, 4) x1, y1, x2, y2
+        scores: (N,) confidences
+        iou_threshold: Boxes overlapping a kept box above this IoU are dropped
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    order = np.argsort(-scores)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
+
+
+def decode_predictions(preds: np.ndarray, conf: float, iou: float,
+                       scale: float, pad: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode raw YOLO pose output for one image.
+
+    Args:
+        preds: (4 + 1 + 17 * 3, anchors) raw output (cx, cy, w, h, score, keypoints)
+        conf: Minimum person confidence
+        iou: NMS IoU threshold
+        scale: Letterbox scale (input pixels per frame pixel)
+        pad: Letterbox (x, y) padding in input pixels
+
+    Returns:
+        Tuple of (keypoints (P, 17, 3) as x, y, conf in frame pixels,
+        boxes (P, 4) x1, y1, x2, y2, scores (P,)), sorted by score
+    """
+    preds = preds.T  # (anchors, 56)
+    preds = preds[preds[:, 4] > conf]
+    if not len(preds):
+        return (np.empty((0, NUM_YOLO_KEYPOINTS, 3), dtype=np.float32),
+                np.empty((0, 4), dtype=np.float32), np.empty((0,), dtype=np.float32))
+
+    cx, cy, bw, bh = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    keep = nms(boxes, preds[:, 4], iou)
+    boxes, scores = boxes[keep], preds[keep, 4]
+    kpts = preds[keep, 5:].reshape(-1, NUM_YOLO_KEYPOINTS, 3).copy()
+
+    # Undo the letterbox
+    offset = np.array(pad, dtype=np.float32)
+    kpts[..., :2] = (kpts[..., :2] - offset) / scale
+    boxes = (boxes - np.tile(offset, 2)) / scale
+    return kpts, boxes, scores
+
+
+class YoloPoseOnnx:
+    """
+    YOLO pose model on ONNX Runtime.
+    Not thread-safe (reused buffers): one instance per caller, or serialize calls.
+    """
+
+    def __init__(self, model_path: Path, conf: float = 0.25, iou: float = 0.45, num_threads: int = 0):
+        """
+        Load the exported model.
+
+        Args:
+            model_path: Path to the .onnx file (exported with export_yolo_onnx.py)
+            conf: Minimum person confidence
+            iou: NMS IoU threshold
+            num_threads: ONNX Runtime intra-op threads (0 = runtime default)
+        """
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.conf = conf
+        self.iou = iou
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Static exports have a fixed square input; dynamic ones default to 640
+        size = model_input.shape[2]
+        self.input_size = size if isinstance(size, int) else 640
+
+        s = self.input_size
+        self._input = np.zeros((1, 3, s, s), dtype=np.float32)  # Preallocated NCHW tensor
+        self._letterbox = np.full((s, s, 3), PAD_VALUE, dtype=np.uint8)
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._resized: Optional[np.ndarray] = None
+        self._scale = 1.0
+        self._pad = (0, 0)
+
+    def _prepare(self, frame: np.ndarray):
+        """Letterbox a BGR frame into the input tensor (RGB, 0..1, NCHW)."""
+        if frame.shape != self._frame_shape:
+            h, w = frame.shape[:2]
+            s = self.input_size
+            self._scale = min(s / h, s / w)
+            nw, nh = int(round(w * self._scale)), int(round(h * self._scale))
+            pad_x, pad_y = (s - nw) // 2, (s - nh) // 2
+            self._pad = (pad_x, pad_y)
+            self._letterbox[:] = PAD_VALUE
+            self._resized = self._letterbox[pad_y:pad_y + nh, pad_x:pad_x + nw]
+            self._frame_shape = frame.shape
+        # Resize straight into the letterbox, then BGR -> RGB planes scaled to 0..1
+        cv2.resize(frame, (self._resized.shape[1], self._resized.shape[0]), dst=self._resized,
+                   interpolation=cv2.INTER_LINEAR)
+        for c in range(3):
+            np.multiply(self._letterbox[:, :, 2 - c], 1.0 / 255.0, out=self._input[0, c], casting="unsafe")
+
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detect people and their keypoints.
+
+        Args:
+            frame: BGR image
+
+        Returns:
+            Tuple of (keypoints (P, 17, 3) as x, y, conf in frame pixels,
+            boxes (P, 4) x1, y1, x2, y2, scores (P,)), sorted by score
+        """
+        self._prepare(frame)
+        output = self.session.run(None, {self.input_name: self._input})[0]
+        return decode_predictions(output[0], self.conf, self.iou, self._scale, self._pad)